@@ -1,6 +1,8 @@
 """Rutas de autenticación."""
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity, jwt_required
+from sqlalchemy import select
+from app import db
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -10,7 +12,10 @@ def login():
     """Login simple que emite un JWT con el role del usuario.
 
     Espera JSON: {"username": "...", "password": "..."}
-    Devuelve: {"access_token": "...", "role": "admin"}
+    Devuelve: {"access_token": "...", "refresh_token": "...", "role": "admin"}
+
+    La verificación de la contraseña es cara a propósito; el cliente renueva
+    el access token con ``/api/auth/refresh`` en lugar de volver a loguearse.
     """
     from models import User
     data = request.get_json() or {}
@@ -29,6 +34,29 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'error': 'Credenciales inválidas'}), 401
 
+    # check_password rehace el hash si el coste configurado cambió
+    if db.session.is_modified(user):
+        db.session.commit()
+
     additional_claims = {'role': 'admin'}
     access_token = create_access_token(identity=username, additional_claims=additional_claims)
-    return jsonify({'access_token': access_token, 'role': 'admin'}), 200
+    refresh_token = create_refresh_token(identity=username, additional_claims=additional_claims)
+    return jsonify({'access_token': access_token, 'refresh_token': refresh_token, 'role': 'admin'}), 200
+
+
+@auth_bp.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
+    """Emite un access token nuevo a partir de un refresh token.
+
+    Requiere ``Authorization: Bearer <refresh_token>``. No verifica la
+    contraseña; solo comprueba que el usuario sigue existiendo.
+    """
+    from models import User
+    username = get_jwt_identity()
+    if db.session.scalar(select(User.id).where(User.username == username)) is None:
+        return jsonify({'error': 'El usuario ya no existe'}), 401
+
+    role = get_jwt().get('role', 'admin')
+    access_token = create_access_token(identity=username, additional_claims={'role': role})
+    return jsonify({'access_token': access_token, 'role': role}), 200
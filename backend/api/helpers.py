@@ -0,0 +1,152 @@
+"""Utilidades compartidas por los blueprints para construir respuestas."""
+import csv
+import hashlib
+import io
+import os
+from datetime import timezone
+
+from flask import current_app, jsonify, request, stream_with_context, url_for
+from werkzeug.http import is_resource_modified
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+# Tamaño aproximado de cada fragmento enviado con transfer-encoding chunked
+STREAM_CHUNK_BYTES = 64 * 1024
+# Versión de la forma de las respuestas cacheables: súbela al cambiar lo que
+# devuelve un endpoint con ConditionalGet (2: image_srcset en productos)
+REPRESENTATION_VERSION = 2
+# Commit desplegado (lo define Render): cada despliegue invalida los ETag
+RELEASE = os.getenv('RENDER_GIT_COMMIT', '')[:12]
+
+
+def paginated_response(items, next_cursor):
+    """Respuesta JSON con la lista de la página actual.
+
+    El cuerpo sigue siendo una lista (compatible con los clientes que piden
+    la colección completa); el cursor de la página siguiente viaja en las
+    cabeceras ``X-Next-Cursor`` y ``Link``.
+    """
+    response = jsonify(items)
+    if next_cursor:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        next_url = url_for(request.endpoint, _external=True, **args)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+def stream_format():
+    """Formato de streaming pedido: ``'ndjson'``, ``'json'`` o None.
+
+    Se activa con ``Accept: application/x-ndjson`` (una fila JSON por línea)
+    o con ``?stream=1`` (un array JSON enviado por fragmentos).
+    """
+    if any(mimetype == NDJSON_MIMETYPE for mimetype, _ in request.accept_mimetypes):
+        return 'ndjson'
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return 'json'
+    return None
+
+
+def streamed_response(rows, fmt):
+    """Respuesta que serializa ``rows`` (un generador de dicts) a medida que llegan.
+
+    Los generadores de ``queries`` ejecutan la consulta con ``yield_per``
+    (cursor del lado del servidor en Postgres) al empezar a iterar, y la
+    salida se agrupa en fragmentos de ~64 KB. Ni la lista completa ni el
+    documento llegan a existir en memoria, y el primer byte sale con el
+    primer lote.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        if fmt == 'ndjson':
+            yield from (dumps(row) + '\n' for row in rows)
+            return
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',' if index else '') + dumps(row)
+        yield ']'
+
+    mimetype = NDJSON_MIMETYPE if fmt == 'ndjson' else 'application/json'
+    response = current_app.response_class(stream_with_context(_chunked(generate())), mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def streamed_csv_response(rows, columns, filename):
+    """Descarga CSV de ``rows`` (generador de dicts), por fragmentos como ``streamed_response``."""
+    def generate():
+        line = io.StringIO()
+        writer = csv.DictWriter(line, fieldnames=columns, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
+        yield line.getvalue()
+
+    response = current_app.response_class(stream_with_context(_chunked(generate())), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _chunked(pieces):
+    """Agrupa los textos de ``pieces`` en fragmentos de ~``STREAM_CHUNK_BYTES``."""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_BYTES:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+class ConditionalGet:
+    """Validadores HTTP (ETag fuerte y Last-Modified) de la petición actual.
+
+    Se derivan de los sellos de ``services.cache_versions`` de los recursos
+    de los que depende la respuesta, más los parámetros de la consulta, así
+    que calcularlos cuesta una consulta por clave primaria y nunca requiere
+    serializar el contenido. El ETag incluye además la versión de la
+    representación y el commit desplegado, para que un despliegue que cambia
+    los cuerpos no responda 304 a lo cacheado antes, y la fecha de cada sello,
+    para que reiniciar ``cache_versions`` no vuelva a validar ETag antiguos.
+    """
+
+    def __init__(self, *scopes, private=False, variant=None):
+        from services.cache_versions import get_versions
+        versions = get_versions(*scopes)
+        stamp = '.'.join(
+            f'{version}_{updated_at:%Y%m%d%H%M%S%f}' if updated_at else str(version)
+            for version, updated_at in (versions[scope] for scope in scopes)
+        )
+        self.etag = f'{request.endpoint}-v{REPRESENTATION_VERSION}{RELEASE and "-" + RELEASE}-{stamp}'
+        if variant:
+            # Distintas representaciones de la misma URL (p. ej. NDJSON)
+            self.etag += f'-{variant}'
+        if request.query_string:
+            self.etag += '-' + hashlib.sha1(request.query_string).hexdigest()[:16]
+        dates = [updated_at for _, updated_at in versions.values() if updated_at]
+        self.last_modified = max(dates).replace(tzinfo=timezone.utc) if dates else None
+        self.cache_control = 'private, no-cache' if private else 'public, no-cache'
+
+    def not_modified(self):
+        """Devuelve una respuesta 304 sin cuerpo si el cliente ya tiene los datos."""
+        if is_resource_modified(request.environ, etag=self.etag, last_modified=self.last_modified):
+            return None
+        return self.apply(current_app.response_class(status=304))
+
+    def apply(self, response):
+        """Añade los validadores y la política de caché a ``response``."""
+        response.set_etag(self.etag)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept')
+        return response
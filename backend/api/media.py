@@ -0,0 +1,11 @@
+"""Archivos de imagen guardados por el uploader local (``IMAGE_UPLOADER=local``)."""
+from flask import Blueprint, send_from_directory
+from services.image_uploaders import local_media_dir
+
+media_bp = Blueprint('media', __name__, url_prefix='/media')
+
+
+@media_bp.route('/<path:filename>', methods=['GET'])
+def get_media(filename):
+    """Sirve una imagen del directorio local; el nombre es único, se cachea un año."""
+    return send_from_directory(local_media_dir(), filename, max_age=365 * 24 * 60 * 60)
@@ -0,0 +1,18 @@
+"""Exposición de métricas en formato Prometheus (``services.metrics``)."""
+import hmac
+import os
+
+from flask import Blueprint, jsonify, request
+from services.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    """Métricas de todos los workers; con ``METRICS_TOKEN`` exige ``Bearer <token>``."""
+    token = os.getenv('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Token de métricas inválido'}), 401
+    body, content_type = render_metrics()
+    return body, 200, {'Content-Type': content_type, 'Cache-Control': 'no-store'}
@@ -1,24 +1,123 @@
 """Rutas de productos."""
 from flask import Blueprint, request, jsonify
 from app import db
-import cloudinary.uploader
 from flask_jwt_extended import jwt_required, get_jwt
+from services.cache_versions import PRODUCTS, bump_version
+from services.image_ingest import discard_staged, schedule_uploads, stage_image
+from services.database import use_read_replica
+from services.payload_cache import get_catalog_cache, invalidate_catalog
+from .helpers import (
+    NDJSON_MIMETYPE, ConditionalGet, paginated_response, stream_format, streamed_csv_response,
+    streamed_response,
+)
 
 products_bp = Blueprint('products', __name__, url_prefix='/api/products')
 
 
 @products_bp.route('', methods=['GET'])
+@use_read_replica
 def get_products():
-    """Devuelve la lista de productos."""
-    from models import Product
-    products = Product.query.all()
-    return jsonify([p.serialize() for p in products]), 200
+    """Devuelve la lista de productos.
+
+    Parámetros opcionales: ``name`` y ``sku`` (prefijos), ``limit`` y
+    ``cursor`` para paginar por id (ver ``paginated_response``). Responde
+    304 si el ``If-None-Match``/``If-Modified-Since`` del cliente sigue vigente.
+    Con ``Accept: application/x-ndjson`` o ``?stream=1`` la respuesta se
+    envía en streaming (ver ``streamed_response``). Las páginas JSON se
+    sirven desde la caché del catálogo mientras no cambie el catálogo.
+    """
+    from queries.pagination import InvalidParameter, parse_limit
+    from queries.products import list_products, parse_product_filters, stream_products
+    fmt = stream_format()
+    conditional = ConditionalGet(PRODUCTS, variant=fmt)
+    not_modified = conditional.not_modified()
+    if not_modified:
+        return not_modified
+    catalog_cache = get_catalog_cache()
+    cached = None if fmt else catalog_cache.get(conditional)
+    if cached:
+        return conditional.apply(cached.response()), 200
+    try:
+        cursor = request.args.get('cursor')
+        limit = parse_limit(request.args.get('limit'), cursor)
+        filters = parse_product_filters(request.args)
+        if fmt:
+            rows = stream_products(filters, cursor, limit)
+            return conditional.apply(streamed_response(rows, fmt)), 200
+        products, next_cursor = list_products(filters, cursor, limit)
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
+    cached = catalog_cache.put(conditional, paginated_response(products, next_cursor))
+    return conditional.apply(cached.response()), 200
+
+
+@products_bp.route('/search', methods=['GET'])
+@use_read_replica
+def search_products():
+    """Busca productos por nombre, descripción y SKU, ordenados por relevancia.
+
+    Parámetros: ``q`` (obligatorio), ``limit`` (20 por defecto) y ``cursor``
+    (en ``X-Next-Cursor``). Admite prefijos de SKU y errores de tipeo en el
+    nombre; ver ``queries.search``. Como el listado, se cachea por versión
+    del catálogo.
+    """
+    from queries.pagination import InvalidParameter
+    from queries.search import search_products as query_search
+    conditional = ConditionalGet(PRODUCTS)
+    not_modified = conditional.not_modified()
+    if not_modified:
+        return not_modified
+    catalog_cache = get_catalog_cache()
+    cached = catalog_cache.get(conditional)
+    if cached:
+        return conditional.apply(cached.response()), 200
+    try:
+        products, next_cursor = query_search(
+            request.args.get('q'), request.args.get('cursor'), request.args.get('limit'),
+        )
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'No se pudo completar la búsqueda', 'details': str(e)}), 500
+    cached = catalog_cache.put(conditional, paginated_response(products, next_cursor))
+    return conditional.apply(cached.response()), 200
+
+
+@products_bp.route('/export', methods=['GET'])
+@jwt_required()
+@use_read_replica
+def export_products():
+    """Descarga el catálogo completo en CSV o NDJSON (requiere role=admin).
+
+    ``format`` es ``csv`` (defecto) o ``ndjson``; las columnas son las que
+    acepta ``/import``, así que el archivo se puede volver a importar. Se
+    envía en streaming por lotes, sin cargar el catálogo en memoria.
+    """
+    from queries.products import stream_products
+    from services.product_import import FIELDS
+    claims = get_jwt()
+    if claims.get('role') != 'admin':
+        return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+
+    fmt = request.args.get('format', 'csv')
+    if fmt == 'csv':
+        return streamed_csv_response(stream_products(), ('id',) + FIELDS, 'productos.csv'), 200
+    if fmt == 'ndjson':
+        response = streamed_response(stream_products(), 'ndjson')
+        response.headers['Content-Disposition'] = 'attachment; filename="productos.ndjson"'
+        return response, 200
+    return jsonify({'error': "'format' debe ser csv o ndjson"}), 400
 
 
 @products_bp.route('', methods=['POST'])
 @jwt_required()
 def create_product():
-    """Crea un nuevo producto (requiere role=admin)."""
+    """Crea un nuevo producto (requiere role=admin).
+
+    Si llega una imagen, se guarda en disco y se sube en segundo plano: la
+    respuesta incluye ``image_upload`` con estado ``pending`` e
+    ``image_url`` se rellena cuando la subida termina.
+    """
     from models import Product
     claims = get_jwt()
     if claims.get('role') != 'admin':
@@ -27,18 +126,11 @@ def create_product():
     name = request.form.get('name')
     description = request.form.get('description')
     sku = request.form.get('sku')
-    image_url = None
 
-    # Subir imagen si viene en request.files['image']
+    # La imagen de request.files['image'] se sube en segundo plano; sin
+    # archivo se acepta una URL ya subida en el formulario.
     image_file = request.files.get('image')
-    if image_file:
-        try:
-            upload_res = cloudinary.uploader.upload(image_file)
-            image_url = upload_res.get('secure_url')
-        except Exception as e:
-            return jsonify({'error': 'No se pudo subir la imagen', 'details': str(e)}), 500
-    else:
-        image_url = request.form.get('image_url')
+    image_url = None if image_file else request.form.get('image_url')
 
     if not name:
         return jsonify({'error': 'El nombre es obligatorio'}), 400
@@ -48,25 +140,92 @@ def create_product():
     if existing_product:
         return jsonify({'error': 'Ya existe un producto con el mismo nombre o SKU'}), 400
 
+    upload = None
     try:
         p = Product(name=name, image_url=image_url, description=description, sku=sku)
         db.session.add(p)
+        if image_file:
+            # flush para obtener el id del producto al que pertenece la imagen
+            db.session.flush()
+            upload = stage_image(image_file, p.id)
+        bump_version(PRODUCTS)
         db.session.commit()
-        return jsonify({'message': 'Producto creado', 'product': p.serialize()}), 201
+        invalidate_catalog()
     except Exception as e:
         db.session.rollback()
+        discard_staged(upload)
         return jsonify({'error': 'No se pudo crear el producto', 'details': str(e)}), 500
 
+    body = {'message': 'Producto creado', 'product': p.serialize()}
+    if upload:
+        body['image_upload'] = upload.serialize()
+        schedule_uploads([upload.id])
+    return jsonify(body), 201
+
+
+@products_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_products():
+    """Crea o actualiza productos en bloque desde CSV o NDJSON (requiere role=admin).
+
+    El archivo llega como cuerpo de la petición (``Content-Type: text/csv``
+    o ``application/x-ndjson``) o como campo ``file`` de un formulario
+    multipart; ``format`` lo fuerza. Cada fila se identifica por ``sku`` o,
+    sin él, por ``name``: si existe se actualiza y si no se crea. Se escribe
+    por lotes de ``batch_size`` filas (ver ``services.product_import``).
+
+    Devuelve ``{"processed", "imported", "failed", "errors"}``; las filas
+    con errores no detienen la importación.
+    """
+    from services.product_import import DEFAULT_BATCH_ROWS, MAX_BATCH_ROWS, import_products as run_import
+    claims = get_jwt()
+    if claims.get('role') != 'admin':
+        return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+
+    upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+    if upload:
+        stream = upload.stream
+        guessed = 'ndjson' if (upload.filename or '').lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+    else:
+        stream = request.stream
+        guessed = 'ndjson' if request.mimetype in (NDJSON_MIMETYPE, 'application/jsonl') else 'csv'
+        if request.mimetype not in ('text/csv', NDJSON_MIMETYPE, 'application/jsonl') and 'format' not in request.args:
+            return jsonify({'error': 'Envía el archivo como text/csv, application/x-ndjson o en el campo file'}), 415
+    fmt = request.args.get('format', guessed)
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': "'format' debe ser csv o ndjson"}), 400
+    try:
+        batch_size = min(int(request.args.get('batch_size', DEFAULT_BATCH_ROWS)), MAX_BATCH_ROWS)
+    except ValueError:
+        return jsonify({'error': "'batch_size' debe ser un número entero"}), 400
+    if batch_size < 1:
+        return jsonify({'error': "'batch_size' debe ser mayor que cero"}), 400
+
+    try:
+        summary = run_import(stream, fmt, batch_size)
+    except UnicodeDecodeError:
+        return jsonify({'error': 'El archivo debe estar en UTF-8'}), 400
+    except Exception as e:
+        return jsonify({'error': 'No se pudo completar la importación', 'details': str(e)}), 500
+    finally:
+        # Los lotes ya confirmados cambian el catálogo aunque la importación falle
+        invalidate_catalog()
+    return jsonify(summary), 200
+
 
 @products_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_product(id):
-    """Actualiza un producto por id (requiere role=admin)."""
+    """Actualiza un producto por id (requiere role=admin).
+
+    Una imagen nueva se sube en segundo plano, igual que en ``create_product``.
+    """
     from models import Product
     claims = get_jwt()
     if claims.get('role') != 'admin':
         return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
 
+    upload = None
     try:
         p = Product.query.get(id)
         if not p:
@@ -84,26 +243,32 @@ def update_product(id):
         if sku:
             p.sku = sku
 
+        # La imagen nueva se sube en segundo plano; hasta que termine el
+        # producto conserva la anterior.
         image_file = request.files.get('image')
         if image_file:
-            try:
-                upload_res = cloudinary.uploader.upload(image_file)
-                p.image_url = upload_res.get('secure_url')
-            except Exception as e:
-                db.session.rollback()
-                return jsonify({'error': 'No se pudo subir la imagen', 'details': str(e)}), 500
+            upload = stage_image(image_file, p.id)
         else:
             # Si se envía image_url en el formulario (por compatibilidad), actualizarla
             image_url = request.form.get('image_url')
             if image_url:
                 p.image_url = image_url
+                p.image_srcset = None
 
+        bump_version(PRODUCTS)
         db.session.commit()
-        return jsonify({'message': 'Producto actualizado', 'product': p.serialize()}), 200
+        invalidate_catalog()
     except Exception as e:
         db.session.rollback()
+        discard_staged(upload)
         return jsonify({'error': 'No se pudo actualizar el producto', 'details': str(e)}), 500
 
+    body = {'message': 'Producto actualizado', 'product': p.serialize()}
+    if upload:
+        body['image_upload'] = upload.serialize()
+        schedule_uploads([upload.id])
+    return jsonify(body), 200
+
 
 @products_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
@@ -120,7 +285,9 @@ def delete_product(id):
             return jsonify({'error': f'Producto con id {id} no encontrado'}), 404
 
         db.session.delete(p)
+        bump_version(PRODUCTS)
         db.session.commit()
+        invalidate_catalog()
         return jsonify({'message': 'Producto eliminado'}), 200
     except Exception as e:
         db.session.rollback()
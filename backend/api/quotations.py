@@ -1,41 +1,126 @@
 """Rutas de cotizaciones."""
 import os
 from flask import Blueprint, request, jsonify
-from app import db, mail
+from app import db
 from flask_jwt_extended import jwt_required, get_jwt
-from flask_mail import Message
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+from sqlalchemy import delete, insert, update
+from services.cache_versions import PRODUCTS, QUOTATIONS, bump_version
+from services.database import use_read_replica
+from .helpers import ConditionalGet, paginated_response, stream_format, streamed_response
 
 quotations_bp = Blueprint('quotations', __name__, url_prefix='/api/quotations')
 
 
 @quotations_bp.route('', methods=['GET'])
 @jwt_required()
+@use_read_replica
 def list_quotations():
-    """Lista todas las cotizaciones (protegida, requiere JWT con role=admin)."""
-    from models import Quotation
+    """Lista las cotizaciones (protegida, requiere JWT con role=admin).
+
+    Filtros opcionales: ``status``, ``customer_email``, ``created_from`` y
+    ``created_to``. Se pagina con ``limit`` y ``cursor`` sobre
+    ``(created_at, id)``; sin ellos se devuelven todas. El ETag depende
+    también de la versión del catálogo porque cada item incluye su producto.
+    Con ``Accept: application/x-ndjson`` o ``?stream=1`` se envía en
+    streaming, útil para exportaciones completas.
+    """
+    from queries.pagination import InvalidParameter, parse_limit
+    from queries.quotations import (
+        list_quotations as query_quotations, parse_quotation_filters, stream_quotations,
+    )
     try:
         claims = get_jwt()
         if claims.get('role') != 'admin':
             return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
 
-        quotations = Quotation.query.order_by(Quotation.created_at.desc()).all()
-        return jsonify([q.serialize() for q in quotations]), 200
+        fmt = stream_format()
+        conditional = ConditionalGet(QUOTATIONS, PRODUCTS, private=True, variant=fmt)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+
+        cursor = request.args.get('cursor')
+        limit = parse_limit(request.args.get('limit'), cursor)
+        filters = parse_quotation_filters(request.args)
+        if fmt:
+            rows = stream_quotations(filters, cursor, limit)
+            return conditional.apply(streamed_response(rows, fmt)), 200
+        quotations, next_cursor = query_quotations(filters, cursor, limit)
+        response = paginated_response(quotations, next_cursor)
+        return conditional.apply(response), 200
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'No se pudieron obtener las cotizaciones', 'details': str(e)}), 500
 
 
+@quotations_bp.route('/stats', methods=['GET'])
+@jwt_required()
+@use_read_replica
+def quotation_stats():
+    """Resumen para el panel de administración (requiere role=admin).
+
+    Devuelve ``total``, ``by_status``, ``by_day`` (últimos ``days`` días,
+    30 por defecto) y ``top_products`` (los ``top`` más pedidos por
+    cantidad, 10 por defecto). Se lee de tablas de agregados, así que el
+    coste no depende de cuántas cotizaciones haya.
+    """
+    from services.quotation_stats import (
+        DEFAULT_DAYS, DEFAULT_TOP_PRODUCTS, MAX_DAYS, MAX_TOP_PRODUCTS, get_stats,
+    )
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+
+        try:
+            days = min(int(request.args.get('days', DEFAULT_DAYS)), MAX_DAYS)
+            top = min(int(request.args.get('top', DEFAULT_TOP_PRODUCTS)), MAX_TOP_PRODUCTS)
+        except ValueError:
+            return jsonify({'error': "'days' y 'top' deben ser números enteros"}), 400
+        if days < 1 or top < 1:
+            return jsonify({'error': "'days' y 'top' deben ser mayores que cero"}), 400
+
+        conditional = ConditionalGet(QUOTATIONS, PRODUCTS, private=True)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        return conditional.apply(jsonify(get_stats(days, top))), 200
+    except Exception as e:
+        return jsonify({'error': 'No se pudo obtener el resumen', 'details': str(e)}), 500
+
+
 @quotations_bp.route('', methods=['POST'])
 def create_quotation():
-    """Crea una nueva cotización."""
-    from models import Quotation, QuotationItem, Product
+    """Crea una nueva cotización.
+
+    Todos los productos referenciados se resuelven en una sola consulta y los
+    items se insertan en bloque; si falta alguno, el 404 los lista todos.
+    """
+    from models import Quotation, QuotationItem
+    from queries.pagination import is_integer
+    from queries.products import existing_product_ids
+    from services.quotation_stats import record_created
     data = request.get_json()
 
     if not data or 'customer_name' not in data or 'customer_email' not in data:
         return jsonify({'error': 'Se requieren nombre y correo del cliente (customer_name y customer_email)'}), 400
 
+    items_data = data['items'] if isinstance(data.get('items'), list) else []
+    if not all(isinstance(item, dict) and is_integer(item.get('product_id'))
+               and is_integer(item.get('quantity')) and item['quantity'] >= 1 for item in items_data):
+        return jsonify({'error': "Cada item requiere 'product_id' entero y 'quantity' entero mayor que cero"}), 400
+    items = [(item['product_id'], item['quantity']) for item in items_data]
+
     try:
+        requested_ids = {product_id for product_id, _ in items}
+        missing_ids = sorted(requested_ids - existing_product_ids(requested_ids))
+        if missing_ids:
+            return jsonify({
+                'error': f"Productos no encontrados: {', '.join(map(str, missing_ids))}",
+                'missing_product_ids': missing_ids,
+            }), 404
+
         new_quotation = Quotation(
             customer_name=data['customer_name'],
             customer_email=data['customer_email'],
@@ -43,21 +128,17 @@ def create_quotation():
             customer_comments=data.get('customer_comments')
         )
         db.session.add(new_quotation)
+        # flush para obtener el id de la cotización antes del insert en bloque
+        db.session.flush()
 
-        if 'items' in data and isinstance(data['items'], list):
-            for item_data in data['items']:
-                product = Product.query.get(item_data['product_id'])
-                if not product:
-                    db.session.rollback()
-                    return jsonify({'error': f"Producto con id {item_data['product_id']} no encontrado"}), 404
-
-                quotation_item = QuotationItem(
-                    quotation=new_quotation,
-                    product=product,
-                    quantity=item_data['quantity']
-                )
-                db.session.add(quotation_item)
+        if items:
+            db.session.execute(insert(QuotationItem), [
+                {'quotation_id': new_quotation.id, 'product_id': product_id, 'quantity': quantity}
+                for product_id, quantity in items
+            ])
+        record_created(new_quotation.created_at, new_quotation.status, items)
 
+        bump_version(QUOTATIONS)
         db.session.commit()
         return jsonify({'message': 'Cotización creada correctamente'}), 201
 
@@ -66,11 +147,49 @@ def create_quotation():
         return jsonify({'error': 'Ocurrió un error', 'details': str(e)}), 500
 
 
+@quotations_bp.route('/<int:id>', methods=['GET'])
+@jwt_required()
+@use_read_replica
+def get_quotation_by_id(id):
+    """Devuelve una cotización por ID (requiere role=admin).
+
+    Si ya no está en la tabla caliente se busca en el archivo
+    (``services.quotation_archive``); ``archived`` indica de dónde salió.
+    """
+    from models import Quotation
+    from queries.quotations import load_quotations, select_quotations
+    from services.quotation_archive import get_archived_quotation
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+
+        found = load_quotations(select_quotations().where(Quotation.id == id))
+        if found:
+            return jsonify({**found[0], 'archived': False}), 200
+        archived = get_archived_quotation(id)
+        if archived:
+            return jsonify({**archived, 'archived': True}), 200
+        return jsonify({'error': f'Cotización con id {id} no encontrada'}), 404
+    except Exception as e:
+        return jsonify({'error': 'No se pudo obtener la cotización', 'details': str(e)}), 500
+
+
 @quotations_bp.route('/<int:id>', methods=['PATCH'])
 @jwt_required()
 def update_quotation(id):
-    """Actualiza una cotización concreta con la respuesta del admin (requiere role=admin)."""
-    from models import Quotation
+    """Actualiza una cotización concreta con la respuesta del admin (requiere role=admin).
+
+    Si el email está habilitado, el mensaje al cliente se encola en
+    ``email_outbox`` dentro de la misma transacción que la respuesta; lo
+    entrega ``scripts/email_worker.py``, así que la petición no espera a
+    SendGrid y un envío fallido se reintenta en lugar de perderse.
+    """
+    from queries.quotations import get_quotation
+    from services.email_templates import render_quotation_response
+    from services.quotation_archive import is_archived
+    from services.outbox import enqueue_email
+    from services.quotation_stats import record_status_change
     data = request.get_json() or {}
 
     if 'admin_response' not in data:
@@ -81,115 +200,41 @@ def update_quotation(id):
         if claims.get('role') != 'admin':
             return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
 
-        quotation = Quotation.query.get(id)
+        # Bloqueada: dos respuestas simultáneas no cuentan dos veces el cambio de estado
+        quotation = get_quotation(id, lock=True)
         if not quotation:
+            if is_archived(id):
+                return jsonify({'error': f'La cotización {id} está archivada y no admite cambios'}), 409
             return jsonify({'error': f'Cotización con id {id} no encontrada'}), 404
 
+        record_status_change({(quotation.created_at.date(), quotation.status): 1}, 'Responded')
         quotation.admin_response = data.get('admin_response')
         quotation.status = 'Responded'
+        # Serializar antes del commit: tras el commit los atributos expiran y
+        # se recargarían perezosamente (items y productos) fila a fila.
+        quotation_data = quotation.serialize()
+
+        email_enabled = os.getenv('ENABLE_EMAIL', 'False') == 'True'
+        if email_enabled:
+            subject, html_body, text_body = render_quotation_response(quotation_data)
+            enqueue_email(
+                to_email=quotation_data['customer_email'],
+                subject=subject,
+                html_body=html_body,
+                text_body=text_body,
+                quotation_id=id,
+            )
+
+        bump_version(QUOTATIONS)
         db.session.commit()
-        
         print(f"✅ Quotation {id} updated successfully")
-        print(f"📧 Email enabled: {os.getenv('ENABLE_EMAIL', 'False')}")
 
-        # Enviar email al cliente con la respuesta (deshabilitado temporalmente)
-        # TODO: Configurar servicio de email alternativo (SendGrid, Mailgun, etc.)
-        email_enabled = os.getenv('ENABLE_EMAIL', 'False') == 'True'
-        
         if not email_enabled:
             print("ℹ️ Email sending is disabled")
-            return jsonify({'message': 'Cotización actualizada correctamente', 'quotation': quotation.serialize()}), 200
-        
-        try:
-            sender_email = os.getenv('MAIL_DEFAULT_SENDER', 'envatex.ar@gmail.com')
-            sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
-            
-            # Verificar que tenemos la API key de SendGrid
-            if not sendgrid_api_key:
-                print("⚠️ SendGrid API key not configured, skipping email send")
-                return jsonify({'message': 'Cotización actualizada (email no configurado)', 'quotation': quotation.serialize()}), 200
-            
-            # Construir lista de productos
-            products_html = ""
-            for item in quotation.items:
-                products_html += f"""
-                <tr>
-                    <td style="padding: 10px; border: 1px solid #ddd;">{item.product.name}</td>
-                    <td style="padding: 10px; border: 1px solid #ddd; text-align: center;">{item.quantity}</td>
-                </tr>
-                """
-            
-            # URL del logo desde Cloudinary para máxima confiabilidad en emails
-            cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME', 'dtw6nypav')
-            logo_url = f"https://res.cloudinary.com/{cloud_name}/image/upload/qhbqltvbxzezwpksjy4n"
-            
-            html_content = f"""
-            <html>
-                <body style="font-family: Arial, sans-serif; color: #333; line-height: 1.6; background-color: #f9fafb;">
-                    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                        <!-- Header con logo -->
-                        <div style="text-align: center; margin-bottom: 30px; background: linear-gradient(135deg, #10b981 0%, #06b6d4 50%, #3b82f6 100%); padding: 30px 20px; border-radius: 12px 12px 0 0;">
-                            <img src="{logo_url}" alt="Envatex Logo" style="max-width: 120px; width: 120px; height: auto; display: block; margin: 0 auto 15px;" />
-                            <h2 style="color: white; margin: 0; font-size: 22px;">Respuesta a tu cotización</h2>
-                        </div>
-                        
-                        <!-- Contenido principal -->
-                        <div style="background-color: white; padding: 30px; border-radius: 0 0 12px 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                            <p style="font-size: 16px;">Hola <strong style="color: #2563eb;">{quotation.customer_name}</strong>,</p>
-                            <p>Hemos revisado tu solicitud de cotización y tenemos una respuesta para ti:</p>
-                        
-                        <div style="background-color: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                            <strong>Respuesta del administrador:</strong>
-                            <p style="margin-top: 10px;">{quotation.admin_response}</p>
-                        </div>
-                        
-                        <h3 style="color: #475569; margin-top: 30px;">Productos solicitados:</h3>
-                        <table style="width: 100%; border-collapse: collapse; margin: 15px 0;">
-                            <thead>
-                                <tr style="background-color: #64748b; color: white;">
-                                    <th style="padding: 10px; border: 1px solid #ddd; text-align: left;">Producto</th>
-                                    <th style="padding: 10px; border: 1px solid #ddd; text-align: center;">Cantidad</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {products_html}
-                            </tbody>
-                        </table>
-                        
-                            {f'<div style="background-color: #dbeafe; padding: 15px; border-radius: 8px; margin-top: 20px; border-left: 4px solid #3b82f6;"><p style="margin: 0;"><strong>Tus comentarios:</strong> {quotation.customer_comments}</p></div>' if quotation.customer_comments else ''}
-                            
-                            <p style="margin-top: 30px; font-size: 15px;">Si tienes alguna pregunta adicional, no dudes en contactarnos.</p>
-                            
-                            <!-- Footer -->
-                            <div style="margin-top: 40px; padding-top: 20px; border-top: 2px solid #e5e7eb; text-align: center;">
-                                <img src="{logo_url}" alt="Envatex" style="max-width: 80px; width: 80px; height: auto; display: block; margin: 0 auto 10px; opacity: 0.8;" />
-                                <p style="color: #9ca3af; margin: 0; font-size: 12px;">Tu proveedor de confianza en envases y embalajes</p>
-                            </div>
-                        </div>
-                    </div>
-                </body>
-            </html>
-            """
-            
-            # Enviar email usando SendGrid
-            message = Mail(
-                from_email=sender_email,
-                to_emails=quotation.customer_email,
-                subject='Respuesta a tu cotización - Envatex',
-                html_content=html_content
-            )
-            
-            sg = SendGridAPIClient(sendgrid_api_key)
-            response = sg.send(message)
-            
-            print(f"✅ Email sent successfully to {quotation.customer_email} (Status: {response.status_code})")
-            return jsonify({'message': 'Cotización actualizada y email enviado correctamente', 'quotation': quotation.serialize()}), 200
-        except Exception as email_error:
-            # Si falla el email, log pero no fallar la actualización
-            print(f"⚠️ Error sending email: {email_error}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'message': 'Cotización actualizada (error al enviar email)', 'quotation': quotation.serialize()}), 200
+            return jsonify({'message': 'Cotización actualizada correctamente', 'quotation': quotation_data}), 200
+
+        print(f"📧 Email to {quotation_data['customer_email']} queued in outbox")
+        return jsonify({'message': 'Cotización actualizada y email encolado para envío', 'quotation': quotation_data}), 200
 
     except Exception as e:
         print(f"❌ Error updating quotation: {e}")
@@ -202,23 +247,157 @@ def update_quotation(id):
 @quotations_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_quotation(id):
-    """Elimina una cotización por ID (requiere role=admin)."""
-    from models import Quotation
+    """Elimina una cotización por ID (requiere role=admin).
+
+    Los items los borra la base de datos (``ON DELETE CASCADE``). Si la
+    cotización ya está archivada se elimina del archivo.
+    """
+    from models import ArchivedQuotation, Quotation
+    from services.quotation_stats import daily_counts, lock_quotations, product_totals, record_deleted
     try:
         claims = get_jwt()
         if claims.get('role') != 'admin':
             return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
 
-        quotation = Quotation.query.get(id)
-        if not quotation:
-            return jsonify({'error': f'Cotización con id {id} no encontrada'}), 404
+        model, archived = Quotation, False
+        if not lock_quotations(Quotation.id == id):
+            model, archived = ArchivedQuotation, True
+            if not lock_quotations(ArchivedQuotation.id == id, archived=True):
+                return jsonify({'error': f'Cotización con id {id} no encontrada'}), 404
 
-        # Eliminar los items asociados primero si existen
-        for item in quotation.items:
-            db.session.delete(item)
-        db.session.delete(quotation)
+        selection = model.id == id
+        record_deleted(daily_counts(selection, archived=archived), product_totals(selection, archived=archived))
+        db.session.execute(delete(model).where(selection))
+        bump_version(QUOTATIONS)
         db.session.commit()
         return jsonify({'message': 'Cotización eliminada'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'No se pudo eliminar la cotización', 'details': str(e)}), 500
+
+
+@quotations_bp.route('/bulk', methods=['PATCH'])
+@jwt_required()
+def bulk_update_quotations():
+    """Responde o cambia el estado de varias cotizaciones a la vez (requiere role=admin).
+
+    Espera JSON con ``ids`` (lista) o ``filter`` (``status``,
+    ``customer_email``, ``created_from``, ``created_to``) y además:
+
+    - ``admin_response``: la respuesta, que marca las cotizaciones como
+      ``Responded`` y encola un email por cotización si el email está
+      habilitado; o
+    - ``status``: el nuevo estado, sin tocar la respuesta.
+
+    Es un único ``UPDATE ... RETURNING id`` sobre el conjunto; solo los
+    emails se generan fila a fila. Las filas se bloquean antes de leer su
+    estado para el resumen; si el filtro gana filas entre medias (una
+    cotización nueva) responde 409. Devuelve ``{"updated", "emails_queued"}``.
+    """
+    from models import EmailOutbox, Quotation
+    from queries.pagination import InvalidParameter
+    from queries.quotations import ITEMS_IN_BATCH, bulk_selection, load_quotations, select_quotations
+    from services.email_templates import render_quotation_response
+    from services.quotation_stats import daily_counts, lock_quotations, record_status_change
+    data = request.get_json(silent=True) or {}
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+
+        selection = bulk_selection(data)
+        if 'admin_response' in data:
+            values = {'admin_response': data['admin_response'], 'status': 'Responded'}
+        elif isinstance(data.get('status'), str) and 0 < len(data['status']) <= 20:
+            values = {'status': data['status']}
+        else:
+            raise InvalidParameter("Indica 'admin_response' o un 'status' de hasta 20 caracteres")
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        lock_quotations(selection)
+        counts = daily_counts(selection)
+        record_status_change(counts, values['status'])
+        ids = db.session.scalars(
+            update(Quotation).where(selection).values(**values).returning(Quotation.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if len(ids) != sum(counts.values()):
+            # Una cotización nueva entró en el filtro después del bloqueo
+            db.session.rollback()
+            return jsonify({'error': 'Las cotizaciones cambiaron durante la operación; vuelve a intentarlo'}), 409
+
+        queued = 0
+        if 'admin_response' in values and os.getenv('ENABLE_EMAIL', 'False') == 'True':
+            for start in range(0, len(ids), ITEMS_IN_BATCH):
+                chunk = ids[start:start + ITEMS_IN_BATCH]
+                emails = []
+                for quotation_data in load_quotations(select_quotations().where(Quotation.id.in_(chunk))):
+                    subject, html_body, text_body = render_quotation_response(quotation_data)
+                    emails.append({
+                        'to_email': quotation_data['customer_email'],
+                        'subject': subject,
+                        'html_body': html_body,
+                        'text_body': text_body,
+                        'quotation_id': quotation_data['id'],
+                    })
+                if emails:
+                    db.session.execute(insert(EmailOutbox), emails)
+                    queued += len(emails)
+
+        if ids:
+            bump_version(QUOTATIONS)
+        db.session.commit()
+        print(f"✅ {len(ids)} quotations updated in bulk ({queued} emails queued)")
+        return jsonify({
+            'message': 'Cotizaciones actualizadas correctamente',
+            'updated': len(ids),
+            'emails_queued': queued,
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'No se pudieron actualizar las cotizaciones', 'details': str(e)}), 500
+
+
+@quotations_bp.route('/bulk-delete', methods=['POST'])
+@jwt_required()
+def bulk_delete_quotations():
+    """Elimina varias cotizaciones por ``ids`` o ``filter`` (requiere role=admin).
+
+    Un solo ``DELETE`` sobre ``quotations``; los items caen por
+    ``ON DELETE CASCADE``. Como en ``bulk_update_quotations``, las filas se
+    bloquean antes de restarlas del resumen. Devuelve ``{"deleted": n}``.
+    """
+    from models import Quotation
+    from queries.pagination import InvalidParameter
+    from queries.quotations import bulk_selection
+    from services.quotation_stats import daily_counts, lock_quotations, product_totals, record_deleted
+    data = request.get_json(silent=True) or {}
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'error': 'Prohibido - se requiere rol de administrador'}), 403
+        selection = bulk_selection(data)
+    except InvalidParameter as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        lock_quotations(selection)
+        counts = daily_counts(selection)
+        record_deleted(counts, product_totals(selection))
+        result = db.session.execute(
+            delete(Quotation).where(selection).execution_options(synchronize_session=False)
+        )
+        deleted = result.rowcount
+        if deleted != sum(counts.values()):
+            # Una cotización nueva entró en el filtro después del bloqueo
+            db.session.rollback()
+            return jsonify({'error': 'Las cotizaciones cambiaron durante la operación; vuelve a intentarlo'}), 409
+        if deleted:
+            bump_version(QUOTATIONS)
+        db.session.commit()
+        return jsonify({'message': 'Cotizaciones eliminadas', 'deleted': deleted}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'No se pudieron eliminar las cotizaciones', 'details': str(e)}), 500
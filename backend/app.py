@@ -1,13 +1,18 @@
 # backend/app.py
 
 import os
+import click
+from datetime import timedelta
 from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
+from services.compression import init_compression
+from services.database import RoutingSession, configure_database
+from services.instrumentation import init_instrumentation
+from services.metrics import init_metrics
 
 # Cargar variables de entorno desde el archivo .env
 load_dotenv()
@@ -18,23 +23,80 @@ load_dotenv()
 # Creamos las instancias de las extensiones fuera del factory.
 # De esta manera, pueden ser importadas por otros módulos (como models.py)
 # sin causar importaciones circulares.
-db = SQLAlchemy()
-migrate = Migrate()
+# La sesión enruta las rutas de solo lectura a la réplica si está configurada
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 mail = Mail()
 
 
-import cloudinary
-import cloudinary.uploader
+class _LazyMigrateGroup(click.Group):
+    """Grupo `flask db` que importa Flask-Migrate solo cuando se invoca.
+
+    Importar Flask-Migrate arrastra Alembic (~170 ms), algo que ningún worker
+    que solo sirve peticiones necesita. Al primer uso se inicializa
+    ``Migrate``, que registra su propio grupo ``db``, y se le delega el
+    análisis de argumentos y la ejecución.
+    """
+
+    def __init__(self, app):
+        super().__init__(name='db', help='Perform database migrations.')
+        self._app = app
+
+    def _migrate_group(self):
+        if 'migrate' not in self._app.extensions:
+            from flask_migrate import Migrate
+            Migrate(self._app, db)
+        return self._app.cli.commands['db']
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self._migrate_group().make_context(info_name, args, parent=parent, **extra)
+
+
+# ---------------------------------------------------------------------------- #
+# Bootstrap de la base de datos
+# ---------------------------------------------------------------------------- #
+def bootstrap_database():
+    """Crea las tablas que falten y el usuario admin. Requiere app context.
+
+    Lo ejecuta ``init_db.py`` una vez por deploy; ``create_app`` solo lo
+    llama si ``DB_BOOTSTRAP_ON_STARTUP`` está activo (desarrollo local).
+    """
+    from models import User
+    db.create_all()
+    print("✅ Database tables created/verified")
+
+    admin_user = os.getenv('ADMIN_USER', 'admin')
+    admin_pass = os.getenv('ADMIN_PASSWORD', 'admin123')
+
+    existing = User.query.filter_by(username=admin_user).first()
+    if not existing:
+        u = User(username=admin_user)
+        u.set_password(admin_pass)
+        db.session.add(u)
+        db.session.commit()
+        print(f"✅ Created admin user '{admin_user}'")
+    else:
+        print(f"ℹ️ Admin user '{admin_user}' already exists")
+
+
 # ---------------------------------------------------------------------------- #
 # Application Factory
 # ---------------------------------------------------------------------------- #
-def create_app():
+def create_app(bootstrap=None):
     """
     Función factory para crear y configurar la aplicación Flask.
     Este patrón permite tener múltiples instancias de la app con diferentes
     configuraciones, lo cual es ideal para testing y escalabilidad.
+
+    ``bootstrap`` decide si se crean tablas y admin al arrancar; por defecto
+    lo indica ``DB_BOOTSTRAP_ON_STARTUP`` (True). En producción se desactiva
+    y ``init_db.py`` lo hace una sola vez antes de levantar gunicorn, de modo
+    que crear la app no hace ninguna operación de base de datos.
     """
     app = Flask(__name__)
+
+    # Codificador JSON configurable (orjson si está disponible)
+    from services.json_provider import get_json_provider_class
+    app.json = get_json_provider_class()(app)
     
     # Deshabilitar strict slashes para evitar redirects que rompen CORS
     app.url_map.strict_slashes = False
@@ -42,16 +104,23 @@ def create_app():
     # --- Configuración de la Aplicación ---
     # Se establece la URL de la base de datos desde una variable de entorno.
     # Si no se encuentra, se usa una base de datos SQLite local por defecto.
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///app.db')
+    # El pool y los timeouts salen del perfil DB_ENGINE_PROFILE y, si hay
+    # DATABASE_REPLICA_URL, se añade el bind de la réplica de lectura.
+    configure_database(app)
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
     # --- Inicialización de Extensiones ---
     # Se conectan las extensiones instanciadas previamente con la aplicación.
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate (y con él Alembic) solo se carga al usar `flask db ...`
+    app.cli.add_command(_LazyMigrateGroup(app))
     # Configurar JWT
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret')
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', app.config['SECRET_KEY'])
+    # Access tokens cortos; la sesión se renueva con el refresh token sin
+    # volver a verificar la contraseña (ver /api/auth/refresh)
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_MINUTES', 15)))
+    app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=int(os.getenv('JWT_REFRESH_TOKEN_DAYS', 7)))
     jwt = JWTManager(app)
     
     # Configurar Flask-Mail
@@ -64,7 +133,20 @@ def create_app():
     mail.init_app(app)
     
     # Configura CORS para permitir peticiones desde el front-end
-    CORS(app, resources={r"/*": {"origins": "*"}})
+    # (exponiendo las cabeceras de paginación para que el navegador las lea)
+    CORS(app, resources={r"/*": {"origins": "*"}}, expose_headers=['X-Next-Cursor', 'Link', 'Server-Timing'])
+
+    # SQL, llamadas externas y duración de cada petición: cabecera
+    # Server-Timing, línea JSON y log de consultas lentas (SLOW_QUERY_MS)
+    init_instrumentation(app)
+    # Contadores e histogramas por endpoint para GET /api/metrics
+    init_metrics(app)
+    # gzip/brotli según Accept-Encoding (COMPRESSION, COMPRESSION_MIN_BYTES)
+    init_compression(app)
+    # Barrido de subidas de imágenes que el pool de un worker dejó a medias
+    # (importado aquí: services.image_ingest necesita ``db``)
+    from services.image_ingest import init_image_ingest
+    init_image_ingest(app)
 
     # --- Importación y Registro de Modelos ---
     # Es crucial que los modelos se importen después de inicializar db
@@ -75,41 +157,18 @@ def create_app():
     # --- Registro de Rutas (Blueprints) ---
     from api import register_blueprints
     register_blueprints(app)
-    # --- Configuración de Cloudinary (si están presentes las variables) ---
-    cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
-    cloud_api_key = os.getenv('CLOUDINARY_API_KEY')
-    cloud_api_secret = os.getenv('CLOUDINARY_API_SECRET')
-    if cloud_name and cloud_api_key and cloud_api_secret:
-        cloudinary.config(
-            cloud_name=cloud_name,
-            api_key=cloud_api_key,
-            api_secret=cloud_api_secret,
-            secure=True
-        )
-
-    # --- Auto-crear tablas y usuario admin en producción ---
-    with app.app_context():
-        try:
-            # Crear todas las tablas si no existen
-            db.create_all()
-            print("✅ Database tables created/verified")
-            
-            # Crear usuario admin automáticamente
-            from models import User
-            admin_user = os.getenv('ADMIN_USER', 'admin')
-            admin_pass = os.getenv('ADMIN_PASSWORD', 'admin123')
-            
-            existing = User.query.filter_by(username=admin_user).first()
-            if not existing:
-                u = User(username=admin_user)
-                u.set_password(admin_pass)
-                db.session.add(u)
-                db.session.commit()
-                print(f"✅ Created admin user '{admin_user}'")
-            else:
-                print(f"ℹ️ Admin user '{admin_user}' already exists")
-        except Exception as e:
-            print(f"❌ Database initialization error: {e}")
+    # Cloudinary y SendGrid se importan y configuran la primera vez que se
+    # usan (services.cloudinary_client y services.email_backends).
+
+    # --- Auto-crear tablas y usuario admin (solo si está habilitado) ---
+    if bootstrap is None:
+        bootstrap = os.getenv('DB_BOOTSTRAP_ON_STARTUP', 'True') == 'True'
+    if bootstrap:
+        with app.app_context():
+            try:
+                bootstrap_database()
+            except Exception as e:
+                print(f"❌ Database initialization error: {e}")
 
     @app.route('/')
     def home():
@@ -119,6 +178,7 @@ def create_app():
             'version': '1.0.0',
             'endpoints': {
                 'health': '/api/health',
+                'metrics': '/api/metrics',
                 'products': '/api/products',
                 'quotations': '/api/quotations',
                 'auth': '/api/auth/login'
@@ -0,0 +1,14 @@
+# backend/asgi.py
+
+from app import create_app
+from services.asgi import AsgiAdapter
+
+# Misma aplicación que wsgi.py, servida por un servidor ASGI (uvicorn): cada
+# worker atiende hasta ASGI_THREADS peticiones a la vez (ver services.asgi)
+flask_app = create_app()
+app = AsgiAdapter(flask_app)
+
+# Este bloque permite ejecutar la aplicación directamente con 'python asgi.py'
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, port=5000)
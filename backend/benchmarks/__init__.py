@@ -0,0 +1,6 @@
+"""Herramientas de medición de rendimiento de la API.
+
+Los módulos de este paquete se ejecutan desde la carpeta ``backend`` con
+``python -m benchmarks.<modulo>`` y trabajan sobre bases SQLite temporales,
+nunca sobre la base configurada en ``DATABASE_URL``.
+"""
@@ -0,0 +1,158 @@
+"""Archivo de cotizaciones: lecturas transparentes, resumen intacto y tabla caliente pequeña.
+
+Siembra ``--quotations`` cotizaciones, envejece ``--old-fraction`` de ellas
+más allá del corte y las archiva por lotes. Comprueba que:
+
+- solo se mueven las de los estados pedidos y anteriores al corte;
+- ``GET /api/quotations/<id>`` devuelve lo mismo antes y después (con
+  ``archived: true``), ``PATCH`` responde 409 y ``DELETE`` las borra del archivo;
+- ``/api/quotations/stats`` no cambia al archivar y coincide con
+  ``rebuild_stats``, que también lee el archivo.
+
+Después informa la duración máxima de un lote (el tiempo que se retienen
+los bloqueos) y el coste del listado y del conteo antes y después.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_archive --quotations 20000 --batch-size 500
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+
+from benchmarks.common import admin_headers, temporary_app
+from benchmarks.seed import seed_database
+
+STATUSES = ('Responded', 'Archived')
+
+
+def latency(call, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(quotations, old_fraction, batch_size):
+    from app import db
+    from models import ArchivedQuotation, ArchivedQuotationItem, Quotation, QuotationItem
+    from services.quotation_archive import archive_batch, archive_cutoff
+    from services.quotation_stats import get_stats, rebuild_stats
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with temporary_app() as app:
+        client = app.test_client()
+        headers = admin_headers(app)
+        cutoff = archive_cutoff(120)
+        with app.app_context():
+            _, quotation_ids = seed_database(products=200, quotations=quotations, items_per_quotation=5)
+            old_ids = quotation_ids[int(len(quotation_ids) * (1 - old_fraction)):]
+            old_dates = db.session.execute(select(Quotation.id, Quotation.created_at).where(Quotation.id.in_(old_ids)))
+            db.session.execute(update(Quotation), [
+                {'id': quotation_id, 'created_at': created_at - timedelta(days=200)}
+                for quotation_id, created_at in old_dates.all()
+            ])
+            # Una cotización antigua sin atender no se archiva
+            db.session.execute(update(Quotation).where(Quotation.id == old_ids[0]).values(status='Pending'))
+            rebuild_stats()
+            db.session.commit()
+            eligible = db.session.scalars(select(Quotation.id).where(
+                Quotation.status.in_(STATUSES), Quotation.created_at < cutoff)).all()
+            expected = len(eligible)
+
+        def count_hot():
+            with app.app_context():
+                return db.session.scalar(select(func.count()).select_from(Quotation))
+
+        sample = eligible[:3]
+        before = {quotation_id: client.get(f'/api/quotations/{quotation_id}', headers=headers).get_json()
+                  for quotation_id in sample}
+        stats_before = client.get('/api/quotations/stats', headers=headers, query_string={'days': 366}).get_json()
+        hot_before = count_hot()
+        list_before = latency(lambda: client.get('/api/quotations', headers=headers, query_string={'limit': 50}))
+        count_before = latency(lambda: count_hot())
+
+        batches = []
+        moved = 0
+        while True:
+            with app.app_context():
+                start = time.perf_counter()
+                archived = archive_batch(cutoff, STATUSES, batch_size)
+                batches.append((time.perf_counter() - start) * 1000)
+            if not archived:
+                break
+            moved += archived
+
+        with app.app_context():
+            remaining = db.session.scalar(select(func.count()).select_from(Quotation).where(
+                Quotation.status.in_(STATUSES), Quotation.created_at < cutoff))
+            archived_rows = db.session.scalar(select(func.count()).select_from(ArchivedQuotation))
+            archived_items = db.session.scalar(select(func.count()).select_from(ArchivedQuotationItem))
+            orphan_items = db.session.scalar(select(func.count()).select_from(QuotationItem).where(
+                QuotationItem.quotation_id.not_in(select(Quotation.id))))
+        check(f'archivadas {moved} de {expected} elegibles', moved == expected == archived_rows and remaining == 0)
+        check('items movidos con su cotización', archived_items == moved * 5 and orphan_items == 0)
+        check('una pendiente antigua sigue en la tabla caliente',
+              client.get(f'/api/quotations/{old_ids[0]}', headers=headers).get_json()['archived'] is False)
+
+        after = {quotation_id: client.get(f'/api/quotations/{quotation_id}', headers=headers).get_json()
+                 for quotation_id in sample}
+        check('GET por id cae al archivo con los mismos datos', all(
+            after[i].pop('archived') is True and after[i].pop('archived_at')
+            and before[i].pop('archived') is False and after[i] == before[i] for i in sample))
+        stats_after = client.get('/api/quotations/stats', headers=headers, query_string={'days': 366}).get_json()
+        check('el resumen no cambia al archivar', stats_after == stats_before)
+
+        check('PATCH de una archivada responde 409', client.patch(
+            f'/api/quotations/{sample[0]}', headers=headers, json={'admin_response': 'x'}).status_code == 409)
+        check('DELETE de una archivada', client.delete(
+            f'/api/quotations/{sample[0]}', headers=headers).status_code == 200
+              and client.get(f'/api/quotations/{sample[0]}', headers=headers).status_code == 404)
+        incremental = client.get('/api/quotations/stats', headers=headers,
+                                 query_string={'days': 366, 'top': 100}).get_json()
+        with app.app_context():
+            rebuild_stats()
+            rebuilt = get_stats(days=366, top=100)
+            db.session.rollback()
+        check('resumen incremental == reconstruido (calientes + archivo)', incremental == rebuilt)
+
+        hot_after = count_hot()
+        list_after = latency(lambda: client.get('/api/quotations', headers=headers, query_string={'limit': 50}))
+        count_after = latency(lambda: count_hot())
+
+    print(f"\nlotes de {batch_size}: {len(batches) - 1}, máximo {max(batches):.1f} ms, "
+          f"mediana {statistics.median(batches):.1f} ms")
+    print(f"tabla caliente: {hot_before} -> {hot_after} cotizaciones")
+    print(f"listado (limit=50): {list_before:.2f} -> {list_after:.2f} ms")
+    print(f"count(*):           {count_before:.2f} -> {count_after:.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quotations', type=int, default=20000)
+    parser.add_argument('--old-fraction', type=float, default=0.8)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    failures = run(args.quotations, args.old_fraction, args.batch_size)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print('\n✅ Archivo de cotizaciones correcto')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Operaciones en bloque sobre cotizaciones frente a una petición por cotización.
+
+Siembra ``--quotations`` cotizaciones "spam" y compara borrarlas con un
+``DELETE /api/quotations/<id>`` cada una frente a un único
+``POST /api/quotations/bulk-delete`` por filtro: tiempo, sentencias SQL y
+que los items desaparezcan por ``ON DELETE CASCADE``. Comprueba también
+``PATCH /api/quotations/bulk`` por ids (respuesta con emails encolados) y
+por filtro (solo estado), y que un filtro vacío se rechace.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_bulk_quotations --quotations 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.common import StatementCounter, admin_headers, temporary_app
+from benchmarks.seed import seed_database
+
+SPAM_EMAIL = 'spam@example.com'
+
+
+def seed_spam(app, quotations):
+    """Siembra cotizaciones y marca todas como spam; devuelve sus ids."""
+    from app import db
+    from models import Quotation
+    with app.app_context():
+        _, quotation_ids = seed_database(products=50, quotations=quotations, items_per_quotation=5)
+        db.session.execute(Quotation.__table__.update().values(customer_email=SPAM_EMAIL, status='Pending'))
+        db.session.commit()
+    return quotation_ids
+
+
+def count_rows(app, model):
+    from app import db
+    with app.app_context():
+        return db.session.scalar(select(func.count()).select_from(model))
+
+
+def timed(call):
+    with StatementCounter() as counter:
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+    return result, elapsed, counter.count
+
+
+def run(quotations):
+    from models import EmailOutbox, Quotation, QuotationItem
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    previous = os.environ.get('ENABLE_EMAIL')
+    os.environ['ENABLE_EMAIL'] = 'True'
+    try:
+        with temporary_app() as app:
+            client = app.test_client()
+            headers = admin_headers(app)
+            quotation_ids = seed_spam(app, 20)
+
+            response = client.patch('/api/quotations/bulk', headers=headers,
+                                    json={'ids': quotation_ids[:5], 'admin_response': 'Sin stock por ahora'})
+            body = response.get_json()
+            check('respuesta en bloque por ids', response.status_code == 200
+                  and (body['updated'], body['emails_queued']) == (5, 5))
+            check('un email por cotización en el outbox', count_rows(app, EmailOutbox) == 5)
+            listed = client.get('/api/quotations', headers=headers, query_string={'status': 'Responded'}).get_json()
+            check('quedan respondidas', sorted(q['id'] for q in listed) == sorted(quotation_ids[:5])
+                  and all(q['admin_response'] == 'Sin stock por ahora' for q in listed))
+
+            response = client.patch('/api/quotations/bulk', headers=headers,
+                                    json={'filter': {'status': 'Pending'}, 'status': 'Archived'})
+            check('cambio de estado por filtro', response.get_json()['updated'] == 15
+                  and response.get_json()['emails_queued'] == 0)
+
+            for body in ({'filter': {}}, {'ids': []}, {'ids': [1], 'filter': {'status': 'Pending'}},
+                         {'ids': ['uno']}):
+                response = client.post('/api/quotations/bulk-delete', headers=headers, json=body)
+                check(f'rechaza {body}', response.status_code == 400)
+            check('sin token responde 401', client.post('/api/quotations/bulk-delete',
+                                                        json={'ids': [1]}).status_code == 401)
+
+        with temporary_app() as app:
+            client = app.test_client()
+            headers = admin_headers(app)
+            quotation_ids = seed_spam(app, quotations)
+            half = quotation_ids[:len(quotation_ids) // 2]
+
+            def one_by_one():
+                for quotation_id in half:
+                    client.delete(f'/api/quotations/{quotation_id}', headers=headers)
+
+            _, single_seconds, single_statements = timed(one_by_one)
+            response, bulk_seconds, bulk_statements = timed(lambda: client.post(
+                '/api/quotations/bulk-delete', headers=headers, json={'filter': {'customer_email': SPAM_EMAIL}},
+            ))
+            check('borrado en bloque por filtro', response.get_json()['deleted'] == len(quotation_ids) - len(half))
+            check('sin cotizaciones ni items (ON DELETE CASCADE)',
+                  count_rows(app, Quotation) == 0 and count_rows(app, QuotationItem) == 0)
+    finally:
+        if previous is None:
+            os.environ.pop('ENABLE_EMAIL', None)
+        else:
+            os.environ['ENABLE_EMAIL'] = previous
+
+    print(f"\nborrar {len(half)} cotizaciones una a una: {single_seconds:8.2f} s, {single_statements} sentencias")
+    print(f"borrar {len(quotation_ids) - len(half)} con bulk-delete:      {bulk_seconds:8.2f} s, "
+          f"{bulk_statements} sentencias")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quotations', type=int, default=2000, help='cotizaciones spam sembradas')
+    args = parser.parse_args()
+
+    failures = run(args.quotations)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print("\n✅ Operaciones en bloque correctas")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Compresión gzip/brotli y caché de las respuestas del catálogo.
+
+Comprueba sobre SQLite que:
+
+- ``/api/products`` y ``/api/quotations`` se comprimen según
+  ``Accept-Encoding`` (brotli si está instalado, si no gzip), con
+  ``Vary: Accept-Encoding`` y ETag débil, y descomprimidas son idénticas a la
+  respuesta sin comprimir;
+- el ETag débil de la versión comprimida sigue dando 304;
+- las respuestas pequeñas y las de streaming salen sin comprimir;
+- una página repetida del catálogo se sirve desde la caché con una
+  sola consulta (el sello de versión) y sin volver a comprimir, y un
+  ``PUT /api/products/<id>`` la invalida.
+
+Después mide el tamaño del catálogo completo por codificación y la latencia
+de ``GET /api/products`` sin caché (comprimiendo en cada petición) y con ella.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_compression --products 2000 --requests 200
+"""
+import argparse
+import gzip
+import statistics
+import sys
+import time
+from unittest import mock
+
+from benchmarks.common import StatementCounter, admin_headers, temporary_app
+from benchmarks.seed import seed_database
+
+
+def decode(response):
+    from services.compression import brotli
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        return gzip.decompress(response.data)
+    if encoding == 'br':
+        return brotli.decompress(response.data)
+    return response.data
+
+
+def latency(call, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(products, requests):
+    from services import compression, payload_cache
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    encodings = compression.available_encodings()
+    with temporary_app() as app:
+        client = app.test_client()
+        headers = admin_headers(app)
+        with app.app_context():
+            catalog_cache = payload_cache.get_catalog_cache()
+        with app.app_context():
+            product_ids, _ = seed_database(products=products, quotations=200, items_per_quotation=3)
+
+        for path, request_headers in (('/api/products', {}), ('/api/quotations', headers)):
+            plain = client.get(path, headers=request_headers)
+            for encoding in encodings:
+                response = client.get(path, headers={**request_headers, 'Accept-Encoding': encoding})
+                check(f'{path} con {encoding}', response.headers.get('Content-Encoding') == encoding
+                      and 'Accept-Encoding' in response.vary and decode(response) == plain.data
+                      and len(response.data) < len(plain.data) / 3)
+                etag, weak = response.get_etag()
+                check(f'{path} con {encoding}: ETag débil y 304', weak and client.get(path, headers={
+                    **request_headers, 'Accept-Encoding': encoding, 'If-None-Match': f'W/"{etag}"',
+                }).status_code == 304)
+        check('cliente con brotli y gzip recibe la preferida',
+              client.get('/api/products', headers={'Accept-Encoding': 'gzip, br'})
+              .headers.get('Content-Encoding') == encodings[0])
+        check('gzip;q=0 no se usa', 'Content-Encoding' not in client.get(
+            '/api/products', headers={'Accept-Encoding': 'gzip;q=0'}).headers)
+        check('respuesta pequeña sin comprimir', 'Content-Encoding' not in client.get(
+            '/api/health', headers={'Accept-Encoding': 'gzip'}).headers)
+        response = client.get('/api/products', headers={'Accept-Encoding': 'gzip', 'Accept': 'application/x-ndjson'})
+        check('streaming sin comprimir', response.is_streamed and 'Content-Encoding' not in response.headers)
+        response.close()
+
+        catalog_cache.clear()
+        page = {'limit': 50, 'name': 'Producto'}
+        with StatementCounter() as first:
+            client.get('/api/products', query_string=page, headers={'Accept-Encoding': 'gzip'})
+        with StatementCounter() as repeat, \
+                mock.patch.object(compression, 'compress', wraps=compression.compress) as dynamic, \
+                mock.patch.object(payload_cache, 'compress', wraps=payload_cache.compress) as cached_levels:
+            cached = client.get('/api/products', query_string=page, headers={'Accept-Encoding': 'gzip'})
+        check(f'página repetida desde la caché ({first.count} -> {repeat.count} consultas, sin recomprimir)',
+              repeat.count == 1 < first.count and dynamic.call_count == cached_levels.call_count == 0)
+        check('la caché conserva las cabeceras de paginación',
+              cached.headers.get('X-Next-Cursor') and 'rel="next"' in cached.headers.get('Link', ''))
+        response = client.put(f'/api/products/{product_ids[0]}', headers=headers, data={'name': 'Renombrado'})
+        check('PUT de producto vacía la caché', response.status_code == 200 and len(catalog_cache) == 0)
+        renamed = client.get('/api/products', query_string={'limit': 1})
+        check('el listado refleja la escritura', renamed.get_json()[0]['name'] == 'Renombrado')
+
+        sizes = {'identity': len(client.get('/api/products').data)}
+        for encoding in encodings:
+            sizes[encoding] = len(client.get('/api/products', headers={'Accept-Encoding': encoding}).data)
+
+        timings = {}
+        for encoding in ('identity',) + encodings:
+            request_headers = {'Accept-Encoding': encoding}
+            with mock.patch.object(catalog_cache, 'max_entries', 0):
+                catalog_cache.clear()
+                timings[(encoding, 'sin caché')] = latency(
+                    lambda: client.get('/api/products', headers=request_headers), requests)
+            timings[(encoding, 'con caché')] = latency(
+                lambda: client.get('/api/products', headers=request_headers), requests)
+
+    print(f"\ncatálogo completo ({products} productos):")
+    for encoding, size in sizes.items():
+        print(f"  {encoding:9} {size / 1024:9.1f} KB  ({size / sizes['identity']:.0%})")
+    print("GET /api/products (mediana):")
+    for (encoding, mode), ms in timings.items():
+        print(f"  {encoding:9} {mode:10} {ms:8.2f} ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    failures = run(args.products, args.requests)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print('\n✅ Compresión y caché del catálogo correctas')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
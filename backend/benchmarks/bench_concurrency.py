@@ -0,0 +1,133 @@
+"""Peticiones en vuelo por worker: gunicorn sync frente al modo ASGI.
+
+Arranca cada modo con ``--workers`` workers sobre la misma base SQLite
+sembrada, con ``IO_LATENCY_MS`` de espera por sentencia para simular una base
+remota (``benchmarks.io_latency``):
+
+- ``sync``: ``gunicorn`` con workers sync (el despliegue actual);
+- ``asgi``: ``gunicorn -k uvicorn_worker.UvicornWorker`` con ``asgi.py`` y
+  ``ASGI_THREADS`` hilos por worker (``services.asgi``).
+
+Para cada nivel de ``--concurrency`` mantiene ese número de clientes
+pidiendo ``GET /api/quotations?limit=20`` (tres consultas) durante
+``--duration`` segundos y mide peticiones por segundo, p50/p95 y las
+peticiones en vuelo por worker: la suma de los tiempos ``app`` de
+``Server-Timing`` (lo que la app tarda en atender cada una) dividida por la
+duración y por los workers. Las que esperan en la cola del socket cuentan en
+la latencia del cliente, pero no como en vuelo. Comprueba además que ambos
+modos devuelven el mismo cuerpo.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_concurrency --latency-ms 20 --concurrency 1 4 16 32
+"""
+import argparse
+import http.client
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmarks.common import admin_headers, gunicorn_server, temporary_app
+from benchmarks.load import ASGI_WORKER, percentile
+from benchmarks.seed import seed_database
+
+PATH = '/api/quotations?limit=20'
+MODES = {
+    'sync': {'app': 'benchmarks.io_latency:wsgi_app'},
+    'asgi': {'app': 'benchmarks.io_latency:asgi_app', 'worker_class': ASGI_WORKER},
+}
+
+
+def fetch(address, headers):
+    """``(estado, cuerpo, segundos dentro de la app según Server-Timing)``."""
+    connection = http.client.HTTPConnection(address, timeout=120)
+    try:
+        connection.request('GET', PATH, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read(), app_seconds(response.headers)
+    finally:
+        connection.close()
+
+
+def app_seconds(headers):
+    for part in (headers.get('Server-Timing') or '').split(','):
+        name, *params = [piece.strip() for piece in part.split(';')]
+        if name == 'app':
+            return float(params[0].removeprefix('dur=')) / 1000
+    return 0.0
+
+
+def sustain(address, headers, concurrency, duration):
+    """``concurrency`` clientes en bucle cerrado durante ``duration`` segundos."""
+    deadline = time.perf_counter() + duration
+
+    def client():
+        timings, busy, errors = [], 0.0, 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _, in_app = fetch(address, headers)
+            timings.append(time.perf_counter() - start)
+            busy += in_app
+            errors += status != 200
+        return timings, busy, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - started
+    timings = sorted(t for client_timings, _, _ in results for t in client_timings)
+    return {
+        'rps': len(timings) / elapsed,
+        'p50': percentile(timings, 0.50) * 1000,
+        'p95': percentile(timings, 0.95) * 1000,
+        'in_flight': sum(busy for _, busy, _ in results) / elapsed,
+        'errors': sum(errors for _, _, errors in results),
+    }
+
+
+def run(args):
+    results = {}
+    bodies = {}
+    with temporary_app() as app:
+        with app.app_context():
+            seed_database(products=200, quotations=500, items_per_quotation=3)
+        headers = admin_headers(app)
+        env = {'IO_LATENCY_MS': str(args.latency_ms), 'ASGI_THREADS': str(args.asgi_threads)}
+        for mode in args.modes:
+            with gunicorn_server(workers=args.workers, env=env, **MODES[mode]) as base:
+                address = urlsplit(base).netloc
+                # Calentamiento: imports perezosos y conexiones del pool
+                for _ in range(args.workers * 4):
+                    _, bodies[mode], _ = fetch(address, headers)
+                for concurrency in args.concurrency:
+                    results[(mode, concurrency)] = sustain(address, headers, concurrency, args.duration)
+    return results, bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--asgi-threads', type=int, default=15)
+    parser.add_argument('--latency-ms', type=float, default=20, help='espera simulada por sentencia SQL')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--duration', type=float, default=5, help='segundos por nivel de concurrencia')
+    args = parser.parse_args()
+
+    results, bodies = run(args)
+    print(f"\n{args.workers} worker(s), {args.latency_ms:g} ms por sentencia, GET {PATH}")
+    print(f"{'modo':6} {'clientes':>8} {'req/s':>8} {'p50':>9} {'p95':>9} {'en vuelo/worker':>16} {'err':>4}")
+    for (mode, concurrency), r in results.items():
+        in_flight = r['in_flight'] / args.workers
+        print(f"{mode:6} {concurrency:>8} {r['rps']:>8.1f} {r['p50']:>7.1f}ms {r['p95']:>7.1f}ms "
+              f"{in_flight:>16.1f} {r['errors']:>4}")
+
+    failed = any(r['errors'] for r in results.values())
+    if len(set(bodies.values())) > 1:
+        print('❌ Los modos devuelven cuerpos distintos')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
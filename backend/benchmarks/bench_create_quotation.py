@@ -0,0 +1,77 @@
+"""Latencia de ``POST /api/quotations`` según la cantidad de items.
+
+Mide la mediana y el p95 de latencia y las sentencias SQL por petición para
+distintos tamaños de cotización, sobre SQLite temporal y en proceso (sin red).
+Antes comprueba que los items con ids o cantidades no enteras, o cantidades
+menores que uno, se rechazan con 400.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_create_quotation --repeat 30
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.common import StatementCounter, temporary_app
+from benchmarks.seed import seed_database
+
+ITEM_COUNTS = [1, 10, 50, 100, 200]
+INVALID_ITEMS = [
+    {'product_id': True, 'quantity': 1},
+    {'product_id': '1', 'quantity': 1},
+    {'product_id': 1, 'quantity': 2.7},
+    {'product_id': 1, 'quantity': 0},
+    {'product_id': 1, 'quantity': -3},
+    {'product_id': 1},
+    [1, 1],
+]
+
+
+def run(item_counts, repeat):
+    results = []
+    with temporary_app() as app:
+        with app.app_context():
+            product_ids, _ = seed_database(products=max(item_counts), quotations=0)
+        client = app.test_client()
+        for item in INVALID_ITEMS:
+            response = client.post('/api/quotations', json={
+                'customer_name': 'Cliente benchmark', 'customer_email': 'bench@example.com', 'items': [item],
+            })
+            assert response.status_code == 400, (item, response.status_code)
+        for count in item_counts:
+            payload = {
+                'customer_name': 'Cliente benchmark',
+                'customer_email': 'bench@example.com',
+                'items': [{'product_id': pid, 'quantity': 3} for pid in product_ids[:count]],
+            }
+            client.post('/api/quotations', json=payload)  # calentamiento
+            timings = []
+            for _ in range(repeat):
+                with StatementCounter() as counter:
+                    start = time.perf_counter()
+                    response = client.post('/api/quotations', json=payload)
+                    timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 201, response.get_data(as_text=True)
+            timings.sort()
+            results.append({
+                'items': count,
+                'p50_ms': statistics.median(timings),
+                'p95_ms': timings[int(len(timings) * 0.95) - 1],
+                'statements': counter.count,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--items', type=int, nargs='*', default=ITEM_COUNTS)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'p50 ms':>9} {'p95 ms':>9} {'SQL/pet.':>9}")
+    for row in run(args.items, args.repeat):
+        print(f"{row['items']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['statements']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Renders por segundo del email de respuesta a una cotización.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_email_render --seconds 2
+"""
+import argparse
+import time
+
+from services.email_templates import render_quotation_response
+
+ITEM_COUNTS = [1, 10, 50, 200]
+
+
+def sample_quotation(items):
+    return {
+        'customer_name': 'Cliente <Ejemplo>',
+        'customer_email': 'cliente@example.com',
+        'customer_comments': 'Necesito entrega antes del viernes & factura A.',
+        'admin_response': 'Precio especial por volumen.\nValidez: 15 días.',
+        'items': [
+            {'quantity': i + 1, 'product': {'name': f'Bolsa de polietileno {i}'}}
+            for i in range(items)
+        ],
+    }
+
+
+def renders_per_second(quotation_data, seconds):
+    render_quotation_response(quotation_data)  # compilación y caché de fragmentos
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        render_quotation_response(quotation_data)
+        count += 1
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'renders/s':>12}")
+    for items in ITEM_COUNTS:
+        rate = renders_per_second(sample_quotation(items), args.seconds)
+        print(f'{items:>6} {rate:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""Importación y exportación masiva de productos.
+
+Comprueba sobre SQLite que ``POST /api/products/import``:
+
+- crea productos desde CSV y NDJSON, y actualiza los existentes por SKU o
+  por nombre sin borrar los campos que la fila deja vacíos;
+- informa las filas inválidas o en conflicto con su línea sin detener el
+  resto del archivo;
+- acepta de vuelta lo que devuelve ``GET /api/products/export``;
+- servido por ``asgi:app`` (uvicorn), recibe entero un cuerpo enviado con
+  ``Transfer-Encoding: chunked``, igual que con ``Content-Length``.
+
+Después mide ``--rows`` filas generadas al vuelo (el archivo nunca existe
+entero en memoria) frente a crear productos con un ``POST`` cada uno, y el
+pico de memoria de Python durante la importación y la exportación.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_import --rows 100000
+"""
+import argparse
+import http.client
+import io
+import json
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+from benchmarks.common import admin_headers, gunicorn_server, temporary_app
+from benchmarks.load import ASGI_WORKER
+
+
+class GeneratedFile(io.RawIOBase):
+    """Archivo de solo lectura cuyo contenido produce un generador de bytes.
+
+    ``seek`` solo informa la longitud (el cliente de pruebas la pregunta
+    antes de enviar); el contenido se lee una vez, de principio a fin.
+    """
+
+    def __init__(self, chunks, length):
+        self.chunks = iter(chunks)
+        self.length = length
+        self.position = 0
+        self.pending = b''
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self.position = self.length + offset if whence == io.SEEK_END else offset
+        return self.position
+
+    def readinto(self, buffer):
+        while not self.pending:
+            self.pending = next(self.chunks, b'')
+            if not self.pending:
+                return 0
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        self.position += size
+        return size
+
+
+def csv_lines(rows):
+    yield b'name,sku,description\n'
+    for i in range(rows):
+        yield f'Importado {i:06d},IMP-{i:06d},"Producto importado {i}, en bloque"\n'.encode()
+
+
+def post_file(client, headers, chunks, content_type, **params):
+    """Envía ``chunks`` como cuerpo sin reunirlo en memoria."""
+    length = sum(len(chunk) for chunk in chunks())
+    return client.post(
+        '/api/products/import', query_string=params, input_stream=GeneratedFile(chunks(), length),
+        headers={**headers, 'Content-Type': content_type},
+    )
+
+
+def products_by_sku(client):
+    return {p['sku'] or p['name']: p for p in client.get('/api/products').get_json()}
+
+
+def check_behaviour(client, headers, check):
+    csv_body = (
+        'name,sku,description,image_url\n'
+        'Tornillo,TOR-1,Tornillo de acero,https://example.com/t.jpg\n'
+        'Tuerca,TUE-1,,\n'
+        ',SIN-NOMBRE,Falta el nombre,\n'
+        'Arandela,,Sin SKU,\n'
+        'Tornillo,TOR-2,Nombre repetido con otro SKU,\n'
+        'Tuerca,TUE-1,Tuerca hexagonal,\n'
+    )
+    response = client.post('/api/products/import', data=csv_body, headers={**headers, 'Content-Type': 'text/csv'})
+    summary = response.get_json()
+    check('importación CSV responde 200', response.status_code == 200)
+    check('resumen de filas', (summary['processed'], summary['imported'], summary['failed']) == (6, 4, 2))
+    check('errores con número de línea', [e['line'] for e in summary['errors']] == [4, 6])
+    products = products_by_sku(client)
+    check('la última fila repetida gana', products['TUE-1']['description'] == 'Tuerca hexagonal')
+    check('productos sin SKU por nombre', 'Arandela' in products)
+
+    ndjson_body = '\n'.join([
+        json.dumps({'sku': 'TOR-1', 'name': 'Tornillo', 'description': 'Tornillo galvanizado'}),
+        '{no es json',
+        json.dumps({'name': 'Arandela', 'image_url': 'https://example.com/a.jpg'}),
+        json.dumps(['lista']),
+    ]) + '\n'
+    response = client.post('/api/products/import', data=ndjson_body,
+                           headers={**headers, 'Content-Type': 'application/x-ndjson'})
+    summary = response.get_json()
+    check('importación NDJSON', (summary['imported'], summary['failed']) == (2, 2))
+    products = products_by_sku(client)
+    check('actualiza por SKU sin borrar la imagen', products['TOR-1']['description'] == 'Tornillo galvanizado'
+          and products['TOR-1']['image_url'] == 'https://example.com/t.jpg')
+    check('actualiza por nombre', products['Arandela']['image_url'] == 'https://example.com/a.jpg')
+
+    exported = client.get('/api/products/export', headers=headers)
+    check('exportación CSV', exported.status_code == 200 and exported.mimetype == 'text/csv')
+    response = client.post('/api/products/import', data=exported.data,
+                           headers={**headers, 'Content-Type': 'text/csv'})
+    check('la exportación se reimporta sin errores', response.get_json()['failed'] == 0
+          and len(client.get('/api/products').get_json()) == len(products))
+
+    response = client.post('/api/products/import', data={'file': (io.BytesIO(exported.data), 'productos.csv')},
+                           headers=headers, content_type='multipart/form-data')
+    check('archivo en formulario multipart', response.status_code == 200 and response.get_json()['failed'] == 0)
+    check('sin token responde 401', client.post('/api/products/import', data=csv_body).status_code == 401)
+
+
+def check_asgi(headers, check, rows=500):
+    """Importa por HTTP contra ``asgi:app`` con y sin ``Content-Length``."""
+    with gunicorn_server(workers=1, app='asgi:app', worker_class=ASGI_WORKER) as base:
+        for name, chunked in (('Content-Length', False), ('Transfer-Encoding: chunked', True)):
+            lines = list(csv_lines(rows))
+            connection = http.client.HTTPConnection(urlsplit(base).netloc, timeout=60)
+            try:
+                connection.request('POST', '/api/products/import', encode_chunked=chunked,
+                                   body=iter(lines) if chunked else b''.join(lines),
+                                   headers={**headers, 'Content-Type': 'text/csv'})
+                response = connection.getresponse()
+                summary = json.loads(response.read())
+            finally:
+                connection.close()
+            check(f"ASGI: importación con {name} ({summary.get('processed')} filas)",
+                  response.status == 200 and summary.get('processed') == rows and summary.get('failed') == 0)
+
+
+def measure(rows, sample):
+    with temporary_app() as app:
+        client = app.test_client()
+        headers = admin_headers(app)
+
+        start = time.perf_counter()
+        for i in range(sample):
+            client.post('/api/products', headers=headers,
+                        data={'name': f'Individual {i}', 'sku': f'IND-{i:06d}', 'description': 'Uno por uno'})
+        per_post = (time.perf_counter() - start) / sample
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = post_file(client, headers, lambda: csv_lines(rows), 'text/csv')
+        import_seconds = time.perf_counter() - start
+        import_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        summary = response.get_json()
+        assert summary['imported'] == rows, summary
+
+        # Segunda pasada: todas las filas son actualizaciones
+        start = time.perf_counter()
+        post_file(client, headers, lambda: csv_lines(rows), 'text/csv')
+        update_seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = client.get('/api/products/export', headers=headers, buffered=False)
+        exported = sum(len(chunk) for chunk in response.response)
+        export_seconds = time.perf_counter() - start
+        export_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"\n{rows} filas:")
+    print(f"  POST individual      {per_post * 1000:8.2f} ms/producto (~{per_post * rows:.0f} s para {rows})")
+    print(f"  importación          {import_seconds:8.2f} s ({rows / import_seconds:.0f} filas/s), "
+          f"pico {import_peak / 2**20:.1f} MB")
+    print(f"  reimportación        {update_seconds:8.2f} s ({rows / update_seconds:.0f} filas/s)")
+    print(f"  exportación CSV      {export_seconds:8.2f} s ({exported / 2**20:.1f} MB), "
+          f"pico {export_peak / 2**20:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000, help='filas del archivo generado')
+    parser.add_argument('--sample', type=int, default=200, help='POST individuales para comparar')
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with temporary_app() as app:
+        check_behaviour(app.test_client(), admin_headers(app), check)
+        check_asgi(admin_headers(app), check)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    measure(args.rows, args.sample)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
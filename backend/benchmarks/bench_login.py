@@ -0,0 +1,105 @@
+"""Logins por segundo de un worker según el coste del hash, frente a refresh.
+
+Un worker síncrono atiende una petición a la vez, así que se mide en un solo
+hilo y en proceso (sin red): cuántos ``POST /api/auth/login`` por segundo
+admite con cada ``PASSWORD_HASH_METHOD`` y cuántos ``POST /api/auth/refresh``,
+que renuevan la sesión sin verificar la contraseña.
+
+También comprueba el rehash: un hash guardado con otro método se reemplaza
+por el configurado tras el primer login correcto.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_login --seconds 3
+"""
+import argparse
+import os
+import time
+
+from benchmarks.common import temporary_app
+
+METHODS = ['scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:1000000', 'pbkdf2:sha256:600000']
+CREDENTIALS = {'username': 'bench-admin', 'password': 'una-clave-larga'}
+
+
+def rate(call, seconds):
+    """Llamadas por segundo de ``call`` durante ``seconds`` (al menos 3 llamadas)."""
+    count = 0
+    start = time.perf_counter()
+    while count < 3 or time.perf_counter() - start < seconds:
+        call()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def set_user_hash(app, method):
+    from app import db
+    from models import User
+    from werkzeug.security import generate_password_hash
+    with app.app_context():
+        user = User.query.filter_by(username=CREDENTIALS['username']).first()
+        if user is None:
+            user = User(username=CREDENTIALS['username'])
+            db.session.add(user)
+        user.password_hash = generate_password_hash(CREDENTIALS['password'], method)
+        db.session.commit()
+
+
+def stored_method(app):
+    from models import User
+    with app.app_context():
+        return User.query.filter_by(username=CREDENTIALS['username']).first().password_hash.split('$')[0]
+
+
+def run(seconds):
+    previous = os.environ.get('PASSWORD_HASH_METHOD')
+    results = []
+    try:
+        with temporary_app() as app:
+            client = app.test_client()
+
+            def login():
+                response = client.post('/api/auth/login', json=CREDENTIALS)
+                assert response.status_code == 200, response.get_data(as_text=True)
+                return response.get_json()
+
+            for method in METHODS:
+                os.environ['PASSWORD_HASH_METHOD'] = method
+                set_user_hash(app, method)
+                results.append((f'login {method}', rate(login, seconds)))
+
+            refresh_token = login()['refresh_token']
+            headers = {'Authorization': f'Bearer {refresh_token}'}
+
+            def refresh():
+                response = client.post('/api/auth/refresh', headers=headers)
+                assert response.status_code == 200, response.get_data(as_text=True)
+
+            results.append(('refresh', rate(refresh, seconds)))
+
+            os.environ['PASSWORD_HASH_METHOD'] = METHODS[0]
+            set_user_hash(app, 'pbkdf2:sha256:600000')
+            before = stored_method(app)
+            login()
+            after = stored_method(app)
+    finally:
+        if previous is None:
+            os.environ.pop('PASSWORD_HASH_METHOD', None)
+        else:
+            os.environ['PASSWORD_HASH_METHOD'] = previous
+    return results, (before, after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=3.0, help='duración de cada medición')
+    args = parser.parse_args()
+
+    results, (before, after) = run(args.seconds)
+    print(f"{'operación':<34} {'pet./s':>9} {'ms/pet.':>9}")
+    for name, per_second in results:
+        print(f"{name:<34} {per_second:>9.1f} {1000 / per_second:>9.2f}")
+    print(f"\nrehash en login: {before} -> {after}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Perfil preforked de ``gunicorn.conf.py``: memoria compartida y fork seguro.
+
+Arranca gunicorn con ``--workers`` workers sobre una base SQLite con
+``--products`` productos, sin y con ``GUNICORN_PRELOAD``, y comprueba que:
+
+- con preload el master no conserva conexiones abiertas a la base y la
+  primera petición de cada worker al catálogo sale de la caché calentada en
+  el master (una consulta, la del sello de versión);
+- con ``GUNICORN_MAX_REQUESTS`` y jitter los workers se reciclan sin errores;
+- ``GUNICORN_THREADS`` arranca workers gthread.
+
+Mide la memoria tras servir las mismas peticiones en ambos modos, leyendo
+``/proc/<pid>/smaps_rollup``: PSS (la memoria compartida se reparte entre
+los procesos que la usan, así que la suma es el consumo real) y USS (la
+privada de cada worker). Solo funciona en Linux.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_preload --workers 4 --products 5000
+"""
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmarks.common import gunicorn_server, temporary_app
+from benchmarks.load import server_timing_queries
+from benchmarks.seed import seed_database
+
+WARM_PATHS = ('/api/products', '/api/products?limit=50', '/api/products/search?q=producto',
+              '/api/products?name=Producto 00', '/')
+
+
+def fetch(address, path, headers=None):
+    connection = http.client.HTTPConnection(address, timeout=60)
+    try:
+        connection.request('GET', path.replace(' ', '%20'), headers=headers or {})
+        response = connection.getresponse()
+        response.read()
+        return response.status, response.headers
+    finally:
+        connection.close()
+
+
+def memory_kb(pid):
+    """``{'Rss', 'Pss', 'Uss'}`` en KB de un proceso."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(':')
+            if rest.strip().endswith('kB'):
+                values[name] = int(rest.split()[0])
+    return {'Rss': values['Rss'], 'Pss': values['Pss'],
+            'Uss': values['Private_Clean'] + values['Private_Dirty']}
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as stat:
+                    fields = stat.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) == pid:
+                found.append(int(entry))
+    return sorted(found)
+
+
+def open_database_files(pid, database):
+    count = 0
+    for fd in os.listdir(f'/proc/{pid}/fd'):
+        try:
+            count += os.readlink(f'/proc/{pid}/fd/{fd}') == database
+        except OSError:
+            pass
+    return count
+
+
+class Server:
+    """gunicorn con fichero de pid, para localizar el master y sus workers."""
+
+    def __init__(self, workers, env):
+        self.pidfile = os.path.join(tempfile.mkdtemp(prefix='envatex-gunicorn-'), 'master.pid')
+        self.context = gunicorn_server(workers=workers, env={
+            'GUNICORN_CMD_ARGS': f'--pid {self.pidfile}', **env,
+        })
+
+    def __enter__(self):
+        self.address = urlsplit(self.context.__enter__()).netloc
+        with open(self.pidfile) as pidfile:
+            self.master = int(pidfile.read())
+        return self
+
+    def __exit__(self, *exc):
+        return self.context.__exit__(*exc)
+
+    def workers(self):
+        return children(self.master)
+
+
+def measure(preload, workers, rounds):
+    """Memoria por proceso tras ``rounds`` vueltas de ``WARM_PATHS`` por worker."""
+    env = {'GUNICORN_PRELOAD': str(preload), 'GUNICORN_MAX_REQUESTS': '0'}
+    with Server(workers, env) as server:
+        first = [fetch(server.address, '/api/products', {'Accept-Encoding': 'br, gzip'})
+                 for _ in range(workers * 2)]
+        database = os.environ['DATABASE_URL'].removeprefix('sqlite:///')
+        master_connections = open_database_files(server.master, database)
+        errors = 0
+        for _ in range(rounds * workers):
+            for path in WARM_PATHS:
+                status, _ = fetch(server.address, path, {'Accept-Encoding': 'gzip'})
+                errors += status != 200
+        time.sleep(0.5)
+        return {
+            'master': memory_kb(server.master),
+            'workers': [memory_kb(pid) for pid in server.workers()],
+            'first_queries': [server_timing_queries(headers) for _, headers in first],
+            'master_connections': master_connections,
+            'errors': errors,
+        }
+
+
+def check_recycling(workers):
+    env = {'GUNICORN_MAX_REQUESTS': '20', 'GUNICORN_MAX_REQUESTS_JITTER': '5'}
+    with Server(workers, env) as server:
+        before = set(server.workers())
+        statuses = [fetch(server.address, '/api/products?limit=50')[0] for _ in range(30 * workers)]
+        time.sleep(1)
+        after = set(server.workers())
+    return before, after, statuses
+
+
+def check_threads():
+    """Hilos del worker tras peticiones simultáneas (gthread los crea bajo demanda)."""
+    with Server(1, {'GUNICORN_THREADS': '4'}) as server:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: fetch(server.address, '/api/products'), range(40)))
+        return len(os.listdir(f'/proc/{server.workers()[0]}/task'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=10, help='vueltas de peticiones por worker antes de medir')
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with temporary_app() as app:
+        with app.app_context():
+            seed_database(products=args.products, quotations=200, items_per_quotation=3)
+        results = {preload: measure(preload, args.workers, args.rounds) for preload in (False, True)}
+        before, after, statuses = check_recycling(2)
+        threads = check_threads()
+
+    preloaded = results[True]
+    check('sin errores en ningún modo', not any(r['errors'] for r in results.values()))
+    check(f"master sin conexiones abiertas tras calentar ({preloaded['master_connections']})",
+          preloaded['master_connections'] == 0)
+    check(f"primera petición de los workers desde la caché del master ({preloaded['first_queries']} consultas)",
+          set(preloaded['first_queries']) == {1})
+    check(f'reciclado con jitter ({len(before - after)} workers reemplazados, sin errores)',
+          before - after and set(statuses) == {200})
+    check(f'GUNICORN_THREADS=4 arranca un worker con hilos ({threads} hilos)', threads >= 4)
+
+    print(f"\nmemoria con {args.workers} workers y {args.products} productos (MB):")
+    print(f"{'modo':12} {'PSS total':>10} {'USS/worker':>11} {'RSS/worker':>11} {'PSS master':>11}")
+    for preload, result in results.items():
+        workers = result['workers']
+        total = (result['master']['Pss'] + sum(w['Pss'] for w in workers)) / 1024
+        uss = sum(w['Uss'] for w in workers) / len(workers) / 1024
+        rss = sum(w['Rss'] for w in workers) / len(workers) / 1024
+        print(f"{'preload' if preload else 'sin preload':12} {total:>10.1f} {uss:>11.1f} {rss:>11.1f} "
+              f"{result['master']['Pss'] / 1024:>11.1f}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print('\n✅ Perfil preforked correcto')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Resumen de cotizaciones: coherencia incremental y coste frente al listado.
+
+Comprueba sobre SQLite que, tras crear, responder, borrar y operar en bloque
+a través de la API, el resumen mantenido con incrementos es idéntico al que
+produce ``rebuild_stats`` desde cero, y que coincide con agregar a mano el
+listado completo (lo que hacía el panel en el navegador).
+
+Con ``--postgres URL`` comprueba además, en una base Postgres desechable,
+que borrar, responder y cambiar de estado la misma cotización desde varias
+peticiones a la vez no descuadra el resumen (cada una la cuenta una vez).
+
+Después mide ``GET /api/quotations/stats`` frente a descargar
+``GET /api/quotations`` con distinto número de cotizaciones.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_quotation_stats --scales 1000 20000
+    python -m benchmarks.bench_quotation_stats --postgres postgresql://localhost/envatex_stats
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import admin_headers, postgres_app, temporary_app
+from benchmarks.seed import seed_database
+
+
+def rebuilt(app):
+    """Resumen recalculado desde cero (sin confirmar)."""
+    from app import db
+    from services.quotation_stats import get_stats, rebuild_stats
+    with app.app_context():
+        rebuild_stats()
+        stats = get_stats(days=3650, top=1000)
+        db.session.rollback()
+    return stats
+
+
+def from_listing(quotations):
+    """Agregados calculados a partir del listado completo, como el navegador."""
+    by_status = Counter(q['status'] for q in quotations)
+    quantities = Counter()
+    for quotation in quotations:
+        for item in quotation['items']:
+            quantities[item['product_id']] += item['quantity']
+    return dict(by_status), dict(quantities)
+
+
+def latency(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def check_consistency(check):
+    from app import db
+    from services.quotation_stats import rebuild_stats
+    with temporary_app() as app:
+        client = app.test_client()
+        headers = admin_headers(app)
+        with app.app_context():
+            product_ids, quotation_ids = seed_database(products=20, quotations=60, items_per_quotation=4)
+            # La siembra inserta directamente en las tablas: partir de un resumen recalculado
+            rebuild_stats()
+            db.session.commit()
+
+        for i in range(5):
+            client.post('/api/quotations', json={
+                'customer_name': f'Nuevo {i}', 'customer_email': f'nuevo{i}@example.com',
+                'items': [{'product_id': product_ids[0], 'quantity': 7},
+                          {'product_id': product_ids[i + 1], 'quantity': 2},
+                          {'product_id': product_ids[0], 'quantity': 1}],
+            })
+        client.patch(f'/api/quotations/{quotation_ids[0]}', headers=headers, json={'admin_response': 'Hecho'})
+        client.delete(f'/api/quotations/{quotation_ids[1]}', headers=headers)
+        client.patch('/api/quotations/bulk', headers=headers,
+                     json={'ids': quotation_ids[2:12], 'status': 'Archived'})
+        client.post('/api/quotations/bulk-delete', headers=headers, json={'ids': quotation_ids[12:20]})
+        client.delete(f'/api/products/{product_ids[-1]}', headers=headers)
+
+        stats = client.get('/api/quotations/stats', headers=headers, query_string={'days': 3650, 'top': 1000})
+        check('GET /api/quotations/stats responde 200', stats.status_code == 200)
+        incremental = stats.get_json()
+        check('incremental == reconstruido desde cero', incremental == rebuilt(app))
+
+        by_status, quantities = from_listing(client.get('/api/quotations', headers=headers).get_json())
+        check('totales por estado == listado', incremental['by_status'] == by_status)
+        check('cantidades por producto == listado',
+              {p['product_id']: p['quantity'] for p in incremental['top_products']} == quantities)
+        check('304 con el mismo ETag', client.get(
+            '/api/quotations/stats', headers={**headers, 'If-None-Match': stats.headers['ETag']},
+            query_string={'days': 3650, 'top': 1000},
+        ).status_code == 304)
+        check('parámetros inválidos responden 400',
+              client.get('/api/quotations/stats', headers=headers, query_string={'days': 'x'}).status_code == 400)
+
+
+def check_concurrency(url, check, rounds=5, clients=4):
+    """Varias peticiones simultáneas sobre las mismas cotizaciones (Postgres)."""
+    from app import db
+    from services.quotation_stats import rebuild_stats
+    with postgres_app(url) as app:
+        with app.app_context():
+            db.create_all()
+            _, quotation_ids = seed_database(products=20, quotations=20 * rounds, items_per_quotation=4)
+            rebuild_stats()
+            db.session.commit()
+        headers = admin_headers(app)
+
+        def at_once(call):
+            barrier = threading.Barrier(clients)
+            statuses = []
+
+            def worker():
+                client = app.test_client()
+                barrier.wait()
+                statuses.append(call(client).status_code)
+
+            threads = [threading.Thread(target=worker) for _ in range(clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return statuses
+
+        statuses = []
+        for i in range(rounds):
+            ids = quotation_ids[i * 20:(i + 1) * 20]
+            statuses += at_once(lambda client: client.patch(
+                f'/api/quotations/{ids[0]}', headers=headers, json={'admin_response': 'Hecho'}))
+            statuses += at_once(lambda client: client.patch(
+                '/api/quotations/bulk', headers=headers, json={'ids': ids[1:10], 'status': 'Archived'}))
+            statuses += at_once(lambda client: client.delete(f'/api/quotations/{ids[10]}', headers=headers))
+            statuses += at_once(lambda client: client.post(
+                '/api/quotations/bulk-delete', headers=headers, json={'ids': ids[11:20]}))
+        check(f'peticiones simultáneas responden 200 o 404 ({sorted(set(statuses))})',
+              set(statuses) <= {200, 404})
+
+        client = app.test_client()
+        incremental = client.get('/api/quotations/stats', headers=headers,
+                                 query_string={'days': 3650, 'top': 1000}).get_json()
+        check('incremental == reconstruido tras peticiones simultáneas', incremental == rebuilt(app))
+
+
+def measure(scales, repeat):
+    from app import db
+    from services.quotation_stats import rebuild_stats
+    print(f"\n{'cotizaciones':>12} {'stats ms':>10} {'listado ms':>11} {'listado KB':>11}")
+    for quotations in scales:
+        with temporary_app() as app:
+            with app.app_context():
+                seed_database(products=200, quotations=quotations, items_per_quotation=5)
+                rebuild_stats()
+                db.session.commit()
+            client = app.test_client()
+            headers = admin_headers(app)
+            stats_ms = latency(lambda: client.get('/api/quotations/stats', headers=headers), repeat)
+            listing = client.get('/api/quotations', headers=headers)
+            listing_ms = latency(lambda: client.get('/api/quotations', headers=headers), max(3, repeat // 10))
+        print(f"{quotations:>12} {stats_ms:>10.2f} {listing_ms:>11.2f} {len(listing.data) / 1024:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 20000])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--postgres', help='URL de una base Postgres desechable')
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    check_consistency(check)
+    if args.postgres:
+        check_concurrency(args.postgres, check)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    measure(args.scales, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
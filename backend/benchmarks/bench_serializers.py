@@ -0,0 +1,95 @@
+"""Filas/segundo: ``serialize()`` sobre instancias ORM vs proyección de columnas.
+
+Compara, para 10k productos y 100k items de cotización (20k cotizaciones con
+5 items), el camino ORM (hidratar instancias con carga anticipada y llamar a
+``serialize()``) contra la proyección Core de ``queries``, y el costo de
+codificar el resultado con cada proveedor JSON.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_serializers
+"""
+import argparse
+import time
+
+from benchmarks.common import temporary_app
+from benchmarks.seed import seed_database
+
+
+def _timed(fn, repeat):
+    """Mejor tiempo de ``repeat`` ejecuciones y el último resultado."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(products, quotations, items_per_quotation, repeat):
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import select
+
+    from app import db
+    from models import Product, Quotation
+    from queries.products import list_products
+    from queries.quotations import eager_options, list_quotations
+    from services.json_provider import OrjsonProvider, orjson
+
+    with temporary_app() as app:
+        with app.app_context():
+            seed_database(products, quotations, items_per_quotation)
+            total_items = quotations * items_per_quotation
+
+            def orm_products():
+                db.session.expunge_all()
+                return [p.serialize() for p in db.session.scalars(select(Product).order_by(Product.id))]
+
+            def projected_products():
+                return list_products()[0]
+
+            def orm_quotations():
+                db.session.expunge_all()
+                statement = (
+                    select(Quotation).options(*eager_options())
+                    .order_by(Quotation.created_at.desc(), Quotation.id.desc())
+                )
+                return [q.serialize() for q in db.session.scalars(statement)]
+
+            def projected_quotations():
+                return list_quotations()[0]
+
+            rows = []
+            for label, count, fn in (
+                ('productos ORM serialize()', products, orm_products),
+                ('productos proyección', products, projected_products),
+                ('items ORM serialize()', total_items, orm_quotations),
+                ('items proyección', total_items, projected_quotations),
+            ):
+                seconds, payload = _timed(fn, repeat)
+                rows.append((label, count / seconds, seconds))
+
+            providers = [('json stdlib', DefaultJSONProvider(app))]
+            if orjson is not None:
+                providers.append(('json orjson', OrjsonProvider(app)))
+            for label, provider in providers:
+                seconds, _ = _timed(lambda: provider.dumps(payload), repeat)
+                rows.append((f'{label} (cotizaciones)', total_items / seconds, seconds))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=10_000)
+    parser.add_argument('--quotations', type=int, default=20_000)
+    parser.add_argument('--items', type=int, default=5, help='items por cotización')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'camino':34} {'filas/s':>12} {'segundos':>9}")
+    for label, rate, seconds in run(args.products, args.quotations, args.items, args.repeat):
+        print(f'{label:34} {rate:>12,.0f} {seconds:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Tiempo de arranque de un worker: importación, ``create_app`` y primera petición.
+
+Cada medición corre en un proceso nuevo (como un worker de gunicorn recién
+creado) sobre una base SQLite temporal ya inicializada, e informa también
+si los SDK pesados (cloudinary, sendgrid) quedaron importados.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+application = app_module.create_app()
+t2 = time.perf_counter()
+client = application.test_client()
+status = client.get('/api/products').status_code
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+    'status': status,
+    'cloudinary_loaded': 'cloudinary' in sys.modules,
+    'sendgrid_loaded': 'sendgrid' in sys.modules,
+}))
+'''
+
+
+def probe(env):
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='envatex-startup-') as tmpdir:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'startup.db')}")
+        # Inicializar la base una vez, como haría init_db.py en el deploy
+        subprocess.run([sys.executable, 'init_db.py'], cwd=BACKEND_DIR, env=env,
+                       capture_output=True, check=True)
+
+        modes = [('bootstrap en cada worker', 'True'), ('sin bootstrap (deploy)', 'False')]
+        print(f"{'modo':28} {'import':>8} {'create_app':>11} {'1ª petición':>12} {'total':>8}  SDKs cargados")
+        for label, bootstrap in modes:
+            runs = [probe(dict(env, DB_BOOTSTRAP_ON_STARTUP=bootstrap)) for _ in range(args.runs)]
+            median = {key: statistics.median(r[key] for r in runs)
+                      for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')}
+            sdks = [name for name in ('cloudinary', 'sendgrid') if runs[-1][f'{name}_loaded']]
+            print(f"{label:28} {median['import_ms']:>6.0f}ms {median['create_app_ms']:>9.0f}ms "
+                  f"{median['first_request_ms']:>10.0f}ms {median['total_ms']:>6.0f}ms  {', '.join(sdks) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Comprobación de la ingesta asíncrona de imágenes con el uploader local.
+
+Registra un uploader local lento (simula la latencia de Cloudinary) y otro
+que siempre falla, y comprueba que:
+
+- ``POST /api/products`` con imagen responde sin esperar a la subida.
+- El pool sube la imagen y rellena ``image_url`` con una URL absoluta; ``/media`` la sirve.
+- ``PUT`` con una imagen nueva la sustituye al terminar.
+- Un fallo queda ``pending`` con el error y un reintento programado.
+- Una subida que el pool perdió (worker reciclado) la recoge el barrido.
+
+Termina con código 1 si alguna comprobación falla.
+
+Uso (desde backend/):
+    python -m benchmarks.check_image_ingest
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import wait
+
+from sqlalchemy import update
+
+from benchmarks.common import admin_headers, temporary_app
+
+UPLOAD_LATENCY = 0.5
+# temporary_app desactiva el barrido automático; aquí se llama a mano
+SWEEP_INTERVAL = 60
+# El test client de Flask atiende peticiones a localhost
+MEDIA_BASE_URL = 'http://localhost/media'
+
+
+def image_form(data, **fields):
+    return {**fields, 'image': (io.BytesIO(data), 'foto.png')}
+
+
+def product_image_url(client, product_id):
+    products = client.get('/api/products').get_json()
+    return next(p['image_url'] for p in products if p['id'] == product_id)
+
+
+def run_checks():
+    from services import image_ingest
+    from services.image_uploaders import LocalUploader, register_image_uploader
+
+    class SlowLocalUploader(LocalUploader):
+        def upload(self, path):
+            time.sleep(UPLOAD_LATENCY)
+            return super().upload(path)
+
+    class BrokenUploader:
+        def upload(self, path):
+            raise RuntimeError('servicio de imágenes caído')
+
+    register_image_uploader('slow-local', SlowLocalUploader)
+    register_image_uploader('broken', BrokenUploader)
+
+    failures = []
+    futures = []
+    original_schedule = image_ingest.schedule_uploads
+
+    def tracking_schedule(upload_ids):
+        scheduled = original_schedule(upload_ids)
+        futures.extend(scheduled)
+        return scheduled
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    import api.products
+    api.products.schedule_uploads = tracking_schedule
+    os.environ['IMAGE_UPLOADER'] = 'slow-local'
+    try:
+        with temporary_app() as app:
+            client = app.test_client()
+            headers = admin_headers(app)
+
+            start = time.perf_counter()
+            response = client.post('/api/products', headers=headers, content_type='multipart/form-data',
+                                   data=image_form(b'primera', name='Tornillo', sku='T-1'))
+            elapsed = time.perf_counter() - start
+            body = response.get_json()
+            check('POST con imagen responde 201', response.status_code == 201)
+            check(f'POST no espera a la subida ({elapsed * 1000:.0f} ms < {UPLOAD_LATENCY * 1000:.0f} ms)',
+                  elapsed < UPLOAD_LATENCY)
+            check('la subida queda pendiente', body['image_upload']['status'] == 'pending')
+            product_id = body['product']['id']
+
+            wait(futures, timeout=10)
+            image_url = product_image_url(client, product_id)
+            check('el pool rellena image_url con una URL absoluta',
+                  bool(image_url) and image_url.startswith(f'{MEDIA_BASE_URL}/'))
+            served = client.get(image_url)
+            check('/media sirve la imagen subida', served.status_code == 200 and served.data == b'primera')
+            served.close()
+
+            futures.clear()
+            response = client.put(f'/api/products/{product_id}', headers=headers,
+                                  content_type='multipart/form-data', data=image_form(b'segunda'))
+            check('PUT mantiene la imagen anterior mientras sube',
+                  response.get_json()['product']['image_url'] == image_url)
+            wait(futures, timeout=10)
+            new_url = product_image_url(client, product_id)
+            check('PUT sustituye la imagen al terminar', new_url != image_url and client.get(new_url).data == b'segunda')
+
+            staged = os.listdir(image_ingest.staging_dir())
+            check('no quedan archivos temporales', staged == [])
+
+            os.environ['IMAGE_UPLOADER'] = 'broken'
+            futures.clear()
+            response = client.post('/api/products', headers=headers, content_type='multipart/form-data',
+                                   data=image_form(b'tercera', name='Tuerca', sku='T-2'))
+            wait(futures, timeout=10)
+            with app.app_context():
+                from app import db
+                from models import ImageUpload
+                upload = db.session.get(ImageUpload, response.get_json()['image_upload']['id'])
+                check('un fallo queda pendiente con reintento',
+                      upload.status == 'pending' and upload.attempts == 1 and 'caído' in upload.last_error)
+                check('y conserva el archivo temporal', os.path.exists(upload.staged_path))
+
+            # Worker reciclado antes de que su pool tomase la subida
+            os.environ['IMAGE_UPLOADER'] = 'slow-local'
+            api.products.schedule_uploads = lambda upload_ids: []
+            response = client.post('/api/products', headers=headers, content_type='multipart/form-data',
+                                   data=image_form(b'cuarta', name='Arandela', sku='T-3'))
+            lost_id = response.get_json()['image_upload']['id']
+            image_ingest.sweep_uploads(app, SWEEP_INTERVAL)
+            with app.app_context():
+                check('el barrido respeta las subidas recién encoladas',
+                      db.session.get(ImageUpload, lost_id).status == 'pending')
+                db.session.execute(update(ImageUpload).where(ImageUpload.id == lost_id).values(
+                    next_attempt_at=datetime.utcnow() - timedelta(seconds=SWEEP_INTERVAL + 1)))
+                db.session.commit()
+            image_ingest.sweep_uploads(app, SWEEP_INTERVAL)
+            with app.app_context():
+                check('el barrido recoge la subida perdida',
+                      db.session.get(ImageUpload, lost_id).status == 'done')
+    finally:
+        api.products.schedule_uploads = original_schedule
+        os.environ.pop('IMAGE_UPLOADER', None)
+    return failures
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='envatex-images-')
+    os.environ['IMAGE_STAGING_DIR'] = os.path.join(workdir, 'staging')
+    os.environ['IMAGE_LOCAL_DIR'] = os.path.join(workdir, 'media')
+    os.environ['IMAGE_LOCAL_BASE_URL'] = MEDIA_BASE_URL
+    try:
+        failures = run_checks()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print("\n✅ Ingesta de imágenes correcta")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Comprobación y medida del almacén local de imágenes (``IMAGE_UPLOADER=store``).
+
+Sube fotos generadas con Pillow a través de la API y comprueba que:
+
+- El producto expone ``image_srcset`` con las versiones 160/480/1200 px.
+- Cada versión tiene el ancho indicado y el original nunca se amplía.
+- La misma imagen subida dos veces se guarda una sola vez (mismo hash).
+- Los listados de productos y cotizaciones incluyen el ``srcset``.
+
+También informa del peso de cada versión frente al original y del tiempo de
+generación en el pool de procesos. Termina con código 1 si algo falla.
+
+Uso (desde backend/):
+    python -m benchmarks.check_image_store
+"""
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+
+from benchmarks.common import admin_headers, temporary_app
+
+
+def photo_bytes(width, height, seed=0):
+    """PNG con ruido y degradado: pesa como una foto, no como un color plano."""
+    from PIL import Image
+    noise = Image.effect_noise((width, height), 40 + seed).convert('RGB')
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    buffer = io.BytesIO()
+    Image.blend(noise, gradient, 0.5).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def run_checks():
+    from PIL import Image
+    from services import image_ingest
+    from services.image_uploaders import local_media_dir
+
+    failures = []
+    futures = []
+    original_schedule = image_ingest.schedule_uploads
+
+    def tracking_schedule(upload_ids):
+        scheduled = original_schedule(upload_ids)
+        futures.extend(scheduled)
+        return scheduled
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    def create(client, headers, data, name):
+        futures.clear()
+        response = client.post('/api/products', headers=headers, content_type='multipart/form-data',
+                               data={'name': name, 'sku': name, 'image': (io.BytesIO(data), f'{name}.png')})
+        start = time.perf_counter()
+        wait(futures, timeout=60)
+        elapsed = time.perf_counter() - start
+        products = {p['id']: p for p in client.get('/api/products').get_json()}
+        return products[response.get_json()['product']['id']], elapsed
+
+    def served_width(client, url):
+        response = client.get(url)
+        with Image.open(io.BytesIO(response.data)) as image:
+            width = image.width
+        response.close()
+        return width, len(response.data)
+
+    import api.products
+    api.products.schedule_uploads = tracking_schedule
+    os.environ['IMAGE_UPLOADER'] = 'store'
+    try:
+        with temporary_app() as app:
+            client = app.test_client()
+            headers = admin_headers(app)
+
+            large = photo_bytes(2400, 1600)
+            product, elapsed = create(client, headers, large, 'Foto-grande')
+            srcset = product['image_srcset'] or {}
+            check('srcset con 160w, 480w y 1200w', sorted(srcset, key=lambda k: int(k[:-1])) == ['160w', '480w', '1200w'])
+            check('image_url apunta a la versión full', product['image_url'] == srcset.get('1200w'))
+            print(f"   original {len(large) / 1024:.0f} KB, ingesta completa en {elapsed * 1000:.0f} ms")
+            for descriptor, url in srcset.items():
+                width, size = served_width(client, url)
+                check(f'{descriptor} mide {width} px ({size / 1024:.1f} KB)', f'{width}w' == descriptor)
+
+            create(client, headers, large, 'Foto-repetida')
+            stored = [d for d in os.listdir(local_media_dir()) if os.path.isdir(os.path.join(local_media_dir(), d))]
+            hashes = [h for d in stored for h in os.listdir(os.path.join(local_media_dir(), d))]
+            check('la misma imagen se guarda una sola vez', len(hashes) == 1)
+
+            small, _ = create(client, headers, photo_bytes(300, 200, seed=1), 'Foto-chica')
+            check('una imagen pequeña no se amplía', sorted(small['image_srcset']) == ['160w', '300w'])
+
+            client.post('/api/quotations', json={
+                'customer_name': 'Cliente', 'customer_email': 'cliente@example.com',
+                'items': [{'product_id': product['id'], 'quantity': 1}],
+            })
+            quotation = client.get('/api/quotations', headers=headers).get_json()[0]
+            check('las cotizaciones incluyen el srcset del producto',
+                  quotation['items'][0]['product']['image_srcset'] == srcset)
+    finally:
+        api.products.schedule_uploads = original_schedule
+        os.environ.pop('IMAGE_UPLOADER', None)
+    return failures
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='envatex-store-')
+    os.environ['IMAGE_STAGING_DIR'] = os.path.join(workdir, 'staging')
+    os.environ['IMAGE_LOCAL_DIR'] = os.path.join(workdir, 'media')
+    os.environ['IMAGE_LOCAL_BASE_URL'] = 'http://localhost/media'
+    try:
+        failures = run_checks()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print("\n✅ Almacén de imágenes correcto")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
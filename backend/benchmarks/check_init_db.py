@@ -0,0 +1,207 @@
+"""Despliegue sobre una base existente: ``init_db.py`` la pone al día.
+
+El despliegue documentado (``render.yaml``) ejecuta ``python init_db.py`` y
+nunca ``flask db upgrade``, así que todo lo que añaden las migraciones debe
+crearlo también ``init_db.py``. Esta comprobación crea el esquema del commit
+inicial (sin las columnas, índices ni tablas posteriores) con un producto y
+una cotización, ejecuta ``init_db.init_database()`` dos veces (debe ser
+idempotente) y comprueba con la API que la base queda utilizable.
+
+Con ``--postgres URL`` la repite en una base Postgres desechable: al
+terminar se borra todo su esquema ``public``. Sin él usa un SQLite temporal.
+
+Uso (desde backend/):
+    python -m benchmarks.check_init_db
+    python -m benchmarks.check_init_db --postgres postgresql://localhost/envatex_init_db
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from benchmarks.common import admin_headers
+
+# Esquema del commit inicial, tal como lo dejaba db.create_all()
+legacy = sa.MetaData()
+sa.Table(
+    'products', legacy,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(120), nullable=False, unique=True),
+    sa.Column('description', sa.Text),
+    sa.Column('sku', sa.String(50), unique=True),
+    sa.Column('image_url', sa.String(255)),
+)
+sa.Table(
+    'quotations', legacy,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('customer_name', sa.String(100), nullable=False),
+    sa.Column('customer_email', sa.String(100), nullable=False),
+    sa.Column('customer_phone', sa.String(20)),
+    sa.Column('customer_comments', sa.Text),
+    sa.Column('status', sa.String(20), nullable=False),
+    sa.Column('created_at', sa.DateTime, nullable=False),
+    sa.Column('admin_response', sa.Text),
+)
+sa.Table(
+    'users', legacy,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('username', sa.String(80), nullable=False, unique=True),
+    sa.Column('password_hash', sa.String(255), nullable=False),
+)
+sa.Table(
+    'quotation_items', legacy,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('quantity', sa.Integer, nullable=False),
+    sa.Column('quotation_id', sa.Integer, sa.ForeignKey('quotations.id'), nullable=False),
+    sa.Column('product_id', sa.Integer, sa.ForeignKey('products.id'), nullable=False),
+)
+
+# Nombres de los índices de la base (la reflexión de SQLite omite los de expresión)
+INDEX_NAMES = {
+    'sqlite': "SELECT name FROM sqlite_master WHERE type = 'index'",
+    'postgresql': "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()",
+}
+
+
+@contextmanager
+def legacy_database(postgres=None):
+    """URL de una base vacía: SQLite temporal o la Postgres desechable dada."""
+    if postgres is None:
+        tmpdir = tempfile.mkdtemp(prefix='envatex-init-db-')
+        try:
+            yield f"sqlite:///{os.path.join(tmpdir, 'legacy.db')}"
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        return
+    try:
+        yield postgres
+    finally:
+        engine = sa.create_engine(postgres)
+        with engine.begin() as connection:
+            connection.execute(sa.text('DROP SCHEMA public CASCADE'))
+            connection.execute(sa.text('CREATE SCHEMA public'))
+        engine.dispose()
+
+
+def create_legacy_schema(url):
+    """Crea el esquema inicial con dos productos y dos cotizaciones con líneas."""
+    engine = sa.create_engine(url)
+    legacy.create_all(engine)
+    tables = legacy.tables
+    with engine.begin() as connection:
+        connection.execute(tables['products'].insert(), [
+            {'id': 1, 'name': 'Tornillo hexagonal', 'description': 'Acero galvanizado', 'sku': 'TOR-001'},
+            {'id': 2, 'name': 'Tuerca', 'description': 'Acero', 'sku': 'TUE-001'},
+        ])
+        connection.execute(tables['quotations'].insert(), [
+            {'id': 1, 'customer_name': 'Cliente', 'customer_email': 'cliente@example.com',
+             'status': 'Pending', 'created_at': datetime(2025, 1, 15, 10, 0)},
+            {'id': 2, 'customer_name': 'Otro cliente', 'customer_email': 'otro@example.com',
+             'status': 'Responded', 'created_at': datetime(2025, 2, 3, 9, 30)},
+        ])
+        connection.execute(tables['quotation_items'].insert(), [
+            {'id': 1, 'quantity': 3, 'quotation_id': 1, 'product_id': 1},
+            {'id': 2, 'quantity': 5, 'quotation_id': 1, 'product_id': 2},
+            {'id': 3, 'quantity': 7, 'quotation_id': 2, 'product_id': 1},
+        ])
+        if engine.dialect.name == 'postgresql':
+            for table in ('products', 'quotations', 'quotation_items'):
+                connection.execute(sa.text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+    engine.dispose()
+
+
+def run_checks(url):
+    import init_db
+    from app import create_app, db
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    create_legacy_schema(url)
+    os.environ['DATABASE_URL'] = url
+    check('init_db.py termina bien sobre la base existente', init_db.init_database())
+    check('init_db.py es idempotente', init_db.init_database())
+
+    app = create_app(bootstrap=False)
+    client = app.test_client()
+
+    with app.app_context():
+        existing = set(db.session.scalars(sa.text(INDEX_NAMES[db.engine.dialect.name])))
+        missing = sorted(
+            index.name for table in db.metadata.sorted_tables for index in table.indexes
+            if index.name not in existing
+        )
+    check(f"existen todos los índices de los modelos (faltan: {', '.join(missing) or 'ninguno'})", not missing)
+
+    response = client.get('/api/products')
+    products = response.get_json() if response.status_code == 200 else []
+    check(f'GET /api/products responde 200 ({response.status_code})', response.status_code == 200)
+    check('los productos existentes exponen image_srcset',
+          len(products) == 2 and all('image_srcset' in p for p in products))
+
+    response = client.get('/api/products/search', query_string={'q': 'tornillo galv'})
+    found = response.get_json() if response.status_code == 200 else []
+    check(f'GET /api/products/search responde 200 ({response.status_code})', response.status_code == 200)
+    check('la búsqueda encuentra los productos existentes',
+          [p['sku'] for p in found[:1]] == ['TOR-001'])
+
+    headers = admin_headers(app)
+    quotation = client.get('/api/quotations/1', headers=headers).get_json()
+    check('las cotizaciones conservan sus líneas', len(quotation.get('items', [])) == 2)
+    stats = client.get('/api/quotations/stats', headers=headers).get_json()
+    check(f"el resumen incluye las cotizaciones existentes ({stats.get('total')})",
+          stats.get('total') == 2 and stats.get('by_status') == {'Pending': 1, 'Responded': 1}
+          and [(p['sku'], p['quantity']) for p in stats.get('top_products', [])] == [('TOR-001', 10), ('TUE-001', 5)])
+
+    response = client.delete('/api/quotations/1', headers=headers)
+    check(f'DELETE /api/quotations/<id> responde 200 ({response.status_code})', response.status_code == 200)
+    response = client.post('/api/quotations/bulk-delete', headers=headers, json={'ids': [2]})
+    check(f'POST /api/quotations/bulk-delete responde 200 ({response.status_code})', response.status_code == 200)
+    with app.app_context():
+        items = db.session.scalar(sa.select(sa.func.count()).select_from(sa.table('quotation_items')))
+    check(f'los borrados eliminan sus líneas ({items} restantes)', items == 0)
+    stats = client.get('/api/quotations/stats', headers=headers).get_json()
+    check(f"el resumen queda a cero tras los borrados ({stats.get('total')})",
+          stats.get('total') == 0 and stats.get('by_status') == {} and stats.get('top_products') == [])
+
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postgres', help='URL de una base Postgres desechable')
+    args = parser.parse_args()
+
+    previous = os.environ.get('DATABASE_URL')
+    try:
+        with legacy_database(args.postgres) as url:
+            failures = run_checks(url)
+    finally:
+        if previous is None:
+            os.environ.pop('DATABASE_URL', None)
+        else:
+            os.environ['DATABASE_URL'] = previous
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print('\n✅ init_db.py pone al día la base existente')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Instrumentación por petición: Server-Timing, log JSON y consultas lentas.
+
+Comprueba sobre SQLite que:
+
+- ``Server-Timing`` informa tantas consultas como sentencias ejecuta la
+  petición, y la línea JSON de ``envatex.request`` coincide;
+- en una respuesta en streaming la línea JSON cuenta también las consultas
+  hechas al enviar el cuerpo;
+- ``external_call`` suma a la petición en curso y, fuera de una petición
+  (workers), registra su propia línea;
+- con ``SLOW_QUERY_MS`` a 0 cada sentencia llega a ``envatex.slow_query``.
+
+Después mide el coste por petición con la instrumentación activada y
+desactivada (``INSTRUMENTATION=False``).
+
+Uso (desde backend/):
+    python -m benchmarks.check_instrumentation --requests 500
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+from benchmarks.common import StatementCounter, admin_headers, temporary_app
+from benchmarks.seed import seed_database
+
+
+class CapturedLog(logging.Handler):
+    """Guarda como dicts las líneas JSON emitidas por un logger."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.logger = logging.getLogger(name)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+    def __enter__(self):
+        self.logger.addHandler(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.logger.removeHandler(self)
+        return False
+
+
+@contextmanager
+def environment(**values):
+    previous = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def server_timing(response):
+    """``{métrica: {'dur': ..., 'desc': ...}}`` de la cabecera ``Server-Timing``."""
+    metrics = {}
+    for part in response.headers.get('Server-Timing', '').split(','):
+        name, *params = [piece.strip() for piece in part.split(';')]
+        metrics[name] = {key: value.strip('"') for key, value in (param.split('=', 1) for param in params)}
+    return metrics
+
+
+def check_behaviour(check):
+    from services import instrumentation
+    from services.instrumentation import external_call
+
+    with temporary_app() as app:
+        @app.get('/__instrumentation/external')
+        def external_route():
+            with external_call('sendgrid'):
+                time.sleep(0.01)
+            return {'ok': True}
+
+        client = app.test_client()
+        headers = admin_headers(app)
+        with app.app_context():
+            seed_database(products=50, quotations=40, items_per_quotation=3)
+
+        with CapturedLog('envatex.request') as log, StatementCounter() as counter:
+            response = client.get('/api/quotations', headers=headers, query_string={'limit': 20})
+            # La línea JSON se escribe al cerrar la respuesta, como hace el servidor WSGI
+            response.close()
+        timing = server_timing(response)
+        check('Server-Timing con db y app', {'db', 'app'} <= set(timing))
+        check('consultas en la cabecera == sentencias ejecutadas',
+              timing['db']['desc'] == f'{counter.count} queries')
+        check('Server-Timing expuesta por CORS',
+              'Server-Timing' in client.get('/api/products', headers={'Origin': 'http://localhost:3000'})
+              .headers.get('Access-Control-Expose-Headers', ''))
+        record = log.records[0] if log.records else {}
+        check('línea JSON por petición', record.get('endpoint') == 'quotations.list_quotations'
+              and record.get('status') == 200 and record.get('db_statements') == counter.count)
+
+        with CapturedLog('envatex.request') as log:
+            response = client.get('/api/products/export', headers=headers, query_string={'format': 'ndjson'})
+            header_count = int(server_timing(response)['db']['desc'].split()[0])
+            response.close()
+        check('streaming: el log incluye las consultas del cuerpo',
+              log.records and log.records[-1]['db_statements'] > header_count)
+
+        with CapturedLog('envatex.request') as log:
+            response = client.get('/__instrumentation/external')
+            response.close()
+        timing = server_timing(response)
+        check('llamada externa en Server-Timing', 'sendgrid' in timing
+              and float(timing['sendgrid']['dur']) >= 10 and timing['sendgrid']['desc'] == '1 calls')
+        check('llamada externa en la línea JSON',
+              log.records and log.records[-1]['external'].get('sendgrid', {}).get('calls') == 1)
+
+        with CapturedLog('envatex.external') as log:
+            with external_call('cloudinary'):
+                pass
+        check('llamada externa fuera de una petición',
+              [r['service'] for r in log.records] == ['cloudinary'])
+
+        threshold = instrumentation.SLOW_QUERY_MS
+        instrumentation.SLOW_QUERY_MS = 0
+        try:
+            with CapturedLog('envatex.slow_query') as log, StatementCounter() as counter:
+                client.get('/api/products', query_string={'limit': 5}).close()
+        finally:
+            instrumentation.SLOW_QUERY_MS = threshold
+        check('consultas lentas con su ruta', len(log.records) == counter.count
+              and all(r['path'] == '/api/products' for r in log.records))
+
+
+def request_cost(requests):
+    """Mediana (µs) de ``GET /api/products?limit=20`` sin y con instrumentación."""
+    results = {}
+    # Sin instrumentación primero: los eventos del Engine son globales al proceso
+    for label, enabled in (('desactivada', 'False'), ('activada', 'True')):
+        with environment(INSTRUMENTATION=enabled, REQUEST_LOG='False'), temporary_app() as app:
+            with app.app_context():
+                seed_database(products=200, quotations=0, items_per_quotation=0)
+            client = app.test_client()
+            timings = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                client.get('/api/products', query_string={'limit': 20}).close()
+                timings.append((time.perf_counter() - start) * 1_000_000)
+            results[label] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with environment(INSTRUMENTATION='True', SERVER_TIMING_HEADER='True', REQUEST_LOG='True'):
+        check_behaviour(check)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+
+    costs = request_cost(args.requests)
+    print()
+    for label, micros in costs.items():
+        print(f"instrumentación {label:12} {micros:8.0f} µs por petición")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""``GET /api/metrics``: series por endpoint, pool y llamadas externas, y suma entre workers.
+
+En proceso comprueba que las peticiones aparecen por endpoint, método y
+estado (las rutas inexistentes como ``unmatched``), que hay métricas del
+pool y de las llamadas externas, y que ``METRICS_TOKEN`` protege el endpoint.
+
+Después arranca gunicorn con ``--workers`` procesos (``gunicorn.conf.py``
+fija ``PROMETHEUS_MULTIPROC_DIR``), hace ``--requests`` peticiones y
+comprueba que cualquier worker devuelve el total de todos.
+
+Uso (desde backend/):
+    python -m benchmarks.check_metrics --workers 3 --requests 300
+"""
+import argparse
+import os
+import sys
+import time
+import urllib.request
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.common import gunicorn_server, temporary_app
+from benchmarks.seed import seed_database
+
+
+def samples(text):
+    """``{(nombre, etiquetas ordenadas): valor}`` de una exposición de Prometheus."""
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    }
+
+
+def requests_total(values, endpoint, status='200'):
+    return sum(value for (name, labels), value in values.items()
+               if name == 'envatex_http_requests_total'
+               and dict(labels).get('endpoint') == endpoint and dict(labels).get('status') == status)
+
+
+def check_in_process(check):
+    from services.instrumentation import external_call
+
+    with temporary_app() as app:
+        with app.app_context():
+            seed_database(products=30, quotations=10, items_per_quotation=2)
+        client = app.test_client()
+        for _ in range(5):
+            client.get('/api/products', query_string={'limit': 10}).close()
+        client.post('/api/quotations/bulk-delete', json={'ids': [1]}).close()
+        client.get('/no-existe').close()
+        with external_call('cloudinary'):
+            pass
+
+        values = samples(client.get('/api/metrics').get_data(as_text=True))
+        check('contador por endpoint', requests_total(values, 'products.get_products') >= 5)
+        check('errores con su endpoint y estado',
+              requests_total(values, 'quotations.bulk_delete_quotations', '401') >= 1)
+        check('rutas inexistentes como unmatched', requests_total(values, 'unmatched', '404') >= 1)
+        check('histograma de latencia por endpoint', any(
+            name == 'envatex_http_request_duration_seconds_bucket'
+            and dict(labels).get('endpoint') == 'products.get_products' for name, labels in values))
+        check('espera del pool', values.get(('envatex_db_pool_checkout_wait_seconds_count',
+                                             (('pool', 'primary'),)), 0) > 0)
+        check('conexiones en uso vuelven a 0', values.get(('envatex_db_pool_connections_in_use',
+                                                           (('pool', 'primary'),))) == 0)
+        check('llamadas externas', values.get(('envatex_external_call_duration_seconds_count',
+                                               (('outcome', 'ok'), ('service', 'cloudinary'))), 0) >= 1)
+
+        os.environ['METRICS_TOKEN'] = 'secreto'
+        try:
+            check('sin token responde 401', client.get('/api/metrics').status_code == 401)
+            check('con token responde 200', client.get(
+                '/api/metrics', headers={'Authorization': 'Bearer secreto'}).status_code == 200)
+        finally:
+            os.environ.pop('METRICS_TOKEN')
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.read().decode()
+
+
+def check_multiprocess(check, workers, requests):
+    with temporary_app() as app:
+        with app.app_context():
+            seed_database(products=30, quotations=0, items_per_quotation=0)
+        with gunicorn_server(workers=workers) as base:
+            for _ in range(requests):
+                fetch(base + '/api/products?limit=5')
+            # Los contadores se actualizan al cerrar la respuesta, justo después de enviarla
+            time.sleep(0.5)
+            totals = [requests_total(samples(fetch(base + '/api/metrics')), 'products.get_products')
+                      for _ in range(workers * 3)]
+            check(f'{workers} workers: cada scrape suma {requests} peticiones (leídos: {sorted(set(totals))})',
+                  set(totals) == {requests})
+            pids = {dict(labels).get('pid') for (name, labels) in samples(fetch(base + '/api/metrics'))
+                    if name == 'envatex_db_pool_connections_in_use'}
+            check('gauge del pool sumado entre workers (sin etiqueta pid)', pids == {None})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    check_in_process(check)
+    check_multiprocess(check, args.workers, args.requests)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print('\n✅ Métricas correctas')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Comprobación del enrutado de lecturas a la réplica.
+
+Usa dos ficheros SQLite, uno como primario y otro como réplica, con datos
+distintos en cada uno para saber de dónde sale cada respuesta:
+
+- ``GET /api/products`` y ``GET /api/quotations`` deben leer de la réplica.
+- ``POST /api/quotations`` debe escribir en el primario.
+- Un flush dentro de una ruta de lectura también debe ir al primario.
+- Sin réplica configurada, las lecturas siguen yendo al primario.
+
+Termina con código 1 si alguna comprobación falla.
+
+Uso (desde backend/):
+    python -m benchmarks.check_replica_routing
+"""
+import sys
+
+from flask import g
+from sqlalchemy import func, insert, select
+
+from benchmarks.common import admin_headers, temporary_app
+
+
+def seed_marker(engine, name):
+    """Inserta un producto cuyo nombre identifica la base de datos."""
+    from models import Product
+    with engine.begin() as conn:
+        conn.execute(insert(Product), {'name': name, 'sku': name.upper()})
+
+
+def count_quotations(engine):
+    from models import Quotation
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count()).select_from(Quotation))
+
+
+def product_names(client):
+    return [p['name'] for p in client.get('/api/products').get_json()]
+
+
+def run_checks():
+    from app import db
+    from models import CacheVersion
+    from services.database import REPLICA_BIND, use_read_replica
+
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with temporary_app() as app:
+        with app.app_context():
+            seed_marker(db.engine, 'primario')
+        check('sin réplica las lecturas van al primario',
+              product_names(app.test_client()) == ['primario'])
+
+    # Flask-SQLAlchemy registra metadatos por bind en la instancia global de
+    # ``db``, así que la app con réplica se crea después de la que no la tiene.
+    with temporary_app(replica=True) as app:
+        with app.app_context():
+            primary, replica = db.engines[None], db.engines[REPLICA_BIND]
+            seed_marker(primary, 'primario')
+            seed_marker(replica, 'replica')
+        client = app.test_client()
+        headers = admin_headers(app)
+
+        check('GET /api/products lee de la réplica', product_names(client) == ['replica'])
+
+        response = client.post('/api/quotations', json={
+            'customer_name': 'Cliente', 'customer_email': 'cliente@example.com', 'items': [],
+        })
+        check('POST /api/quotations responde 201', response.status_code == 201)
+        check('la cotización se escribe en el primario', count_quotations(primary) == 1)
+        check('la réplica no recibe la escritura', count_quotations(replica) == 0)
+
+        quotations = client.get('/api/quotations', headers=headers).get_json()
+        check('GET /api/quotations lee de la réplica', quotations == [])
+
+        # Un flush dentro de una ruta de lectura no debe acabar en la réplica
+        @use_read_replica
+        def read_view_that_writes():
+            db.session.add(CacheVersion(name='routing-check', version=1))
+            db.session.commit()
+
+        with app.test_request_context('/'):
+            read_view_that_writes()
+            check('la ruta quedó marcada para la réplica', g.db_read_replica)
+        with app.app_context():
+            in_primary = db.session.get(CacheVersion, 'routing-check') is not None
+            with replica.connect() as conn:
+                in_replica = conn.scalar(
+                    select(CacheVersion.name).where(CacheVersion.name == 'routing-check')
+                ) is not None
+        check('el flush en una ruta de lectura va al primario', in_primary and not in_replica)
+
+    return failures
+
+
+def main():
+    failures = run_checks()
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print("\n✅ Enrutado primario/réplica correcto")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
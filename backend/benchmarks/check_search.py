@@ -0,0 +1,162 @@
+"""Comprobación y latencia de ``GET /api/products/search``.
+
+Carga un catálogo de ferretería sobre SQLite (FTS5) y, con ``--postgres
+URL``, también sobre Postgres (tsvector y pg_trgm), y comprueba:
+
+- coincidencia por palabra y por prefijo de palabra en nombre y descripción;
+- prefijo de SKU;
+- tolerancia a errores de tipeo en el nombre;
+- ranking (el nombre pesa más que la descripción) y paginación sin repetidos;
+- que el índice sigue a los cambios hechos con ``PUT`` y ``DELETE``.
+
+Después mide la latencia de búsqueda frente a descargar el catálogo entero,
+que es lo que hacía el cliente. Termina con código 1 si algo falla.
+
+Uso (desde backend/):
+    python -m benchmarks.check_search --filler 20000
+    python -m benchmarks.check_search --postgres postgresql://localhost/envatex_search
+
+La base de ``--postgres`` debe ser desechable: se crean y se borran las tablas.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks.common import admin_headers, postgres_app, temporary_app
+from benchmarks.seed import seed_database
+
+NOUNS = ['Tornillo', 'Tuerca', 'Arandela', 'Bulón', 'Clavo', 'Perno', 'Tarugo', 'Caño', 'Válvula', 'Manguera']
+MATERIALS = ['acero', 'bronce', 'aluminio', 'galvanizado', 'inoxidable', 'PVC']
+SIZES = [4, 6, 8, 10, 12]
+
+
+def catalog():
+    rows = []
+    for n, noun in enumerate(NOUNS):
+        for m, material in enumerate(MATERIALS):
+            for size in SIZES:
+                rows.append({
+                    'name': f'{noun} de {material} {size} mm',
+                    'sku': f'{noun[:3].upper()}-{m}{size:02d}',
+                    'description': f'{noun} de {material} para uso general, medida {size} mm.',
+                })
+    rows.append({'name': 'Sellador', 'sku': 'SEL-001', 'description': 'Sellador para tornillos y caños.'})
+    return rows
+
+
+def insert_catalog():
+    from sqlalchemy import insert
+    from app import db
+    from models import Product
+    db.session.execute(insert(Product), catalog())
+    db.session.commit()
+
+
+def search(client, q, **params):
+    response = client.get('/api/products/search', query_string={'q': q, **params})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json(), response.headers.get('X-Next-Cursor')
+
+
+def names(results):
+    return [p['name'] for p in results]
+
+
+def latency(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(database, filler, repeat):
+    """Comprueba y mide la búsqueda sobre la app de ``database`` (un context manager)."""
+    failures = []
+
+    def check(description, ok):
+        print(f"{'✅' if ok else '❌'} {description}")
+        if not ok:
+            failures.append(description)
+
+    with database as app:
+        with app.app_context():
+            insert_catalog()
+            if filler:
+                seed_database(products=filler, quotations=0)
+        client = app.test_client()
+        headers = admin_headers(app)
+
+        results, _ = search(client, 'tornillo acero')
+        check('palabras en el nombre', names(results)[:5] == [f'Tornillo de acero {s} mm' for s in SIZES])
+        check('el nombre pesa más que la descripción', results[-1]['name'] != 'Sellador'
+              and 'Sellador' not in names(results[:5]))
+
+        results, _ = search(client, 'torn galv')
+        check('prefijos de palabra', len(results) == 5 and all(n.startswith('Tornillo de galvanizado') for n in names(results)))
+
+        results, _ = search(client, 'TOR-1')
+        check('prefijo de SKU primero', sorted(p['sku'] for p in results[:5]) == sorted(f'TOR-1{s:02d}' for s in SIZES))
+
+        results, _ = search(client, 'tornilo')
+        check('error de tipeo (tornilo)', bool(results) and names(results)[0].startswith('Tornillo'))
+        results, _ = search(client, 'valvula bronse')
+        check('tildes y error de tipeo (valvula bronse)', bool(results) and names(results)[0].startswith('Válvula de bronce'))
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 7}
+            if cursor:
+                params['cursor'] = cursor
+            page, cursor = search(client, 'acero', **params)
+            seen.extend(p['id'] for p in page)
+            if not cursor:
+                break
+        check(f'paginación sin repetidos ({len(seen)} resultados)', len(seen) == len(set(seen)) == len(NOUNS) * len(SIZES))
+
+        bad = client.get('/api/products/search')
+        check('sin q responde 400', bad.status_code == 400)
+
+        target = search(client, 'Sellador')[0][0]
+        client.put(f"/api/products/{target['id']}", headers=headers, data={'name': 'Silicona selladora'})
+        check('el índice sigue los cambios de nombre',
+              names(search(client, 'silicona')[0]) == ['Silicona selladora'])
+        client.delete(f"/api/products/{target['id']}", headers=headers)
+        check('y las bajas', search(client, 'silicona')[0] == [])
+
+        total = len(catalog()) + filler
+        search_ms = latency(lambda: client.get('/api/products/search?q=tornilo%20acero'), repeat)
+        prefix_ms = latency(lambda: client.get('/api/products/search?q=TOR-1'), repeat)
+        full_response = client.get('/api/products')
+        full_ms = latency(lambda: client.get('/api/products'), max(3, repeat // 10))
+        print(f"\ncatálogo de {total} productos:")
+        print(f"  búsqueda con tipeo   {search_ms:8.2f} ms")
+        print(f"  prefijo de SKU       {prefix_ms:8.2f} ms")
+        print(f"  catálogo completo    {full_ms:8.2f} ms ({len(full_response.data) / 1024:.0f} KB)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filler', type=int, default=20000, help='productos de relleno')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--postgres', help='URL de una base Postgres desechable')
+    args = parser.parse_args()
+
+    print('SQLite')
+    failures = run(temporary_app(), args.filler, args.repeat)
+    if args.postgres:
+        print('\nPostgres')
+        failures += run(postgres_app(args.postgres), args.filler, args.repeat)
+    if failures:
+        print(f"\n❌ {len(failures)} comprobación(es) fallida(s)")
+        return 1
+    print("\n✅ Búsqueda correcta")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
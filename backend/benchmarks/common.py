@@ -0,0 +1,149 @@
+"""Utilidades compartidas por los benchmarks: app temporal, gunicorn y conteo de SQL."""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@contextmanager
+def temporary_app(replica=False):
+    """Crea una app sobre una base SQLite temporal y la elimina al salir.
+
+    Con ``replica=True`` se crea además un segundo fichero SQLite con el mismo
+    esquema y se configura como ``DATABASE_REPLICA_URL``. El barrido de
+    subidas de imágenes queda desactivado: sus consultas en segundo plano se
+    mezclarían con las que cuentan los benchmarks.
+    """
+    tmpdir = tempfile.mkdtemp(prefix='envatex-bench-')
+    paths = {'DATABASE_URL': os.path.join(tmpdir, 'bench.db')}
+    if replica:
+        paths['DATABASE_REPLICA_URL'] = os.path.join(tmpdir, 'replica.db')
+    previous = {name: os.environ.get(name) for name in [*paths, 'IMAGE_UPLOAD_SWEEP_SECONDS']}
+    for name, path in paths.items():
+        os.environ[name] = f'sqlite:///{path}'
+    os.environ['IMAGE_UPLOAD_SWEEP_SECONDS'] = '0'
+    try:
+        from app import create_app, db
+        from services.database import REPLICA_BIND
+        app = create_app()
+        if replica:
+            with app.app_context():
+                db.metadata.create_all(db.engines[REPLICA_BIND])
+        yield app
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        for path in paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmpdir)
+
+
+@contextmanager
+def postgres_app(url):
+    """App sobre una base Postgres desechable: crea las tablas y las borra al salir.
+
+    Como en ``temporary_app``, sin barrido de subidas de imágenes.
+    """
+    previous = {name: os.environ.get(name) for name in ('DATABASE_URL', 'IMAGE_UPLOAD_SWEEP_SECONDS')}
+    os.environ['DATABASE_URL'] = url
+    os.environ['IMAGE_UPLOAD_SWEEP_SECONDS'] = '0'
+    try:
+        from app import create_app, db
+        app = create_app()
+        try:
+            yield app
+        finally:
+            with app.app_context():
+                db.session.remove()
+                db.drop_all()
+                db.engine.dispose()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def gunicorn_server(workers=2, threads=None, env=None, app='wsgi:app', worker_class=None):
+    """Arranca gunicorn (``app``, con ``gunicorn.conf.py``) y devuelve su URL base.
+
+    Usa la ``DATABASE_URL`` del entorno, normalmente la de ``temporary_app``,
+    cuyo esquema ya existe; espera a que ``/api/health`` responda. Sin
+    ``threads`` vale lo que diga ``gunicorn.conf.py``. Con
+    ``worker_class='uvicorn_worker.UvicornWorker'`` y ``app='asgi:app'`` sirve
+    el modo ASGI.
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    base = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+         *(['--threads', str(threads)] if threads else []),
+         *(['--worker-class', worker_class] if worker_class else []), app],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'DB_BOOTSTRAP_ON_STARTUP': 'False', 'REQUEST_LOG': 'False',
+             'PROMETHEUS_MULTIPROC_DIR': tempfile.mkdtemp(prefix='envatex-prometheus-'), **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(base + '/api/health', timeout=5).close()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError('gunicorn no arrancó')
+                time.sleep(0.2)
+        yield base
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def admin_headers(app):
+    """Cabeceras con un JWT de administrador válido para la app dada."""
+    from flask_jwt_extended import create_access_token
+    with app.app_context():
+        token = create_access_token(identity='admin', additional_claims={'role': 'admin'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+class StatementCounter:
+    """Cuenta las sentencias SQL ejecutadas mientras está activo."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._on_execute)
+        return False
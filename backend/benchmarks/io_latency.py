@@ -0,0 +1,28 @@
+"""App de benchmark con latencia de red simulada en cada sentencia SQL.
+
+SQLite local responde en microsegundos; una base remota tarda milisegundos
+por ida y vuelta, y durante ese tiempo el worker no hace nada útil.
+``IO_LATENCY_MS`` (defecto 20) añade esa espera antes de cada sentencia con
+``time.sleep``, que como un socket libera el GIL. gunicorn la carga como
+``benchmarks.io_latency:wsgi_app`` (modo sync) o
+``benchmarks.io_latency:asgi_app`` (modo ASGI); ver ``bench_concurrency``.
+"""
+import os
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import create_app
+from services.asgi import AsgiAdapter
+
+IO_LATENCY_MS = float(os.getenv('IO_LATENCY_MS', 20))
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _network_round_trip(conn, cursor, statement, parameters, context, executemany):
+    time.sleep(IO_LATENCY_MS / 1000)
+
+
+wsgi_app = create_app()
+asgi_app = AsgiAdapter(wsgi_app)
@@ -0,0 +1,439 @@
+"""Carga reproducible sobre todas las rutas de la API, con comparación contra una línea base.
+
+Siembra una base SQLite temporal a la escala pedida (productos, cotizaciones
+e items por cotización; ``benchmarks.seed``) y ejecuta ``--requests``
+peticiones de cada escenario, uno por ruta de cada blueprint (y variantes
+como la segunda página o el 304 por ETag):
+
+- ``--target inprocess``: ``create_app()`` con el cliente de pruebas, en un
+  hilo; mide el coste de la app sin servidor ni red. Las consultas por
+  petición se cuentan con eventos de SQLAlchemy.
+- ``--target gunicorn``: arranca gunicorn (``--workers``, ``--threads``)
+  sobre la misma base y lo ataca con ``--concurrency`` hilos. Las consultas
+  salen de la cabecera ``Server-Timing``; en las respuestas en streaming
+  solo cuenta las previas al cuerpo.
+- ``--target asgi``: igual, pero con ``asgi:app`` y workers de uvicorn;
+  ``--threads`` es entonces ``ASGI_THREADS``.
+
+Para cada escenario informa p50/p95/p99, media, peticiones por segundo,
+consultas por petición y errores (estado distinto del esperado). Con
+``--output`` escribe el resultado en JSON; con ``--baseline`` lo compara y
+termina con código 1 si un escenario tiene errores, hace más consultas que
+la línea base o su p95 empeora más de ``--tolerance``. Las latencias de la
+línea base solo son comparables en la misma máquina; las consultas, en
+cualquiera.
+
+Las rutas que borran usan filas reservadas en la siembra, de modo que cada
+petición encuentra su objetivo y los demás escenarios ven los mismos datos.
+
+Uso (desde backend/):
+    python -m benchmarks.load --output /tmp/load.json
+    python -m benchmarks.load --baseline benchmarks/baselines/inprocess.json
+    python -m benchmarks.load --target gunicorn --workers 2 --concurrency 8 --requests 500
+    python -m benchmarks.load --target asgi --workers 1 --threads 15 --concurrency 8
+    python -m benchmarks.load --save-baseline benchmarks/baselines/inprocess.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.common import StatementCounter, admin_headers, gunicorn_server, temporary_app
+from benchmarks.seed import _bulk_insert, seed_database
+
+# Las rutas caras a propósito (hash de la contraseña) se limitan a estas peticiones
+LOGIN_REQUESTS = 20
+BULK_SIZE = 5
+IMPORT_ROWS = 50
+MEDIA_FILE = 'load-test.jpg'
+ASGI_WORKER = 'uvicorn_worker.UvicornWorker'
+
+
+@dataclass
+class Call:
+    """Una petición HTTP de un escenario y los estados que se consideran correctos."""
+    method: str
+    path: str
+    query: dict = None
+    json: object = None
+    form: dict = None
+    data: bytes = None
+    content_type: str = None
+    headers: dict = field(default_factory=dict)
+    expect: tuple = (200,)
+
+
+@dataclass
+class Scenario:
+    name: str
+    calls: list
+
+
+class Fixtures:
+    """Ids sembrados y cabeceras de autenticación; reparte filas desechables sin repetir."""
+
+    def __init__(self, product_ids, quotation_ids, spare_product_ids, spare_quotation_ids, admin, refresh):
+        self.product_ids = product_ids
+        self.quotation_ids = quotation_ids
+        self.spare_product_ids = list(spare_product_ids)
+        self.spare_quotation_ids = list(spare_quotation_ids)
+        self.admin = admin
+        self.refresh = refresh
+
+    def take_products(self, count):
+        taken, self.spare_product_ids = self.spare_product_ids[:count], self.spare_product_ids[count:]
+        return taken
+
+    def take_quotations(self, count):
+        taken, self.spare_quotation_ids = self.spare_quotation_ids[:count], self.spare_quotation_ids[count:]
+        return taken
+
+
+def spare_rows_needed(requests):
+    """Productos y cotizaciones desechables que consumen los escenarios de borrado."""
+    return requests, requests * (1 + BULK_SIZE)
+
+
+def seed(products, quotations, items_per_quotation, requests):
+    """Siembra la base (requiere app context) y devuelve los ids, normales y desechables."""
+    from app import db
+    from models import Product, Quotation
+    from services.quotation_stats import rebuild_stats
+
+    spare_products, spare_quotations = spare_rows_needed(requests)
+    product_ids, quotation_ids = seed_database(products, quotations, items_per_quotation)
+    spare_product_ids = _bulk_insert(Product, [
+        {'name': f'Desechable {i:06d}', 'sku': f'TMP-{i:06d}'} for i in range(spare_products)
+    ])
+    spare_quotation_ids = _bulk_insert(Quotation, [
+        {'customer_name': f'Desechable {i}', 'customer_email': f'desechable{i}@example.com', 'status': 'Pending'}
+        for i in range(spare_quotations)
+    ])
+    # La siembra inserta directamente en las tablas: recalcular el resumen
+    rebuild_stats()
+    db.session.commit()
+    return product_ids, quotation_ids, spare_product_ids, spare_quotation_ids
+
+
+def build_scenarios(fixtures, requests, etag, cursor):
+    """Escenarios en orden de ejecución: primero lecturas, después escrituras."""
+    admin = fixtures.admin
+    product_ids = fixtures.product_ids
+    quotation_ids = fixtures.quotation_ids
+    n = range(requests)
+
+    def same(call):
+        return [call] * requests
+
+    import_rows = '\n'.join(
+        ['name,sku,description'] +
+        [f'Producto {i:06d},SKU-{i:06d},Descripción importada {i}' for i in range(min(IMPORT_ROWS, len(product_ids)))]
+    ).encode()
+
+    return [
+        Scenario('GET /', same(Call('GET', '/'))),
+        Scenario('GET /api/health', same(Call('GET', '/api/health'))),
+        Scenario('GET /api/metrics', same(Call('GET', '/api/metrics'))),
+        Scenario('GET /media/<file>', same(Call('GET', f'/media/{MEDIA_FILE}'))),
+        Scenario('GET /api/products', same(Call('GET', '/api/products', query={'limit': 50}))),
+        Scenario('GET /api/products (cursor)', same(Call('GET', '/api/products', query={'limit': 50, 'cursor': cursor}))),
+        Scenario('GET /api/products (gzip)', same(Call('GET', '/api/products', query={'limit': 50},
+                                                       headers={'Accept-Encoding': 'gzip'}))),
+        Scenario('GET /api/products (304)', same(Call('GET', '/api/products', query={'limit': 50},
+                                                      headers={'If-None-Match': etag}, expect=(304,)))),
+        Scenario('GET /api/products?sku', [
+            Call('GET', '/api/products', query={'sku': f'SKU-{i % 1000:04d}', 'limit': 50}) for i in n]),
+        Scenario('GET /api/products/search', [
+            Call('GET', '/api/products/search', query={'q': f'producto {i % 100}'}) for i in n]),
+        Scenario('GET /api/products/export', same(Call('GET', '/api/products/export', query={'format': 'ndjson'},
+                                                        headers=admin))),
+        Scenario('GET /api/quotations', same(Call('GET', '/api/quotations', query={'limit': 50}, headers=admin))),
+        Scenario('GET /api/quotations?status', same(Call('GET', '/api/quotations',
+                                                         query={'status': 'Pending', 'limit': 50}, headers=admin))),
+        Scenario('GET /api/quotations?customer_email', [
+            Call('GET', '/api/quotations', query={'customer_email': f'cliente{i}@example.com'}, headers=admin)
+            for i in n]),
+        Scenario('GET /api/quotations/stats', same(Call('GET', '/api/quotations/stats', headers=admin))),
+        Scenario('GET /api/quotations/<id>', [
+            Call('GET', f'/api/quotations/{quotation_ids[i % len(quotation_ids)]}', headers=admin) for i in n]),
+        Scenario('POST /api/auth/login', [
+            Call('POST', '/api/auth/login', json={'username': os.getenv('ADMIN_USER', 'admin'),
+                                                  'password': os.getenv('ADMIN_PASSWORD', 'admin123')})
+            for _ in range(min(requests, LOGIN_REQUESTS))]),
+        Scenario('POST /api/auth/refresh', same(Call('POST', '/api/auth/refresh', headers=fixtures.refresh))),
+        Scenario('POST /api/products', [
+            Call('POST', '/api/products', form={'name': f'Carga {i:06d}', 'sku': f'LOAD-{i:06d}',
+                                                'description': 'Producto creado por la prueba de carga'},
+                 headers=admin, expect=(201,)) for i in n]),
+        Scenario('PUT /api/products/<id>', [
+            Call('PUT', f'/api/products/{product_ids[i % len(product_ids)]}',
+                 form={'description': f'Descripción actualizada {i}'}, headers=admin) for i in n]),
+        Scenario('DELETE /api/products/<id>', [
+            Call('DELETE', f'/api/products/{product_id}', headers=admin)
+            for product_id in fixtures.take_products(requests)]),
+        Scenario('POST /api/products/import', same(Call('POST', '/api/products/import', data=import_rows,
+                                                         content_type='text/csv', headers=admin))),
+        Scenario('POST /api/quotations', [
+            Call('POST', '/api/quotations', json={
+                'customer_name': f'Carga {i}', 'customer_email': f'carga{i}@example.com',
+                'items': [{'product_id': product_ids[(i + k) % len(product_ids)], 'quantity': k + 1}
+                          for k in range(3)],
+            }, expect=(201,)) for i in n]),
+        Scenario('PATCH /api/quotations/<id>', [
+            Call('PATCH', f'/api/quotations/{quotation_ids[i % len(quotation_ids)]}',
+                 json={'admin_response': f'Respuesta {i}'}, headers=admin) for i in n]),
+        Scenario('PATCH /api/quotations/bulk', [
+            Call('PATCH', '/api/quotations/bulk', headers=admin, json={
+                'ids': [quotation_ids[(i * BULK_SIZE + k) % len(quotation_ids)] for k in range(BULK_SIZE)],
+                'status': 'Archived' if i % 2 else 'Pending',
+            }) for i in n]),
+        Scenario('DELETE /api/quotations/<id>', [
+            Call('DELETE', f'/api/quotations/{quotation_id}', headers=admin)
+            for quotation_id in fixtures.take_quotations(requests)]),
+        Scenario('POST /api/quotations/bulk-delete', [
+            Call('POST', '/api/quotations/bulk-delete', headers=admin, json={'ids': fixtures.take_quotations(BULK_SIZE)})
+            for _ in n]),
+    ]
+
+
+class InProcessTarget:
+    """Peticiones con el cliente de pruebas de Flask, en el propio proceso."""
+
+    concurrency = 1
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, call):
+        with StatementCounter() as counter:
+            response = self.client.open(
+                call.path, method=call.method, query_string=call.query, json=call.json,
+                data=call.form if call.form is not None else call.data,
+                content_type=call.content_type, headers=call.headers,
+            )
+            response.get_data()
+            response.close()
+        return response.status_code, response.headers, counter.count
+
+
+class HttpTarget:
+    """Peticiones HTTP reales contra un servidor (gunicorn), desde varios hilos."""
+
+    def __init__(self, base_url, concurrency):
+        self.address = urlsplit(base_url).netloc
+        self.concurrency = concurrency
+
+    def send(self, call):
+        path = call.path + (f'?{urlencode(call.query)}' if call.query else '')
+        headers = dict(call.headers)
+        body = call.data
+        if call.json is not None:
+            body = json.dumps(call.json).encode()
+            headers['Content-Type'] = 'application/json'
+        elif call.form is not None:
+            body = urlencode(call.form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif call.content_type:
+            headers['Content-Type'] = call.content_type
+        connection = http.client.HTTPConnection(self.address, timeout=60)
+        try:
+            connection.request(call.method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        return response.status, response.headers, server_timing_queries(response.headers)
+
+
+def server_timing_queries(headers):
+    """Consultas de la métrica ``db`` de ``Server-Timing`` (``desc="N queries"``)."""
+    for part in (headers.get('Server-Timing') or '').split(','):
+        name, *params = [piece.strip() for piece in part.split(';')]
+        if name == 'db':
+            for param in params:
+                if param.startswith('desc='):
+                    return int(param[5:].strip('"').split()[0])
+    return 0
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por rango más cercano sobre valores ya ordenados."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(target, scenario):
+    """Ejecuta las llamadas del escenario y devuelve sus estadísticas."""
+    def timed(call):
+        start = time.perf_counter()
+        status, _, queries = target.send(call)
+        return (time.perf_counter() - start) * 1000, status in call.expect, queries
+
+    started = time.perf_counter()
+    if target.concurrency > 1:
+        with ThreadPoolExecutor(target.concurrency) as pool:
+            results = list(pool.map(timed, scenario.calls))
+    else:
+        results = [timed(call) for call in scenario.calls]
+    wall = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(1 for _, ok, _ in results if not ok),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'throughput_rps': round(len(results) / wall, 1),
+        'queries_per_request': round(sum(queries for _, _, queries in results) / len(results), 2),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regresiones respecto a la línea base: ``[(escenario, motivo)]``."""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        if current['errors']:
+            regressions.append((name, f"{current['errors']} respuesta(s) con estado inesperado"))
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        if current['queries_per_request'] > previous['queries_per_request'] + 0.01:
+            regressions.append((name, f"consultas {previous['queries_per_request']} -> "
+                                      f"{current['queries_per_request']}"))
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append((name, f"p95 {previous['p95_ms']} -> {current['p95_ms']} ms"))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print(f"\n{'escenario':40} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'SQL':>6} {'err':>4}"
+          + (f" {'p95 base':>9}" if baseline else ''))
+    for name, stats in results['scenarios'].items():
+        line = (f"{name:40} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} "
+                f"{stats['throughput_rps']:8.1f} {stats['queries_per_request']:6.2f} {stats['errors']:>4}")
+        if baseline:
+            previous = baseline['scenarios'].get(name)
+            line += f" {previous['p95_ms']:9.2f}" if previous else f" {'-':>9}"
+        print(line)
+
+
+def run(args):
+    media_dir = tempfile.mkdtemp(prefix='envatex-load-media-')
+    with open(os.path.join(media_dir, MEDIA_FILE), 'wb') as image:
+        image.write(os.urandom(20_000))
+    os.environ['IMAGE_LOCAL_DIR'] = media_dir
+
+    try:
+        with temporary_app() as app:
+            with app.app_context():
+                seeded = seed(args.products, args.quotations, args.items, args.requests)
+            client = app.test_client()
+            first_page = client.get('/api/products', query_string={'limit': 50})
+            login = client.post('/api/auth/login', json={
+                'username': os.getenv('ADMIN_USER', 'admin'), 'password': os.getenv('ADMIN_PASSWORD', 'admin123'),
+            }).get_json()
+            fixtures = Fixtures(*seeded, admin=admin_headers(app),
+                                refresh={'Authorization': f"Bearer {login['refresh_token']}"})
+            scenarios = build_scenarios(fixtures, args.requests, first_page.headers['ETag'],
+                                        first_page.headers['X-Next-Cursor'])
+
+            if args.target == 'gunicorn':
+                with gunicorn_server(workers=args.workers, threads=args.threads) as base:
+                    results = execute(HttpTarget(base, args.concurrency), scenarios)
+            elif args.target == 'asgi':
+                with gunicorn_server(workers=args.workers, app='asgi:app', worker_class=ASGI_WORKER,
+                                     env={'ASGI_THREADS': str(args.threads)}) as base:
+                    results = execute(HttpTarget(base, args.concurrency), scenarios)
+            else:
+                results = execute(InProcessTarget(app), scenarios)
+    finally:
+        os.environ.pop('IMAGE_LOCAL_DIR', None)
+        os.remove(os.path.join(media_dir, MEDIA_FILE))
+        os.rmdir(media_dir)
+
+    results['meta'] = {
+        'target': args.target,
+        'products': args.products,
+        'quotations': args.quotations,
+        'items_per_quotation': args.items,
+        'requests': args.requests,
+        'concurrency': 1 if args.target == 'inprocess' else args.concurrency,
+        'workers': None if args.target == 'inprocess' else args.workers,
+        'threads': None if args.target == 'inprocess' else args.threads,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+    return results
+
+
+def execute(target, scenarios):
+    # Calentamiento: imports perezosos, pool de conexiones y caches del proceso
+    for _ in range(5):
+        target.send(Call('GET', '/api/products', query={'limit': 50}))
+    results = {'scenarios': {}}
+    for scenario in scenarios:
+        results['scenarios'][scenario.name] = run_scenario(target, scenario)
+        print(f"  {scenario.name} ✓", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', choices=['inprocess', 'gunicorn', 'asgi'], default='inprocess')
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--quotations', type=int, default=5000)
+    parser.add_argument('--items', type=int, default=5, help='items por cotización')
+    parser.add_argument('--requests', type=int, default=200, help='peticiones por escenario')
+    parser.add_argument('--workers', type=int, default=2, help='workers de gunicorn')
+    parser.add_argument('--threads', type=int, default=1, help='hilos por worker de gunicorn (ASGI_THREADS con --target asgi)')
+    parser.add_argument('--concurrency', type=int, default=4, help='hilos cliente contra gunicorn')
+    parser.add_argument('--output', help="fichero JSON con los resultados ('-' para stdout)")
+    parser.add_argument('--baseline', help='JSON de una ejecución anterior con el que comparar')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='empeoramiento de p95 admitido (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', help='guardar los resultados como nueva línea base')
+    args = parser.parse_args()
+
+    # Las rutas escriben sus propios mensajes: stdout queda para la tabla o el JSON
+    with redirect_stdout(sys.stderr):
+        results = run(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    if args.output != '-':
+        print_table(results, baseline)
+
+    for path in (args.output, args.save_baseline):
+        if path == '-':
+            json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        elif path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w') as handle:
+                json.dump(results, handle, indent=2, ensure_ascii=False)
+                handle.write('\n')
+
+    if baseline:
+        if baseline.get('meta', {}).get('target') != results['meta']['target']:
+            print(f"⚠️ La línea base es de otro destino ({baseline['meta'].get('target')})", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, reason in regressions:
+            print(f"❌ {name}: {reason}", file=sys.stderr)
+        if regressions:
+            return 1
+        print('✅ Sin regresiones respecto a la línea base', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Presupuesto de consultas SQL por endpoint.
+
+Ejecuta cada endpoint contra una base SQLite sembrada a dos escalas distintas
+y cuenta las sentencias emitidas. Termina con código 1 si un endpoint supera
+su presupuesto o si el número de consultas crece con la cantidad de filas,
+que es la firma de un N+1.
+
+Uso (desde backend/):
+    python -m benchmarks.query_budget
+"""
+import sys
+
+from benchmarks.common import StatementCounter, admin_headers, temporary_app
+from benchmarks.seed import seed_database
+
+# Escalas (productos, cotizaciones, items por cotización)
+SCALES = [(5, 3, 2), (40, 30, 8)]
+
+
+def endpoint_cases(product_ids, quotation_ids):
+    """Casos (nombre, método, url, cuerpo, presupuesto máximo de sentencias).
+
+    Los endpoints de lectura gastan una consulta adicional en el sello de
+    versión que alimenta ETag/Last-Modified; las escrituras de cotizaciones,
+    una o dos en los incrementos del resumen (``services.quotation_stats``).
+    """
+    target = quotation_ids[0]
+    new_quotation = {
+        'customer_name': 'Cliente',
+        'customer_email': 'cliente@example.com',
+        'items': [{'product_id': pid, 'quantity': 1} for pid in product_ids],
+    }
+    return [
+        ('GET /api/products', 'GET', '/api/products', None, 2),
+        ('GET /api/quotations', 'GET', '/api/quotations', None, 3),
+        ('PATCH /api/quotations/<id>', 'PATCH', f'/api/quotations/{target}',
+         {'admin_response': 'Precio especial'}, 5),
+        ('GET /api/quotations/stats', 'GET', '/api/quotations/stats', None, 4),
+        ('POST /api/quotations', 'POST', '/api/quotations', new_quotation, 6),
+        ('PATCH /api/quotations/bulk', 'PATCH', '/api/quotations/bulk',
+         {'filter': {'created_from': '2000-01-01'}, 'admin_response': 'Sin stock'}, 4),
+    ]
+
+
+def measure(scale):
+    """Devuelve {caso: (sentencias, presupuesto)} para una escala dada."""
+    from services.payload_cache import get_catalog_cache
+    products, quotations, items = scale
+    results = {}
+    with temporary_app() as app:
+        with app.app_context():
+            product_ids, quotation_ids = seed_database(products, quotations, items)
+        headers = admin_headers(app)
+        client = app.test_client()
+        for name, method, url, body, budget in endpoint_cases(product_ids, quotation_ids):
+            # Una primera pasada de calentamiento: se mide el estado estable
+            # (p. ej. con las filas de cache_versions ya creadas), pero sin
+            # la caché del catálogo, que ocultaría las consultas del listado.
+            client.open(url, method=method, json=body, headers=headers)
+            with app.app_context():
+                get_catalog_cache().clear()
+            with StatementCounter() as counter:
+                response = client.open(url, method=method, json=body, headers=headers)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name} respondió {response.status_code}: {response.get_data(as_text=True)}')
+            results[name] = (counter.count, budget)
+    return results
+
+
+def main():
+    small, large = (measure(scale) for scale in SCALES)
+    failed = False
+    for name, (count_small, budget) in small.items():
+        count_large = large[name][0]
+        status = 'OK'
+        if count_large > count_small:
+            status = 'FALLA (crece con las filas)'
+            failed = True
+        elif count_large > budget:
+            status = f'FALLA (presupuesto {budget})'
+            failed = True
+        print(f'{name:32} {count_small:>4} -> {count_large:>4}  {status}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
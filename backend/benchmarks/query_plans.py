@@ -0,0 +1,212 @@
+"""Regresiones de planes de ejecución: ninguna consulta caliente recorre una tabla entera.
+
+Ejecuta cada caso (endpoints y workers) contra una base sembrada, registra
+las sentencias ``SELECT``/``UPDATE``/``DELETE`` que emite y pide su plan:
+
+- SQLite: ``EXPLAIN QUERY PLAN``; falla un ``SCAN <tabla>`` sin índice.
+- Postgres (opcional, ``--postgres URL``): ``EXPLAIN (FORMAT JSON)`` con
+  ``enable_seqscan = off``, de modo que un ``Seq Scan`` solo aparece si no
+  hay ningún índice utilizable, sea cual sea el tamaño de la tabla.
+
+Solo se vigilan las tablas que crecen (``HOT_TABLES``). Algunos casos
+declaran recorridos esperados, p. ej. la primera página de productos, que
+recorre la clave primaria en orden y se detiene en el ``LIMIT``.
+Termina con código 1 si algún plan hace un recorrido no declarado.
+
+Uso (desde backend/):
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --postgres postgresql://localhost/envatex_plans
+
+La base de ``--postgres`` debe ser desechable: se crean y se borran las tablas.
+"""
+import argparse
+import json
+import re
+import sys
+
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+
+from benchmarks.common import admin_headers, postgres_app, temporary_app
+from benchmarks.seed import seed_database
+
+HOT_TABLES = {'products', 'quotations', 'quotation_items', 'email_outbox', 'image_uploads',
+              'quotations_archive', 'quotation_items_archive'}
+PLANNED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+# SQLite no usa índices para LIKE sobre columnas con collation BINARY; en
+# Postgres los filtros de productos usan ix_products_sku_prefix y el índice
+# trigram sobre lower(name).
+SQLITE_LIKE_SCAN = {'sqlite': {'products'}}
+SQLITE_PLAIN_SCAN = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+
+
+class StatementRecorder:
+    """Guarda las sentencias (y sus parámetros) ejecutadas mientras está activo."""
+
+    def __init__(self):
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(PLANNED_STATEMENTS):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+
+def sqlite_scans(connection, statement, parameters):
+    """Tablas calientes que el plan de SQLite recorre enteras."""
+    rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    scans = set()
+    for row in rows:
+        match = SQLITE_PLAIN_SCAN.match(row[-1])
+        if match and match.group(1) in HOT_TABLES:
+            scans.add(match.group(1))
+    return scans, [row[-1] for row in rows]
+
+
+def postgres_scans(connection, statement, parameters):
+    """Tablas calientes con ``Seq Scan`` en el plan de Postgres."""
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    raw = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+    scans = set()
+    lines = []
+
+    def walk(node, depth=0):
+        relation = node.get('Relation Name')
+        lines.append('  ' * depth + node['Node Type'] + (f' on {relation}' if relation else ''))
+        if node['Node Type'] == 'Seq Scan' and relation in HOT_TABLES:
+            scans.add(relation)
+        for child in node.get('Plans', []):
+            walk(child, depth + 1)
+
+    walk(plan)
+    return scans, lines
+
+
+def plan_cases(client, headers, quotation_ids):
+    """Casos ``(nombre, función, recorridos permitidos)``.
+
+    Los recorridos permitidos son ``{dialecto o '*': {tablas}}``.
+    """
+    from app import db
+    from models import Quotation
+    from services.image_ingest import claim_uploads
+    from services.outbox import claim_batch
+    from services.quotation_archive import archive_batch, archive_cutoff
+
+    def get(url, **params):
+        return lambda: client.get(url, headers=headers, query_string=params)
+
+    # Una cotización ya archivada, fuera de la medición
+    archived_id = quotation_ids[-1]
+    db.session.execute(update(Quotation).where(Quotation.id == archived_id).values(status='Responded'))
+    db.session.commit()
+    archive_batch(archive_cutoff(-1), batch_size=1)
+
+    def next_page(url, **params):
+        # La primera página se pide aquí, fuera de la medición
+        cursor = client.get(url, headers=headers, query_string=params).headers['X-Next-Cursor']
+        return get(url, cursor=cursor, **params)
+
+    return [
+        ('GET /api/products?limit', get('/api/products', limit=50), {'*': {'products'}}),
+        ('GET /api/products (cursor)', next_page('/api/products', limit=50), {}),
+        ('GET /api/products?sku', get('/api/products', sku='SKU-0001', limit=50), SQLITE_LIKE_SCAN),
+        ('GET /api/products?name', get('/api/products', name='Producto 0001', limit=50), SQLITE_LIKE_SCAN),
+        ('GET /api/products/search', get('/api/products/search', q='producto 12'), {}),
+        ('GET /api/quotations?limit', get('/api/quotations', limit=50), {}),
+        ('GET /api/quotations (cursor)', next_page('/api/quotations', limit=50), {}),
+        ('GET /api/quotations?status', get('/api/quotations', status='Pending', limit=50), {}),
+        ('GET /api/quotations?customer_email', get('/api/quotations', customer_email='Cliente7@example.com'), {}),
+        ('GET /api/quotations?created_from', get('/api/quotations', created_from='2020-01-01',
+                                                 created_to='2020-01-31'), {}),
+        ('GET /api/quotations/stats', get('/api/quotations/stats'), {}),
+        ('GET /api/quotations/<id>', get(f'/api/quotations/{quotation_ids[30]}'), {}),
+        ('GET /api/quotations/<id> (archivo)', get(f'/api/quotations/{archived_id}'), {}),
+        ('PATCH /api/quotations/<id>', lambda: client.patch(
+            f'/api/quotations/{quotation_ids[0]}', headers=headers, json={'admin_response': 'Listo'}), {}),
+        ('DELETE /api/quotations/<id>', lambda: client.delete(
+            f'/api/quotations/{quotation_ids[1]}', headers=headers), {}),
+        ('POST /api/quotations/bulk-delete', lambda: client.post(
+            '/api/quotations/bulk-delete', headers=headers,
+            json={'filter': {'customer_email': 'cliente8@example.com'}}), {}),
+        ('PATCH /api/quotations/bulk', lambda: client.patch(
+            '/api/quotations/bulk', headers=headers, json={'ids': quotation_ids[2:20], 'status': 'Archived'}), {}),
+        ('email worker: claim_batch', claim_batch, {}),
+        ('image worker: claim_uploads', claim_uploads, {}),
+        ('archivo: archive_batch', lambda: archive_batch(archive_cutoff(0), batch_size=20), {}),
+    ]
+
+
+def check_plans(app, explain, dialect, verbose):
+    """Ejecuta los casos y devuelve los nombres de los que recorren tablas."""
+    from app import db
+    from services.payload_cache import get_catalog_cache
+    with app.app_context():
+        _, quotation_ids = seed_database(products=2000, quotations=5000, items_per_quotation=5)
+    client = app.test_client()
+    headers = admin_headers(app)
+
+    failures = []
+    with app.app_context():
+        cases = plan_cases(client, headers, quotation_ids)
+    for name, call, allowed in cases:
+        allowed = allowed.get('*', set()) | allowed.get(dialect, set())
+        with app.app_context():
+            # Cada caso tiene que llegar a la base, no a la caché del catálogo
+            get_catalog_cache().clear()
+        with StatementRecorder() as recorder:
+            with app.app_context():
+                response = call()
+        if response is not None and getattr(response, 'status_code', 200) >= 400:
+            raise RuntimeError(f'{name} respondió {response.status_code}: {response.get_data(as_text=True)}')
+
+        plans = []
+        with app.app_context():
+            with db.engine.connect() as connection:
+                for statement, parameters in recorder.statements:
+                    with connection.begin():
+                        scans, plan = explain(connection, statement, parameters)
+                    plans.append((statement, plan, scans - allowed))
+        unexpected = set().union(*(tables for _, _, tables in plans))
+        status = f"FALLA (recorre {', '.join(sorted(unexpected))})" if unexpected else 'OK'
+        print(f'{name:38} {len(recorder.statements):>3} sentencias  {status}')
+        for statement, plan, tables in plans:
+            if tables or verbose:
+                print('    ' + ' '.join(statement.split())[:160])
+                for line in plan:
+                    print('      ' + line)
+        if unexpected:
+            failures.append(name)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postgres', help='URL de una base Postgres desechable')
+    parser.add_argument('--verbose', action='store_true', help='mostrar también los planes correctos')
+    args = parser.parse_args()
+
+    print('SQLite')
+    with temporary_app() as app:
+        failures = check_plans(app, sqlite_scans, 'sqlite', args.verbose)
+    if args.postgres:
+        print('\nPostgres')
+        with postgres_app(args.postgres) as app:
+            failures += check_plans(app, postgres_scans, 'postgresql', args.verbose)
+    if failures:
+        print(f"\n❌ {len(failures)} caso(s) con recorridos completos de tabla")
+        return 1
+    print('\n✅ Ningún caso recorre tablas enteras')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
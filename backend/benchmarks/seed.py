@@ -0,0 +1,69 @@
+"""Siembra de datos de prueba a través de los modelos.
+
+Usa inserts ORM en bloque (``insert(Modelo)`` con listas de diccionarios)
+para poder generar cientos de miles de filas en segundos.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+CHUNK_ROWS = 5000
+
+
+def _bulk_insert(model, rows):
+    """Inserta ``rows`` en bloques y devuelve los ids generados."""
+    from app import db
+    ids = []
+    for start in range(0, len(rows), CHUNK_ROWS):
+        ids.extend(db.session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows[start:start + CHUNK_ROWS],
+        ))
+    return ids
+
+
+def seed_database(products=50, quotations=100, items_per_quotation=5, rng_seed=0):
+    """Inserta productos, cotizaciones e items. Requiere un app context activo.
+
+    Devuelve los ids de productos y cotizaciones creados.
+    """
+    from app import db
+    from models import Product, Quotation, QuotationItem
+
+    rng = random.Random(rng_seed)
+    product_ids = _bulk_insert(Product, [
+        {
+            'name': f'Producto {i:06d}',
+            'description': f'Descripción del producto {i} para pruebas de rendimiento.',
+            'sku': f'SKU-{i:06d}',
+            'image_url': f'https://res.cloudinary.com/demo/image/upload/producto-{i}.jpg',
+        }
+        for i in range(products)
+    ])
+
+    statuses = ['Pending', 'Responded']
+    now = datetime.utcnow()
+    quotation_ids = _bulk_insert(Quotation, [
+        {
+            'customer_name': f'Cliente {i}',
+            'customer_email': f'cliente{i}@example.com',
+            'customer_phone': '1122334455',
+            'status': rng.choice(statuses),
+            'created_at': now - timedelta(minutes=i),
+        }
+        for i in range(quotations)
+    ])
+
+    per_quotation = min(items_per_quotation, len(product_ids))
+    items = []
+    for quotation_id in quotation_ids:
+        for product_id in rng.sample(product_ids, per_quotation):
+            items.append({
+                'quotation_id': quotation_id,
+                'product_id': product_id,
+                'quantity': rng.randint(1, 100),
+            })
+    _bulk_insert(QuotationItem, items)
+    db.session.commit()
+    return product_ids, quotation_ids
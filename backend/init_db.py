@@ -9,9 +9,10 @@ import sys
 # Agregar el directorio backend al path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app import create_app, db
-from models import User, Product, Quotation, QuotationItem
-from sqlalchemy import text
+from app import bootstrap_database, create_app, db
+from models import Product, Quotation, QuotationItem
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
 
 def add_customer_comments_column():
     """Agrega la columna customer_comments si no existe."""
@@ -35,6 +36,136 @@ def add_customer_comments_column():
         print(f"⚠️ Warning during column addition: {e}")
         db.session.rollback()
 
+def column_exists(table, column):
+    """Indica si ``table`` ya tiene ``column`` (Postgres y SQLite)."""
+    return any(c['name'] == column for c in inspect(db.engine).get_columns(table))
+
+def add_image_srcset_column():
+    """Agrega la columna image_srcset (migración c8e4f0a2d361) si no existe."""
+    try:
+        if not column_exists('products', 'image_srcset'):
+            print("🔄 Adding image_srcset column...")
+            db.session.execute(text(
+                "ALTER TABLE products ADD COLUMN image_srcset JSON"
+            ))
+            db.session.commit()
+            print("✅ image_srcset column added")
+        else:
+            print("ℹ️ image_srcset column already exists")
+    except Exception as e:
+        print(f"⚠️ Warning during column addition: {e}")
+        db.session.rollback()
+
+def cascade_quotation_items():
+    """Agrega ON DELETE CASCADE a quotation_items.quotation_id (migración e4b8f1c6a257).
+
+    Los borrados de cotizaciones (individual, en bloque y archivo) eliminan
+    los items en la base. Postgres cambia la FK en el sitio; SQLite no puede
+    modificar restricciones, así que se recrea la tabla con sus filas.
+    """
+    try:
+        foreign_key = next(
+            fk for fk in inspect(db.engine).get_foreign_keys('quotation_items')
+            if fk['constrained_columns'] == ['quotation_id']
+        )
+        if (foreign_key.get('options') or {}).get('ondelete', '').upper() == 'CASCADE':
+            print("ℹ️ quotation_items cascade already exists")
+            return
+        print("🔄 Adding ON DELETE CASCADE to quotation_items...")
+        if db.engine.dialect.name == 'postgresql':
+            name = foreign_key['name']
+            db.session.execute(text(
+                f"ALTER TABLE quotation_items DROP CONSTRAINT {name}, "
+                f"ADD CONSTRAINT {name} FOREIGN KEY (quotation_id) REFERENCES quotations (id) ON DELETE CASCADE"
+            ))
+        else:
+            table = QuotationItem.__table__
+            connection = db.session.connection()
+            for index in inspect(db.engine).get_indexes('quotation_items'):
+                db.session.execute(text(f"DROP INDEX {index['name']}"))
+            db.session.execute(text("ALTER TABLE quotation_items RENAME TO quotation_items_old"))
+            table.create(connection)
+            columns = ', '.join(column.name for column in table.columns)
+            db.session.execute(text(
+                f"INSERT INTO quotation_items ({columns}) SELECT {columns} FROM quotation_items_old"
+            ))
+            db.session.execute(text("DROP TABLE quotation_items_old"))
+        db.session.commit()
+        print("✅ quotation_items cascade added")
+    except Exception as e:
+        print(f"⚠️ Warning during foreign key update: {e}")
+        db.session.rollback()
+
+def create_missing_indexes():
+    """Crea los índices declarados en los modelos que falten (migración a9d5e2f7b134).
+
+    ``create_all`` solo crea índices al crear la tabla; en tablas que ya
+    existían los añade este paso con ``CREATE INDEX IF NOT EXISTS`` (la
+    reflexión de SQLite no ve los índices por expresión).
+    """
+    try:
+        for table in db.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                db.session.execute(CreateIndex(index, if_not_exists=True))
+        db.session.commit()
+        print("✅ Model indexes created/verified")
+    except Exception as e:
+        print(f"⚠️ Warning during index creation: {e}")
+        db.session.rollback()
+
+def create_search_indexes():
+    """Crea los índices de búsqueda (migración d2a7c5e9f013) si no existen.
+
+    En Postgres la columna ``search_vector`` es generada y se rellena sola;
+    en SQLite las tablas FTS5 nuevas se cargan con los productos existentes.
+    """
+    from models.product_search import POSTGRES_DDL, SQLITE_DDL, SQLITE_REBUILD
+    try:
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            exists = column_exists('products', 'search_vector')
+            statements = [] if exists else POSTGRES_DDL
+        elif dialect == 'sqlite':
+            exists = inspect(db.engine).has_table('products_fts')
+            statements = [] if exists else SQLITE_DDL + SQLITE_REBUILD
+        else:
+            return
+        if statements:
+            print("🔄 Creating product search indexes...")
+            for statement in statements:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("✅ Product search indexes created")
+        else:
+            print("ℹ️ Product search indexes already exist")
+    except Exception as e:
+        print(f"⚠️ Warning during search index creation: {e}")
+        db.session.rollback()
+
+def backfill_quotation_stats():
+    """Carga el resumen de /api/quotations/stats si está vacío (migración f6c2a9d4e318).
+
+    ``create_all`` crea las tablas de resumen vacías en una base con
+    cotizaciones; las rutas solo aplican incrementos, así que sin esta carga
+    los borrados dejarían totales negativos. Vacío equivale a recién creado:
+    con una sola cotización el resumen ya tiene filas.
+    """
+    from models import QuotationDailyStat
+    from services.cache_versions import QUOTATIONS, bump_version
+    from services.quotation_stats import get_stats, rebuild_stats
+    try:
+        if db.session.scalar(db.select(QuotationDailyStat.day).limit(1)) is not None:
+            print("ℹ️ Quotation stats already loaded")
+            return
+        print("🔄 Loading quotation stats...")
+        rebuild_stats()
+        bump_version(QUOTATIONS)
+        db.session.commit()
+        print(f"✅ Quotation stats loaded: {get_stats()['total']} quotations")
+    except Exception as e:
+        print(f"⚠️ Warning during quotation stats load: {e}")
+        db.session.rollback()
+
 def sync_alembic_version():
     """Sincroniza la tabla alembic_version con el estado actual de la base de datos."""
     try:
@@ -93,34 +224,24 @@ def sync_alembic_version():
 
 def init_database():
     """Inicializa la base de datos y crea el usuario admin."""
-    app = create_app()
+    app = create_app(bootstrap=False)
     
     with app.app_context():
         try:
             # Sincronizar alembic_version antes de crear tablas
             sync_alembic_version()
             
-            # Crear todas las tablas
+            # Crear todas las tablas y el usuario admin
             print("🔄 Creating/verifying database tables...")
-            db.create_all()
-            print("✅ Database tables created/verified")
+            bootstrap_database()
             
             # Agregar columna customer_comments si no existe
             add_customer_comments_column()
-            
-            # Crear usuario admin
-            admin_user = os.getenv('ADMIN_USER', 'admin')
-            admin_pass = os.getenv('ADMIN_PASSWORD', 'admin123')
-            
-            existing = User.query.filter_by(username=admin_user).first()
-            if not existing:
-                u = User(username=admin_user)
-                u.set_password(admin_pass)
-                db.session.add(u)
-                db.session.commit()
-                print(f"✅ Admin user '{admin_user}' created successfully")
-            else:
-                print(f"ℹ️  Admin user '{admin_user}' already exists")
+            add_image_srcset_column()
+            cascade_quotation_items()
+            create_missing_indexes()
+            create_search_indexes()
+            backfill_quotation_stats()
                 
             print("✅ Database initialization complete!")
             return True
@@ -90,9 +90,19 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # Los índices de búsqueda se crean con SQL propio (models/product_search.py);
+    # autogenerate no los conoce y no debe proponer borrarlos.
+    def include_object(object, name, type_, reflected, compare_to):
+        from models.product_search import SEARCH_OBJECTS
+        if reflected and compare_to is None and name:
+            return name not in SEARCH_OBJECTS and not name.startswith(('products_fts', 'products_trigram'))
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,26 @@
+"""Add text_body (plain-text alternative) to email_outbox
+
+Revision ID: a41f0e7c3b25
+Revises: 8d2e4b6a9c10
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f0e7c3b25'
+down_revision = '8d2e4b6a9c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('text_body', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.drop_column('text_body')
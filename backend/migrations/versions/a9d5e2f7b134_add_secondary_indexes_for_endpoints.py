@@ -0,0 +1,51 @@
+"""Add secondary indexes used by the list, filter, cascade and queue queries
+
+Revision ID: a9d5e2f7b134
+Revises: f6c2a9d4e318
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d5e2f7b134'
+down_revision = 'f6c2a9d4e318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quotations', schema=None) as batch_op:
+        batch_op.create_index('ix_quotations_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_quotations_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_quotations_customer_email_lower',
+                              [sa.text('lower(customer_email)'), 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('quotation_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_quotation_items_quotation_id'), ['quotation_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_quotation_items_product_id'), ['product_id'], unique=False)
+
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.create_index('ix_email_outbox_status_next_attempt_at', ['status', 'next_attempt_at'], unique=False)
+
+    with op.batch_alter_table('image_uploads', schema=None) as batch_op:
+        batch_op.create_index('ix_image_uploads_status_next_attempt_at', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('image_uploads', schema=None) as batch_op:
+        batch_op.drop_index('ix_image_uploads_status_next_attempt_at')
+
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_outbox_status_next_attempt_at')
+
+    with op.batch_alter_table('quotation_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quotation_items_product_id'))
+        batch_op.drop_index(batch_op.f('ix_quotation_items_quotation_id'))
+
+    with op.batch_alter_table('quotations', schema=None) as batch_op:
+        batch_op.drop_index('ix_quotations_customer_email_lower')
+        batch_op.drop_index('ix_quotations_status_created_at_id')
+        batch_op.drop_index('ix_quotations_created_at_id')
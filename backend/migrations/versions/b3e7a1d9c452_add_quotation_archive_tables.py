@@ -0,0 +1,49 @@
+"""Add archive tables for old quotations and their items
+
+Revision ID: b3e7a1d9c452
+Revises: a9d5e2f7b134
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e7a1d9c452'
+down_revision = 'a9d5e2f7b134'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('quotations_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('customer_name', sa.String(length=100), nullable=False),
+    sa.Column('customer_email', sa.String(length=100), nullable=False),
+    sa.Column('customer_phone', sa.String(length=20), nullable=True),
+    sa.Column('customer_comments', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('admin_response', sa.Text(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('quotation_items_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('quotation_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['quotation_id'], ['quotations_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('quotation_items_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_quotation_items_archive_quotation_id'), ['quotation_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('quotation_items_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quotation_items_archive_quotation_id'))
+
+    op.drop_table('quotation_items_archive')
+    op.drop_table('quotations_archive')
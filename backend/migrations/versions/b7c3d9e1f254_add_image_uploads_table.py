@@ -0,0 +1,43 @@
+"""Add image_uploads table for asynchronous product image ingestion
+
+Revision ID: b7c3d9e1f254
+Revises: a41f0e7c3b25
+Create Date: 2026-10-18 15:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3d9e1f254'
+down_revision = 'a41f0e7c3b25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('image_uploads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('staged_path', sa.String(length=500), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('image_uploads', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_image_uploads_product_id'), ['product_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('image_uploads', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_image_uploads_product_id'))
+
+    op.drop_table('image_uploads')
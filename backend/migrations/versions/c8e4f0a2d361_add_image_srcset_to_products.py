@@ -0,0 +1,26 @@
+"""Add image_srcset (responsive image versions) to products
+
+Revision ID: c8e4f0a2d361
+Revises: b7c3d9e1f254
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e4f0a2d361'
+down_revision = 'b7c3d9e1f254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_srcset', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('image_srcset')
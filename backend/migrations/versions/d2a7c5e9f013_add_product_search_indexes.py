@@ -0,0 +1,109 @@
+"""Add full-text and fuzzy search indexes for products
+
+Postgres: generated tsvector column with a GIN index, pg_trgm index on the
+lower-cased, accent-folded name and a text_pattern_ops index for SKU prefixes.
+SQLite: FTS5 external-content tables kept in sync by triggers.
+
+Revision ID: d2a7c5e9f013
+Revises: c8e4f0a2d361
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c5e9f013'
+down_revision = 'c8e4f0a2d361'
+branch_labels = None
+depends_on = None
+
+
+# Nombre y descripción sin tildes: ``unaccent`` no es IMMUTABLE, ``translate`` sí
+FOLD = "translate(lower({}), 'áàâäãéèêëíìîïóòôöõúùûüñç', 'aaaaaeeeeiiiiooooouuuunc')"
+
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', {FOLD.format("coalesce(name, '')")}), 'A') ||
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('simple', {FOLD.format("coalesce(description, '')")}), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING gin (search_vector)",
+    f"CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (({FOLD.format('name')}) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_products_sku_prefix ON products (sku text_pattern_ops)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_products_sku_prefix",
+    "DROP INDEX IF EXISTS ix_products_name_trgm",
+    "DROP INDEX IF EXISTS ix_products_search_vector",
+    "ALTER TABLE products DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, sku,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_trigram USING fts5(
+        name, content='products', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+        INSERT INTO products_trigram(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_trigram(products_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_au AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_trigram(products_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+        INSERT INTO products_trigram(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    # Indexar los productos que ya existen
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+    "INSERT INTO products_trigram(products_trigram) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS products_search_au",
+    "DROP TRIGGER IF EXISTS products_search_ad",
+    "DROP TRIGGER IF EXISTS products_search_ai",
+    "DROP TABLE IF EXISTS products_trigram",
+    "DROP TABLE IF EXISTS products_fts",
+]
+
+
+def _run(statements_by_dialect):
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'postgresql': POSTGRES_UPGRADE, 'sqlite': SQLITE_UPGRADE})
+
+
+def downgrade():
+    _run({'postgresql': POSTGRES_DOWNGRADE, 'sqlite': SQLITE_DOWNGRADE})
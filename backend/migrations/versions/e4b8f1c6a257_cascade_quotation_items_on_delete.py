@@ -0,0 +1,39 @@
+"""Cascade quotation_items on quotation delete (ON DELETE CASCADE)
+
+Revision ID: e4b8f1c6a257
+Revises: d2a7c5e9f013
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8f1c6a257'
+down_revision = 'd2a7c5e9f013'
+branch_labels = None
+depends_on = None
+
+# La FK original no tiene nombre: Postgres le asigna este y en SQLite la
+# convención permite referirse a ella al recrear la tabla.
+POSTGRES_FK = 'quotation_items_quotation_id_fkey'
+SQLITE_FK = 'fk_quotation_items_quotation_id_quotations'
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _replace_foreign_key(ondelete):
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    name = SQLITE_FK if sqlite else POSTGRES_FK
+    with op.batch_alter_table('quotation_items', schema=None, naming_convention=NAMING_CONVENTION,
+                              recreate='always' if sqlite else 'auto') as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, 'quotations', ['quotation_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    _replace_foreign_key('CASCADE')
+
+
+def downgrade():
+    _replace_foreign_key(None)
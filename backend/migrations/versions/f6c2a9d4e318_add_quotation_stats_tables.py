@@ -0,0 +1,46 @@
+"""Add quotation summary tables (daily stats and product request stats)
+
+Revision ID: f6c2a9d4e318
+Revises: e4b8f1c6a257
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6c2a9d4e318'
+down_revision = 'e4b8f1c6a257'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('quotation_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('quotations', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'status')
+    )
+    op.create_table('product_request_stats',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.BigInteger(), nullable=False),
+    sa.Column('quotations', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    # Cargar el resumen con las cotizaciones existentes (igual que rebuild_stats)
+    op.execute(
+        "INSERT INTO quotation_daily_stats (day, status, quotations) "
+        "SELECT date(created_at), status, count(*) FROM quotations GROUP BY date(created_at), status"
+    )
+    op.execute(
+        "INSERT INTO product_request_stats (product_id, quantity, quotations) "
+        "SELECT product_id, sum(quantity), count(DISTINCT quotation_id) FROM quotation_items GROUP BY product_id"
+    )
+
+
+def downgrade():
+    op.drop_table('product_request_stats')
+    op.drop_table('quotation_daily_stats')
@@ -1,7 +1,14 @@
 """Exportación centralizada de todos los modelos."""
 from .product import Product
+from . import product_search  # registra los índices de búsqueda (DDL)
 from .quotation import Quotation
 from .quotation_item import QuotationItem
 from .user import User
+from .cache_version import CacheVersion
+from .email_outbox import EmailOutbox
+from .image_upload import ImageUpload
+from .quotation_stats import QuotationDailyStat, ProductRequestStat
+from .quotation_archive import ArchivedQuotation, ArchivedQuotationItem
 
-__all__ = ['Product', 'Quotation', 'QuotationItem', 'User']
+__all__ = ['Product', 'Quotation', 'QuotationItem', 'User', 'CacheVersion', 'EmailOutbox', 'ImageUpload',
+           'QuotationDailyStat', 'ProductRequestStat', 'ArchivedQuotation', 'ArchivedQuotationItem']
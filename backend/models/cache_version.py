@@ -0,0 +1,19 @@
+"""Modelo de versión de caché por recurso."""
+from app import db
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime
+
+
+class CacheVersion(db.Model):
+    """Contador que se incrementa en cada escritura de un recurso.
+
+    Los endpoints de lectura derivan de aquí sus validadores HTTP (ETag y
+    Last-Modified) con una sola consulta por clave primaria, sin serializar
+    los datos.
+    """
+    __tablename__ = 'cache_versions'
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
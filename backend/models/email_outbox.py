@@ -0,0 +1,48 @@
+"""Modelo de la bandeja de salida de emails (outbox transaccional)."""
+from app import db
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Text, Integer, DateTime, Index
+from typing import Optional
+
+
+class EmailOutbox(db.Model):
+    """Email pendiente de entrega.
+
+    Se inserta en la misma transacción que el cambio que lo origina y lo
+    entrega el worker (``scripts/email_worker.py``). ``next_attempt_at``
+    sirve a la vez de cola de reintentos y de lease: al reclamar una fila el
+    worker la aplaza, de modo que si muere a mitad de envío vuelve a quedar
+    disponible.
+    """
+    __tablename__ = 'email_outbox'
+    # Cola de pendientes vencidos: status = 'pending' AND next_attempt_at <= ahora
+    __table_args__ = (Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    to_email: Mapped[str] = mapped_column(String(255))
+    subject: Mapped[str] = mapped_column(String(255))
+    html_body: Mapped[str] = mapped_column(Text)
+    text_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    quotation_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default='pending')
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def serialize(self) -> dict:
+        """Convierte el objeto EmailOutbox en un diccionario serializable."""
+        return {
+            'id': self.id,
+            'to_email': self.to_email,
+            'subject': self.subject,
+            'quotation_id': self.quotation_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+        }
@@ -0,0 +1,45 @@
+"""Modelo de las subidas de imágenes pendientes."""
+from app import db
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index
+from typing import Optional
+
+
+class ImageUpload(db.Model):
+    """Imagen de producto guardada en disco a la espera de subirse.
+
+    La ruta de productos la registra junto con el producto y responde sin
+    esperar; el pool de ``services.image_ingest`` la sube y rellena
+    ``Product.image_url``. Como en ``EmailOutbox``, ``next_attempt_at`` es a
+    la vez cola de reintentos y lease.
+    """
+    __tablename__ = 'image_uploads'
+    # Cola de pendientes vencidos: status = 'pending' AND next_attempt_at <= ahora
+    __table_args__ = (Index('ix_image_uploads_status_next_attempt_at', 'status', 'next_attempt_at'),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id', ondelete='CASCADE'), index=True)
+    staged_path: Mapped[str] = mapped_column(String(500))
+    original_filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default='pending')
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    image_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def serialize(self) -> dict:
+        """Convierte el objeto ImageUpload en un diccionario serializable."""
+        return {
+            'id': self.id,
+            'product_id': self.product_id,
+            'original_filename': self.original_filename,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'image_url': self.image_url,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
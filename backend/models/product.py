@@ -1,7 +1,7 @@
 """Modelo de Producto."""
 from app import db
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Text
+from sqlalchemy import String, Text, JSON
 from typing import Optional
 
 
@@ -13,6 +13,8 @@ class Product(db.Model):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     sku: Mapped[Optional[str]] = mapped_column(String(50), unique=True, nullable=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Versiones de la imagen por ancho, listas para ``srcset``: {'160w': url, ...}
+    image_srcset: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
     def serialize(self) -> dict:
         """Convierte el objeto Product en un diccionario serializable."""
@@ -21,5 +23,6 @@ class Product(db.Model):
             'name': self.name,
             'description': self.description,
             'sku': self.sku,
-            'image_url': self.image_url
+            'image_url': self.image_url,
+            'image_srcset': self.image_srcset
         }
@@ -0,0 +1,102 @@
+"""Índices de búsqueda de productos, fuera del modelo ORM.
+
+El índice lo mantiene la propia base de datos, así que no depende de que
+todas las escrituras pasen por el ORM:
+
+- Postgres: columna generada ``search_vector`` (``tsvector``) con índice GIN,
+  índice trigram (``pg_trgm``) sobre el nombre para las búsquedas con
+  errores de tipeo e índice ``text_pattern_ops`` para prefijos de SKU. Nombre
+  y descripción se indexan sin tildes (``folded``), como en SQLite.
+- SQLite: tablas FTS5 de contenido externo ``products_fts`` (palabras) y
+  ``products_trigram`` (trigramas del nombre), sincronizadas por triggers.
+
+La migración ``d2a7c5e9f013`` e ``init_db.py`` crean los mismos objetos en
+bases existentes; aquí se registran para que ``db.create_all()`` los cree en
+bases nuevas.
+"""
+from sqlalchemy import DDL, event
+
+from .product import Product
+
+# Nombres que autogenerate debe ignorar (ver migrations/env.py)
+SEARCH_OBJECTS = {
+    'search_vector', 'ix_products_search_vector', 'ix_products_name_trgm', 'ix_products_sku_prefix',
+    'products_fts', 'products_trigram',
+}
+
+# Tildes que se quitan al indexar y al buscar en Postgres. ``unaccent`` no es
+# IMMUTABLE y no puede usarse en columnas generadas ni índices; ``translate``
+# sí. Equivale a ``queries.search._fold`` para el español.
+ACCENTED = 'áàâäãéèêëíìîïóòôöõúùûüñç'
+UNACCENTED = 'aaaaaeeeeiiiiooooouuuunc'
+
+
+def folded(column):
+    """Expresión SQL de ``column`` en minúsculas y sin tildes (Postgres)."""
+    return f"translate(lower({column}), '{ACCENTED}', '{UNACCENTED}')"
+
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', {folded("coalesce(name, '')")}), 'A') ||
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('simple', {folded("coalesce(description, '')")}), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING gin (search_vector)",
+    f"CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (({folded('name')}) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_products_sku_prefix ON products (sku text_pattern_ops)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description, sku,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_trigram USING fts5(
+        name, content='products', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+        INSERT INTO products_trigram(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_trigram(products_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_search_au AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_trigram(products_trigram, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+        INSERT INTO products_trigram(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+]
+
+# Indexa los productos que ya existían al crear las tablas FTS5
+SQLITE_REBUILD = [
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+    "INSERT INTO products_trigram(products_trigram) VALUES ('rebuild')",
+]
+
+for statement in POSTGRES_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
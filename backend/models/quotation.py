@@ -2,7 +2,7 @@
 from app import db
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, DateTime
+from sqlalchemy import String, Text, DateTime, Index, func
 from typing import List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,6 +11,12 @@ if TYPE_CHECKING:
 
 class Quotation(db.Model):
     __tablename__ = 'quotations'
+    # Índices del listado: orden (created_at, id) de la paginación por cursor,
+    # solo o detrás del filtro por estado (ver queries/quotations.py)
+    __table_args__ = (
+        Index('ix_quotations_created_at_id', 'created_at', 'id'),
+        Index('ix_quotations_status_created_at_id', 'status', 'created_at', 'id'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     customer_name: Mapped[str] = mapped_column(String(100))
@@ -21,10 +27,12 @@ class Quotation(db.Model):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     admin_response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
-    # Relación con los items de la cotización
+    # Relación con los items de la cotización; al borrar, los elimina la
+    # base de datos (ON DELETE CASCADE) sin cargarlos
     items: Mapped[List["QuotationItem"]] = relationship(
         back_populates='quotation',
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     
     def serialize(self) -> dict:
@@ -40,3 +48,7 @@ class Quotation(db.Model):
             'admin_response': self.admin_response,
             'items': [item.serialize() for item in self.items],
         }
+
+
+# El filtro por email compara en minúsculas: índice sobre la misma expresión
+Index('ix_quotations_customer_email_lower', func.lower(Quotation.customer_email), Quotation.created_at, Quotation.id)
@@ -0,0 +1,41 @@
+"""Modelos del archivo de cotizaciones antiguas (tablas frías)."""
+from app import db
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Text, DateTime, Integer, ForeignKey
+from typing import Optional
+
+
+class ArchivedQuotation(db.Model):
+    """Cotización movida fuera de ``quotations`` por ``services.quotation_archive``.
+
+    Conserva el id y las columnas originales; las lecturas por id de la API
+    la encuentran aquí si ya no está en la tabla caliente.
+    """
+    __tablename__ = 'quotations_archive'
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    customer_name: Mapped[str] = mapped_column(String(100))
+    customer_email: Mapped[str] = mapped_column(String(100))
+    customer_phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    customer_comments: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(20))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    admin_response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedQuotationItem(db.Model):
+    """Item de una cotización archivada.
+
+    ``product_id`` no es clave foránea: el archivo no impide borrar productos
+    del catálogo, y un item cuyo producto ya no existe se lee sin ``product``.
+    """
+    __tablename__ = 'quotation_items_archive'
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    quantity: Mapped[int] = mapped_column(Integer)
+    quotation_id: Mapped[int] = mapped_column(
+        ForeignKey('quotations_archive.id', ondelete='CASCADE'), index=True
+    )
+    product_id: Mapped[int] = mapped_column(Integer)
@@ -14,8 +14,9 @@ class QuotationItem(db.Model):
     
     id: Mapped[int] = mapped_column(primary_key=True)
     quantity: Mapped[int] = mapped_column(Integer)
-    quotation_id: Mapped[int] = mapped_column(ForeignKey('quotations.id'))
-    product_id: Mapped[int] = mapped_column(ForeignKey('products.id'))
+    # ON DELETE CASCADE: borrar cotizaciones en bloque elimina sus items en la base
+    quotation_id: Mapped[int] = mapped_column(ForeignKey('quotations.id', ondelete='CASCADE'), index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id'), index=True)
 
     # Relaciones bidireccionales
     quotation: Mapped["Quotation"] = relationship(back_populates='items')
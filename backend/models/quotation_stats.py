@@ -0,0 +1,27 @@
+"""Modelos del resumen de cotizaciones (tablas de agregados)."""
+from app import db
+from datetime import date
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, BigInteger, Date, ForeignKey
+
+
+class QuotationDailyStat(db.Model):
+    """Cotizaciones por día de creación (UTC) y estado.
+
+    La mantienen las rutas de escritura con incrementos (ver
+    ``services.quotation_stats``); ``scripts/rebuild_stats.py`` la recalcula.
+    """
+    __tablename__ = 'quotation_daily_stats'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    quotations: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class ProductRequestStat(db.Model):
+    """Cantidad total pedida de un producto y en cuántas cotizaciones aparece."""
+    __tablename__ = 'product_request_stats'
+
+    product_id: Mapped[int] = mapped_column(ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    quantity: Mapped[int] = mapped_column(BigInteger, default=0)
+    quotations: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,6 +1,6 @@
 """Modelo de Usuario para autenticación."""
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from services.passwords import hash_password, needs_rehash, verify_password
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import String
 
@@ -13,12 +13,21 @@ class User(db.Model):
     password_hash: Mapped[str] = mapped_column(String(255))
 
     def set_password(self, password: str) -> None:
-        """Hashea y guarda la contraseña."""
-        self.password_hash = generate_password_hash(password)
+        """Hashea y guarda la contraseña con el método configurado."""
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        """Verifica si la contraseña coincide con el hash."""
-        return check_password_hash(self.password_hash, password)
+        """Verifica si la contraseña coincide con el hash.
+
+        Si coincide pero el hash usa otro método o coste que el configurado
+        (``PASSWORD_HASH_METHOD``), se rehace con la contraseña en claro que
+        acabamos de validar. No hace commit.
+        """
+        if not verify_password(self.password_hash, password):
+            return False
+        if needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
     def serialize(self) -> dict:
         """Convierte el objeto User en un diccionario serializable."""
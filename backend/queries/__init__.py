@@ -0,0 +1,5 @@
+"""Capa de consultas de lectura de la API.
+
+Centraliza cómo se cargan los modelos para los endpoints de lectura, de modo
+que las rutas no dependan de la carga perezosa de relaciones.
+"""
@@ -0,0 +1,108 @@
+"""Paginación por cursor (keyset) y validación de parámetros de consulta.
+
+El cursor es opaco para el cliente: codifica en base64 la clave de orden de la
+última fila devuelta, y la página siguiente se obtiene con un ``WHERE`` sobre
+esa clave. A diferencia de ``OFFSET``, el coste de cada página no depende de
+cuántas filas haya antes.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from app import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidParameter(ValueError):
+    """Parámetro de consulta inválido; las rutas lo traducen a un 400."""
+
+
+def encode_cursor(values):
+    """Codifica la clave de orden de una fila como cursor opaco."""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decodifica un cursor generado por ``encode_cursor``."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidParameter('Cursor inválido')
+
+
+def is_integer(value):
+    """``True`` si ``value`` es un entero JSON (``bool`` es subclase de ``int``)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_limit(raw, cursor=None):
+    """Tamaño de página pedido, o None si se quiere la lista completa.
+
+    Sin ``limit`` ni ``cursor`` se conserva el comportamiento original de
+    devolver todo; con cursor pero sin límite se usa el tamaño por defecto.
+    """
+    if raw is None or raw == '':
+        return DEFAULT_PAGE_SIZE if cursor else None
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise InvalidParameter("'limit' debe ser un número entero")
+    if limit < 1:
+        raise InvalidParameter("'limit' debe ser mayor que cero")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_datetime(raw, name, upper_bound=False):
+    """Interpreta una fecha ISO (``2025-01-31`` o ``2025-01-31T10:00:00``).
+
+    Con ``upper_bound`` devuelve un límite superior exclusivo equivalente al
+    valor inclusivo pedido: una fecha sin hora abarca el día completo.
+    """
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise InvalidParameter(f"'{name}' debe ser una fecha ISO (AAAA-MM-DD)")
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    if upper_bound:
+        value += timedelta(days=1) if len(raw) == 10 else timedelta(microseconds=1)
+    return value
+
+
+def rows_as_dicts(result):
+    """Convierte las filas Core de ``result`` en diccionarios por nombre de columna."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def fetch_page(statement, limit, cursor_of, load):
+    """Ejecuta ``statement`` con ``load`` y devuelve ``(filas, cursor_siguiente)``.
+
+    Se pide una fila de más para saber si existe una página siguiente sin
+    necesidad de un ``COUNT``.
+    """
+    if limit is None:
+        return load(statement), None
+    rows = load(statement.limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(cursor_of(rows[-1]))
+
+
+def iter_batches(statement, batch_size):
+    """Itera ``statement`` en lotes de diccionarios usando un cursor de servidor.
+
+    Con ``yield_per`` Postgres entrega las filas por bloques de
+    ``batch_size`` y solo un bloque vive en memoria a la vez.
+    """
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    keys = list(result.keys())
+    for partition in result.partitions():
+        yield [dict(zip(keys, row)) for row in partition]
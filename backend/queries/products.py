@@ -0,0 +1,86 @@
+"""Consultas de productos con filtros por prefijo y paginación por id.
+
+Los listados seleccionan solo las columnas que se devuelven y las convierten
+directamente en diccionarios, sin hidratar instancias ORM; ``serialize()``
+del modelo queda para las rutas de escritura.
+"""
+from sqlalchemy import select
+
+from app import db
+
+from .pagination import InvalidParameter, decode_cursor, fetch_page, is_integer, iter_batches, rows_as_dicts
+
+STREAM_BATCH_ROWS = 1000
+
+
+def parse_product_filters(args):
+    """Extrae los filtros de productos de los parámetros de la petición."""
+    return {
+        'name': args.get('name') or None,
+        'sku': args.get('sku') or None,
+    }
+
+
+def product_columns():
+    """Columnas de ``Product.serialize()``, en el mismo orden."""
+    from models import Product
+    return (Product.id, Product.name, Product.description, Product.sku, Product.image_url,
+            Product.image_srcset)
+
+
+def select_products(filters=None, after=None):
+    """Select de productos ordenado por id, filtrado y a partir del cursor."""
+    from models import Product
+    filters = filters or {}
+    statement = select(*product_columns()).order_by(Product.id)
+    if filters.get('name'):
+        statement = statement.where(Product.name.istartswith(filters['name'], autoescape=True))
+    if filters.get('sku'):
+        statement = statement.where(Product.sku.startswith(filters['sku'], autoescape=True))
+    if after is not None:
+        statement = statement.where(Product.id > after)
+    return statement
+
+
+def decode_product_cursor(token):
+    """Devuelve el id a partir del cual continuar, o None sin cursor."""
+    if not token:
+        return None
+    value = decode_cursor(token)
+    if not is_integer(value):
+        raise InvalidParameter('Cursor inválido')
+    return value
+
+
+def existing_product_ids(product_ids):
+    """Devuelve el subconjunto de ``product_ids`` que existe, en una consulta."""
+    from models import Product
+    if not product_ids:
+        return set()
+    return set(db.session.scalars(select(Product.id).where(Product.id.in_(product_ids))))
+
+
+def load_products(statement):
+    """Ejecuta un select de ``select_products`` y devuelve diccionarios."""
+    return rows_as_dicts(db.session.execute(statement))
+
+
+def list_products(filters=None, cursor=None, limit=None):
+    """Devuelve ``(productos, cursor_siguiente)`` ya serializados."""
+    statement = select_products(filters, decode_product_cursor(cursor))
+    return fetch_page(statement, limit, lambda p: p['id'], load_products)
+
+
+def stream_products(filters=None, cursor=None, limit=None):
+    """Devuelve un generador de productos serializados para streaming.
+
+    Los parámetros se validan al llamar; la consulta se ejecuta al iterar.
+    """
+    statement = select_products(filters, decode_product_cursor(cursor))
+    if limit:
+        statement = statement.limit(limit)
+
+    def generate():
+        for batch in iter_batches(statement, STREAM_BATCH_ROWS):
+            yield from batch
+    return generate()
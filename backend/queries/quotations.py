@@ -0,0 +1,229 @@
+"""Consultas de cotizaciones sin N+1.
+
+Serializar una cotización recorre ``items`` y, por cada item, ``product``.
+Con la carga perezosa por defecto eso son 1 + Q + I consultas.
+
+- Los listados (solo lectura) seleccionan las columnas necesarias como filas
+  Core: una consulta para las cotizaciones y otra, con ``JOIN`` a productos,
+  para los items del lote. Los diccionarios resultantes tienen la misma forma
+  que ``Quotation.serialize()``.
+- Las rutas de escritura cargan instancias ORM con ``eager_options`` para
+  poder modificarlas y usar ``serialize()``.
+
+Los listados se ordenan por ``(created_at, id)`` descendente, que también es
+la clave del cursor de paginación.
+"""
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import raiseload, selectinload
+
+from app import db
+
+from .pagination import (
+    InvalidParameter, decode_cursor, fetch_page, is_integer, iter_batches, parse_datetime, rows_as_dicts,
+)
+
+STREAM_BATCH_ROWS = 500
+# Máximo de ids por cada ``IN (...)`` al cargar items
+ITEMS_IN_BATCH = 500
+# Máximo de ids explícitos en una operación en bloque; más allá, usar filtros
+MAX_BULK_IDS = 5000
+
+
+def eager_options():
+    """Opciones de carga ORM para modificar y serializar una cotización completa.
+
+    ``raiseload('*', sql_only=True)`` hace que cualquier otra relación que
+    intente cargarse perezosamente lance un error en lugar de volver a
+    introducir un N+1 en silencio.
+    """
+    from models import Quotation, QuotationItem
+    return (
+        selectinload(Quotation.items).selectinload(QuotationItem.product),
+        raiseload('*', sql_only=True),
+    )
+
+
+def parse_quotation_filters(args):
+    """Extrae los filtros de cotizaciones de los parámetros de la petición.
+
+    Ambos extremos del rango de fechas son inclusivos; ``created_to`` sin
+    hora abarca el día completo.
+    """
+    return {
+        'status': args.get('status') or None,
+        'customer_email': args.get('customer_email') or None,
+        'created_from': parse_datetime(args.get('created_from'), 'created_from'),
+        'created_before': parse_datetime(args.get('created_to'), 'created_to', upper_bound=True),
+    }
+
+
+def apply_filters(statement, filters):
+    """Aplica los filtros de ``parse_quotation_filters`` a un select."""
+    from models import Quotation
+    if not filters:
+        return statement
+    if filters.get('status'):
+        statement = statement.where(Quotation.status == filters['status'])
+    if filters.get('customer_email'):
+        statement = statement.where(
+            func.lower(Quotation.customer_email) == filters['customer_email'].lower()
+        )
+    if filters.get('created_from'):
+        statement = statement.where(Quotation.created_at >= filters['created_from'])
+    if filters.get('created_before'):
+        statement = statement.where(Quotation.created_at < filters['created_before'])
+    return statement
+
+
+def bulk_selection(data):
+    """Condición SQL con las cotizaciones elegidas para una operación en bloque.
+
+    ``data`` trae ``ids`` (lista de enteros) o ``filter`` con las mismas
+    claves que los parámetros de ``GET /api/quotations``. Un filtro vacío se
+    rechaza para no afectar a todas las cotizaciones por accidente.
+    """
+    from models import Quotation
+    ids = data.get('ids')
+    criteria = data.get('filter')
+    if (ids is None) == (criteria is None):
+        raise InvalidParameter("Indica 'ids' o 'filter' (uno de los dos)")
+    if ids is not None:
+        if not isinstance(ids, list) or not all(is_integer(i) for i in ids):
+            raise InvalidParameter("'ids' debe ser una lista de enteros")
+        if not ids:
+            raise InvalidParameter("'ids' no puede estar vacío")
+        if len(ids) > MAX_BULK_IDS:
+            raise InvalidParameter(f"'ids' admite hasta {MAX_BULK_IDS} elementos; usa 'filter' para más")
+        return Quotation.id.in_(set(ids))
+    if not isinstance(criteria, dict):
+        raise InvalidParameter("'filter' debe ser un objeto")
+    filters = parse_quotation_filters({k: str(v) for k, v in criteria.items() if v is not None})
+    if not any(filters.values()):
+        raise InvalidParameter("'filter' necesita al menos un criterio")
+    return apply_filters(select(Quotation.id), filters).whereclause
+
+
+def quotation_columns():
+    """Columnas de ``Quotation.serialize()`` (sin ``items``), en el mismo orden."""
+    from models import Quotation
+    return (
+        Quotation.id, Quotation.customer_name, Quotation.customer_email,
+        Quotation.customer_phone, Quotation.customer_comments, Quotation.status,
+        Quotation.created_at, Quotation.admin_response,
+    )
+
+
+def select_quotations(filters=None, after=None):
+    """Select de columnas de cotizaciones, más recientes primero.
+
+    ``after`` es la clave ``(created_at, id)`` de la última fila ya entregada.
+    """
+    from models import Quotation
+    statement = apply_filters(
+        select(*quotation_columns()),
+        filters,
+    ).order_by(Quotation.created_at.desc(), Quotation.id.desc())
+    if after is not None:
+        created_at, quotation_id = after
+        statement = statement.where(or_(
+            Quotation.created_at < created_at,
+            and_(Quotation.created_at == created_at, Quotation.id < quotation_id),
+        ))
+    return statement
+
+
+def attach_items(quotations):
+    """Añade ``items`` (con su producto) a cotizaciones ya proyectadas.
+
+    Una consulta por cada ``ITEMS_IN_BATCH`` cotizaciones, independiente del
+    número de items. Modifica los diccionarios en sitio.
+    """
+    from models import Product, QuotationItem
+    by_id = {}
+    for quotation in quotations:
+        created_at = quotation['created_at']
+        quotation['created_at'] = created_at.isoformat() if created_at else None
+        quotation['items'] = []
+        by_id[quotation['id']] = quotation
+
+    ids = list(by_id)
+    for start in range(0, len(ids), ITEMS_IN_BATCH):
+        rows = db.session.execute(
+            select(
+                QuotationItem.id, QuotationItem.quantity, QuotationItem.quotation_id,
+                QuotationItem.product_id, Product.name, Product.description,
+                Product.sku, Product.image_url, Product.image_srcset,
+            )
+            .outerjoin(Product, Product.id == QuotationItem.product_id)
+            .where(QuotationItem.quotation_id.in_(ids[start:start + ITEMS_IN_BATCH]))
+            .order_by(QuotationItem.id)
+        )
+        for (item_id, quantity, quotation_id, product_id, name, description, sku, image_url,
+             image_srcset) in rows:
+            by_id[quotation_id]['items'].append({
+                'id': item_id,
+                'quantity': quantity,
+                'quotation_id': quotation_id,
+                'product_id': product_id,
+                'product': {
+                    'id': product_id,
+                    'name': name,
+                    'description': description,
+                    'sku': sku,
+                    'image_url': image_url,
+                    'image_srcset': image_srcset,
+                } if name is not None else None,
+            })
+    return quotations
+
+
+def load_quotations(statement):
+    """Ejecuta un select de ``select_quotations`` y devuelve diccionarios completos."""
+    return attach_items(rows_as_dicts(db.session.execute(statement)))
+
+
+def decode_quotation_cursor(token):
+    """Devuelve la clave ``(created_at, id)`` del cursor, o None sin cursor."""
+    if not token:
+        return None
+    value = decode_cursor(token)
+    try:
+        created_at, quotation_id = value
+        if not is_integer(quotation_id):
+            raise ValueError(quotation_id)
+        return datetime.fromisoformat(created_at), quotation_id
+    except (TypeError, ValueError):
+        raise InvalidParameter('Cursor inválido')
+
+
+def list_quotations(filters=None, cursor=None, limit=None):
+    """Devuelve ``(cotizaciones, cursor_siguiente)`` ya serializadas."""
+    statement = select_quotations(filters, decode_quotation_cursor(cursor))
+    return fetch_page(statement, limit, lambda q: [q['created_at'], q['id']], load_quotations)
+
+
+def stream_quotations(filters=None, cursor=None, limit=None):
+    """Devuelve un generador de cotizaciones serializadas para streaming.
+
+    Las filas llegan por lotes desde un cursor de servidor y cada lote carga
+    sus items en una consulta, así que la memoria no crece con el total.
+    """
+    statement = select_quotations(filters, decode_quotation_cursor(cursor))
+    if limit:
+        statement = statement.limit(limit)
+
+    def generate():
+        for batch in iter_batches(statement, STREAM_BATCH_ROWS):
+            yield from attach_items(batch)
+    return generate()
+
+
+def get_quotation(quotation_id, lock=False):
+    """Devuelve una cotización por id (o None) con items y productos cargados.
+
+    Con ``lock=True`` la fila queda bloqueada (``FOR UPDATE``) hasta el commit.
+    """
+    from models import Quotation
+    return db.session.get(Quotation, quotation_id, options=eager_options(), with_for_update=lock)
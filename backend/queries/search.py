@@ -0,0 +1,158 @@
+"""Búsqueda de productos por relevancia sobre nombre, descripción y SKU.
+
+Cada resultado suma hasta tres señales, igual en Postgres y en SQLite:
+
+- prefijo de SKU (``2.0``): ``TOR-`` encuentra ``TOR-001``;
+- texto completo con prefijo por palabra (``0..1``): ``torn acero`` encuentra
+  "Tornillo de acero";
+- similitud por palabra con el nombre (``0..1``): ``tornilo`` encuentra
+  "Tornillo" aunque tenga un error de tipeo.
+
+En Postgres todo se resuelve en una consulta sobre ``search_vector`` y el
+índice trigram; en SQLite se consultan las tablas FTS5 y la similitud se
+calcula en Python sobre un número acotado de candidatos (ver
+``models/product_search.py``). La paginación es por desplazamiento,
+codificado en el cursor: el orden por relevancia no tiene una clave estable
+para keyset y las búsquedas rara vez pasan de unas pocas páginas.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_, select, text
+
+from app import db
+
+from .pagination import InvalidParameter, decode_cursor, encode_cursor, is_integer, parse_limit
+from .products import load_products, product_columns
+
+SEARCH_PAGE_SIZE = 20
+MAX_QUERY_LENGTH = 100
+SKU_PREFIX_SCORE = 2.0
+# Candidatos por trigramas que se puntúan en Python (solo SQLite)
+FUZZY_CANDIDATES = 200
+# Similitud mínima para aceptar un resultado solo por parecido del nombre
+FUZZY_MIN_SIMILARITY = 0.75
+
+
+def _fold(value):
+    """Minúsculas y sin tildes, para comparar palabras."""
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def search_terms(q):
+    """Palabras de la consulta, normalizadas."""
+    return re.findall(r'\w+', _fold(q))
+
+
+def word_similarity(terms, name):
+    """Media, por término, de su mejor parecido con una palabra del nombre (0..1)."""
+    words = re.findall(r'\w+', _fold(name or ''))
+    if not terms or not words:
+        return 0.0
+    return sum(max(SequenceMatcher(None, term, word).ratio() for word in words) for term in terms) / len(terms)
+
+
+def decode_search_cursor(token):
+    """Devuelve el desplazamiento codificado en el cursor (0 sin cursor)."""
+    if not token:
+        return 0
+    value = decode_cursor(token)
+    if not isinstance(value, dict) or not is_integer(value.get('offset')) or value['offset'] < 0:
+        raise InvalidParameter('Cursor inválido')
+    return value['offset']
+
+
+def _rank_postgres(q, terms, offset, count):
+    from models import Product
+    from models.product_search import folded
+    sku_prefix = or_(*(Product.sku.startswith(p, autoescape=True) for p in {q, q.upper()}))
+    conditions = [sku_prefix]
+    score = case((sku_prefix, SKU_PREFIX_SCORE), else_=0.0)
+    if terms:
+        # El índice guarda nombre y descripción sin tildes, igual que ``terms``
+        vector = literal_column('products.search_vector')
+        tsquery = func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+        name = literal_column(folded('products.name'))
+        phrase = ' '.join(terms)
+        conditions += [vector.op('@@')(tsquery), literal(phrase).op('<%')(name)]
+        score = score + func.ts_rank_cd(vector, tsquery) + func.word_similarity(phrase, name)
+    statement = (
+        select(Product.id)
+        .where(or_(*conditions))
+        .order_by(score.desc(), Product.id)
+        .offset(offset)
+        .limit(count)
+    )
+    return list(db.session.scalars(statement))
+
+
+def _rank_sqlite(q, terms, offset, count):
+    from models import Product
+    window = offset + count
+    names = {}
+    scores = {}
+
+    # SKU por rango: usa el índice único de sku (LIKE no lo usaría en SQLite)
+    prefixes = {q, q.upper()}
+    rows = db.session.execute(
+        select(Product.id, Product.name)
+        .where(or_(*(and_(Product.sku >= p, Product.sku < p + '\U0010ffff') for p in prefixes)))
+        .order_by(Product.sku)
+        .limit(window)
+    )
+    for product_id, name in rows:
+        names[product_id] = name
+        scores[product_id] = SKU_PREFIX_SCORE
+
+    if terms:
+        rows = db.session.execute(text(
+            "SELECT p.id, p.name, bm25(products_fts, 10.0, 1.0, 10.0) AS rank "
+            "FROM products_fts JOIN products p ON p.id = products_fts.rowid "
+            "WHERE products_fts MATCH :match ORDER BY rank LIMIT :limit"
+        ), {'match': ' '.join(f'"{term}"*' for term in terms), 'limit': window})
+        for product_id, name, rank in rows:
+            names[product_id] = name
+            # bm25 es negativo y crece en valor absoluto con la relevancia
+            scores[product_id] = scores.get(product_id, 0.0) + -rank / (1 - rank)
+
+        trigrams = {term[i:i + 3] for term in terms if len(term) >= 3 for i in range(len(term) - 2)}
+        if trigrams:
+            rows = db.session.execute(text(
+                "SELECT p.id, p.name FROM products_trigram "
+                "JOIN products p ON p.id = products_trigram.rowid "
+                "WHERE products_trigram MATCH :match ORDER BY rank LIMIT :limit"
+            ), {'match': ' OR '.join(f'"{gram}"' for gram in trigrams), 'limit': FUZZY_CANDIDATES})
+            for product_id, name in rows:
+                names[product_id] = name
+
+    ranked = []
+    for product_id, name in names.items():
+        similarity = word_similarity(terms, name)
+        if product_id in scores or similarity >= FUZZY_MIN_SIMILARITY:
+            ranked.append((scores.get(product_id, 0.0) + similarity, product_id))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return [product_id for _, product_id in ranked[offset:offset + count]]
+
+
+def search_products(q, cursor=None, limit=None):
+    """Devuelve ``(productos, cursor_siguiente)`` ordenados por relevancia."""
+    from models import Product
+    q = (q or '').strip()
+    if not q:
+        raise InvalidParameter("El parámetro 'q' es obligatorio")
+    if len(q) > MAX_QUERY_LENGTH:
+        raise InvalidParameter(f"'q' no puede superar {MAX_QUERY_LENGTH} caracteres")
+    offset = decode_search_cursor(cursor)
+    limit = parse_limit(limit) or SEARCH_PAGE_SIZE
+
+    rank = _rank_postgres if db.session.get_bind().dialect.name == 'postgresql' else _rank_sqlite
+    ids = rank(q, search_terms(q), offset, limit + 1)
+    next_cursor = encode_cursor({'offset': offset + limit}) if len(ids) > limit else None
+    ids = ids[:limit]
+    if not ids:
+        return [], next_cursor
+
+    by_id = {p['id']: p for p in load_products(select(*product_columns()).where(Product.id.in_(ids)))}
+    return [by_id[product_id] for product_id in ids if product_id in by_id], next_cursor
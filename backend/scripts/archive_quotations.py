@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Archiva las cotizaciones antiguas ya atendidas (ver ``services.quotation_archive``).
+
+Pensado para ejecutarse a diario (cron de Render). Mueve por lotes cortos las
+cotizaciones con estado en ``--status`` creadas hace más de
+``--older-than-days`` días a las tablas de archivo; las lecturas por id de la
+API las siguen encontrando allí.
+
+Ejecutar desde la carpeta `backend`:
+    python scripts/archive_quotations.py                       # valores de QUOTATION_ARCHIVE_*
+    python scripts/archive_quotations.py --older-than-days 90 --status Responded
+    python scripts/archive_quotations.py --dry-run             # solo cuenta
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from services.quotation_archive import (
+    DEFAULT_ARCHIVE_AFTER_DAYS, DEFAULT_ARCHIVE_STATUSES, DEFAULT_BATCH_SIZE,
+    archive_cutoff, archive_quotations, count_archivable,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--older-than-days', type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS)
+    parser.add_argument('--status', action='append', help='estado a archivar (repetible)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-batches', type=int, help='detenerse tras este número de lotes')
+    parser.add_argument('--pause', type=float, default=0.05, help='segundos de espera entre lotes')
+    parser.add_argument('--dry-run', action='store_true', help='contar sin mover nada')
+    args = parser.parse_args()
+
+    statuses = tuple(args.status or DEFAULT_ARCHIVE_STATUSES)
+    cutoff = archive_cutoff(args.older_than_days)
+    app = create_app(bootstrap=False)
+    with app.app_context():
+        if args.dry_run:
+            print(f"ℹ️ {count_archivable(cutoff, statuses)} quotations {statuses} created before "
+                  f"{cutoff:%Y-%m-%d} would be archived")
+            return 0
+        started = time.perf_counter()
+        try:
+            moved = archive_quotations(cutoff, statuses, args.batch_size, args.max_batches, args.pause)
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Quotation archiving failed: {e}")
+            return 1
+        print(f"✅ Archived {moved} quotations {statuses} created before {cutoff:%Y-%m-%d} "
+              f"in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Worker que entrega los emails encolados en ``email_outbox``.
+
+Ejecutar desde la carpeta `backend`:
+    python scripts/email_worker.py            # bucle continuo
+    python scripts/email_worker.py --once     # un solo lote (p. ej. desde cron)
+
+El backend de entrega se elige con EMAIL_BACKEND (sendgrid, file, memory).
+"""
+import argparse
+import os
+import signal
+import sys
+import time
+
+# Add parent directory to path to import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from services.email_backends import get_email_backend
+from services.outbox import (
+    DEFAULT_BACKOFF_SECONDS, DEFAULT_BATCH_SIZE, DEFAULT_MAX_ATTEMPTS, deliver_batch,
+)
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    _stopping = True
+    print("ℹ️ Stopping email worker after the current batch...")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--once', action='store_true', help='procesar un lote y salir')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS)
+    parser.add_argument('--backoff', type=int, default=DEFAULT_BACKOFF_SECONDS,
+                        help='segundos de espera tras el primer fallo (se duplica en cada intento)')
+    parser.add_argument('--poll-interval', type=float, default=float(os.getenv('OUTBOX_POLL_INTERVAL', 5)),
+                        help='segundos de espera cuando el outbox está vacío')
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    app = create_app(bootstrap=False)
+    backend = get_email_backend()
+    print(f"📧 Email worker started (backend: {type(backend).__name__}, batch: {args.batch_size})")
+
+    with app.app_context():
+        while not _stopping:
+            try:
+                sent, failed = deliver_batch(backend, args.batch_size, args.max_attempts, args.backoff)
+            except Exception as e:
+                print(f"❌ Email worker error: {e}")
+                db.session.rollback()
+                sent = failed = 0
+            finally:
+                db.session.remove()
+            if sent or failed:
+                print(f"✅ Batch delivered: {sent} sent, {failed} failed")
+            if args.once:
+                break
+            # Si el lote vino lleno probablemente quedan más: seguir sin esperar.
+            if sent + failed < args.batch_size:
+                time.sleep(args.poll_interval)
+
+
+if __name__ == '__main__':
+    main()
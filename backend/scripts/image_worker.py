@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Worker que recoge las subidas de imágenes pendientes en ``image_uploads``.
+
+El pool de cada proceso web sube las imágenes al momento y su barrido
+(``IMAGE_UPLOAD_SWEEP_SECONDS``) recupera las que quedaron a medias; este
+worker hace lo mismo fuera de la API (p. ej. con el barrido desactivado). Debe
+ejecutarse en el mismo servidor que la API porque los archivos temporales
+están en su disco (IMAGE_STAGING_DIR).
+
+Ejecutar desde la carpeta `backend`:
+    python scripts/image_worker.py            # bucle continuo
+    python scripts/image_worker.py --once     # un solo lote (p. ej. desde cron)
+
+El destino se elige con IMAGE_UPLOADER (cloudinary, local).
+"""
+import argparse
+import os
+import signal
+import sys
+import time
+
+# Add parent directory to path to import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from services.image_ingest import (
+    DEFAULT_BACKOFF_SECONDS, DEFAULT_BATCH_SIZE, DEFAULT_MAX_ATTEMPTS, process_uploads,
+)
+from services.image_uploaders import get_image_uploader
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    _stopping = True
+    print("ℹ️ Stopping image worker after the current batch...")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--once', action='store_true', help='procesar un lote y salir')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS)
+    parser.add_argument('--backoff', type=int, default=DEFAULT_BACKOFF_SECONDS,
+                        help='segundos de espera tras el primer fallo (se duplica en cada intento)')
+    parser.add_argument('--poll-interval', type=float, default=float(os.getenv('IMAGE_UPLOAD_POLL_INTERVAL', 30)),
+                        help='segundos de espera cuando no hay subidas pendientes')
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    app = create_app(bootstrap=False)
+    uploader = get_image_uploader()
+    print(f"🖼️ Image worker started (uploader: {type(uploader).__name__}, batch: {args.batch_size})")
+
+    with app.app_context():
+        while not _stopping:
+            try:
+                done, failed = process_uploads(
+                    uploader, batch_size=args.batch_size, max_attempts=args.max_attempts,
+                    backoff_seconds=args.backoff,
+                )
+            except Exception as e:
+                print(f"❌ Image worker error: {e}")
+                db.session.rollback()
+                done = failed = 0
+            finally:
+                db.session.remove()
+            if done or failed:
+                print(f"✅ Batch processed: {done} uploaded, {failed} failed")
+            if args.once:
+                break
+            if done + failed < args.batch_size:
+                time.sleep(args.poll_interval)
+
+
+if __name__ == '__main__':
+    main()
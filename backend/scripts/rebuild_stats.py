@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Recalcula desde cero el resumen de cotizaciones de ``/api/quotations/stats``.
+
+Las rutas de escritura mantienen las tablas de agregados con incrementos;
+este comando las reconstruye desde ``quotations`` y ``quotation_items`` en
+una transacción, por si quedaron desalineadas (p. ej. tras modificar datos
+a mano en la base).
+
+Ejecutar desde la carpeta `backend`:
+    python scripts/rebuild_stats.py
+"""
+import os
+import sys
+
+# Add parent directory to path to import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from services.cache_versions import QUOTATIONS, bump_version
+from services.quotation_stats import get_stats, rebuild_stats
+
+
+def main():
+    app = create_app(bootstrap=False)
+    with app.app_context():
+        try:
+            rebuild_stats()
+            bump_version(QUOTATIONS)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Could not rebuild quotation stats: {e}")
+            return 1
+        stats = get_stats()
+        print(f"✅ Quotation stats rebuilt: {stats['total']} quotations {stats['by_status']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Servicios de soporte de la API (caché, correo, imágenes, etc.)."""
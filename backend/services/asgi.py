@@ -0,0 +1,163 @@
+"""Servidor ASGI para la app Flask: muchas peticiones en vuelo por proceso.
+
+Con ``gunicorn wsgi:app`` y workers sync cada petición ocupa un proceso
+entero mientras espera a Postgres. ``AsgiAdapter`` sirve la misma app WSGI
+(los mismos blueprints, hooks, instrumentación y métricas) desde un bucle de
+eventos: las conexiones, la lectura del cuerpo y el envío de la respuesta
+son asíncronos, y cada petición se ejecuta en un pool de ``ASGI_THREADS``
+hilos. Una petición bloqueada en la base de datos retiene un hilo, no el
+worker, así que un solo proceso mantiene hasta ``ASGI_THREADS`` peticiones
+en vuelo.
+
+``ASGI_THREADS`` no debería superar las conexiones del pool de SQLAlchemy
+(``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``): un hilo sin conexión espera en el
+pool (``envatex_db_pool_checkout_wait_seconds``).
+
+Lo usa ``asgi.py``; ver el README para arrancarlo con gunicorn + uvicorn.
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 15))
+# Cuerpos más grandes que esto (importaciones) se guardan en disco
+BODY_SPOOL_BYTES = 1024 * 1024
+
+
+class AsgiAdapter:
+    """Aplicación ASGI que ejecuta ``wsgi_app`` en un pool de hilos.
+
+    A diferencia de ``asgiref.wsgi.WsgiToAsgi``, las peticiones no comparten
+    un único hilo y se llama a ``close()`` de la respuesta al terminar, del
+    que dependen el log por petición y las métricas (``call_on_close``). Las
+    respuestas en streaming se envían fragmento a fragmento, esperando a que
+    el cliente reciba cada uno.
+    """
+
+    def __init__(self, wsgi_app, threads=ASGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.threads = threads
+        self._executor = None
+
+    def executor(self):
+        """Pool de hilos, creado en el worker (los hilos no sobreviven al fork)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='asgi')
+        return self._executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            body = await self._read_body(receive)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self.executor(), self._run, scope, body, loop, send)
+            finally:
+                body.close()
+        else:
+            raise ValueError(f"Tipo de conexión ASGI no soportado: '{scope['type']}'")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.executor()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    # Deja terminar las peticiones en curso
+                    await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        body = SpooledTemporaryFile(max_size=BODY_SPOOL_BYTES)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+        return body
+
+    def _run(self, scope, body, loop, send):
+        """Ejecuta la app WSGI en un hilo del pool y envía la respuesta por el bucle."""
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        state = {'start': None, 'sent': False}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state['sent']:
+                raise exc_info[1].with_traceback(exc_info[2])
+            state['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+            }
+            return write
+
+        def write(data):
+            if not state['sent']:
+                emit(state['start'])
+                state['sent'] = True
+            if data:
+                emit({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+        result = self.wsgi_app(wsgi_environ(scope, body), start_response)
+        try:
+            for chunk in result:
+                write(chunk)
+            write(b'')
+            emit({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+def wsgi_environ(scope, body):
+    """Entorno WSGI (PEP 3333) equivalente a un scope HTTP de ASGI."""
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf8').decode('latin1'),
+        'PATH_INFO': path.encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin1').upper().replace('-', '_')
+        value = raw_value.decode('latin1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            value = environ[name] + ('; ' if name == 'HTTP_COOKIE' else ',') + value
+        environ[name] = value
+    # El cuerpo ya está entero en ``body`` (también si llegó con
+    # Transfer-Encoding: chunked): su tamaño es el Content-Length real
+    body.seek(0, os.SEEK_END)
+    environ['CONTENT_LENGTH'] = str(body.tell())
+    environ['wsgi.input_terminated'] = True
+    body.seek(0)
+    return environ
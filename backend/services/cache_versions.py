@@ -0,0 +1,60 @@
+"""Sellos de versión baratos para validar cachés HTTP.
+
+Cada recurso (``products``, ``quotations``) tiene una fila en
+``cache_versions`` que los handlers de escritura incrementan dentro de su
+misma transacción. Como vive en la base de datos, el sello es coherente
+entre todos los workers de gunicorn.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+PRODUCTS = 'products'
+QUOTATIONS = 'quotations'
+
+
+def bump_version(*names):
+    """Incrementa la versión de los recursos dados en la transacción actual.
+
+    No hace commit: el incremento se confirma (o se descarta) junto con la
+    escritura que lo motivó.
+    """
+    from models import CacheVersion
+    now = datetime.utcnow()
+    for name in names:
+        result = db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == name)
+            .values(version=CacheVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount:
+            continue
+        # Primera escritura del recurso: crear la fila. Si otro worker la
+        # creó a la vez, el savepoint se descarta y se incrementa la suya.
+        try:
+            with db.session.begin_nested():
+                db.session.add(CacheVersion(name=name, version=1, updated_at=now))
+        except IntegrityError:
+            db.session.execute(
+                update(CacheVersion)
+                .where(CacheVersion.name == name)
+                .values(version=CacheVersion.version + 1, updated_at=now)
+            )
+
+
+def get_versions(*names):
+    """Devuelve ``{nombre: (version, updated_at)}`` con una sola consulta.
+
+    Los recursos que nunca se escribieron aparecen con versión 0 y sin fecha.
+    """
+    from models import CacheVersion
+    rows = db.session.execute(
+        select(CacheVersion.name, CacheVersion.version, CacheVersion.updated_at)
+        .where(CacheVersion.name.in_(names))
+    ).all()
+    versions = {name: (0, None) for name in names}
+    versions.update({row.name: (row.version, row.updated_at) for row in rows})
+    return versions
@@ -0,0 +1,32 @@
+"""Acceso perezoso al SDK de Cloudinary.
+
+El SDK se importa y se configura la primera vez que se sube una imagen, no al
+arrancar cada worker: la mayoría de los procesos nunca suben nada.
+"""
+import os
+
+_configured = False
+
+
+def get_uploader():
+    """Devuelve ``cloudinary.uploader`` configurado con las variables de entorno.
+
+    Si faltan ``CLOUDINARY_CLOUD_NAME``/``API_KEY``/``API_SECRET`` se usa la
+    configuración por defecto del SDK (p. ej. ``CLOUDINARY_URL``).
+    """
+    global _configured
+    import cloudinary
+    import cloudinary.uploader
+    if not _configured:
+        cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
+        cloud_api_key = os.getenv('CLOUDINARY_API_KEY')
+        cloud_api_secret = os.getenv('CLOUDINARY_API_SECRET')
+        if cloud_name and cloud_api_key and cloud_api_secret:
+            cloudinary.config(
+                cloud_name=cloud_name,
+                api_key=cloud_api_key,
+                api_secret=cloud_api_secret,
+                secure=True
+            )
+        _configured = True
+    return cloudinary.uploader
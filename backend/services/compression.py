@@ -0,0 +1,84 @@
+"""Compresión de las respuestas JSON según ``Accept-Encoding``.
+
+``init_compression`` registra un ``after_request`` que comprime con brotli
+(si está instalado) o gzip las respuestas 200 de tipo JSON/texto a partir de
+``COMPRESSION_MIN_BYTES``. Las respuestas en streaming, las que ya traen
+``Content-Encoding`` y los 304 salen tal cual.
+
+El ETag fuerte que pone ``ConditionalGet`` pasa a débil (``W/"..."``) en la
+versión comprimida, como hace nginx: el contenido es equivalente pero no
+idéntico byte a byte, y ``If-None-Match`` compara en modo débil, así que el
+304 sigue funcionando con cualquier codificación.
+
+Si la respuesta viene de ``services.payload_cache`` se usa el cuerpo ya
+comprimido de la caché en lugar de comprimir en cada petición.
+"""
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'}
+# Niveles por petición (rápidos) y para los cuerpos cacheados, que se comprimen una vez
+DYNAMIC_LEVELS = {'br': 4, 'gzip': 6}
+CACHED_LEVELS = {'br': 9, 'gzip': 9}
+
+
+def available_encodings():
+    """Codificaciones que sabe producir este proceso, por orden de preferencia."""
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+def accepted_encoding():
+    """Mejor codificación aceptada por el cliente de la petición actual, o None."""
+    return request.accept_encodings.best_match(available_encodings())
+
+
+def compress(data, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(data, quality=levels['br'])
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=levels['gzip'], mtime=0)
+    raise ValueError(f"Codificación desconocida: '{encoding}'")
+
+
+def compressible(response):
+    return (
+        response.status_code == 200
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and not response.is_streamed
+        and not response.direct_passthrough
+        and 'Content-Encoding' not in response.headers
+    )
+
+
+def compress_response(response):
+    """Comprime ``response`` si el cliente lo acepta y merece la pena."""
+    if not compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding()
+    if not encoding or response.content_length < COMPRESSION_MIN_BYTES:
+        return response
+
+    cached = getattr(response, 'cached_payload', None)
+    body = cached.encoded(encoding) if cached else compress(response.get_data(), encoding)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Activa la compresión salvo con ``COMPRESSION=False``."""
+    if os.getenv('COMPRESSION', 'True') != 'True':
+        return
+    app.after_request(compress_response)
@@ -0,0 +1,192 @@
+"""Perfiles de conexión y enrutado de lecturas a una réplica.
+
+``DB_ENGINE_PROFILE`` elige cómo se crea el engine de SQLAlchemy:
+
+- ``direct``: conexión directa a PostgreSQL con pool propio, ``pool_pre_ping``,
+  reciclado de conexiones y ``statement_timeout`` enviado al conectar.
+- ``pgbouncer-transaction``: detrás de PgBouncer en modo transacción. El pool
+  de la app es pequeño (PgBouncer ya multiplexa) y no se envían parámetros de
+  arranque, que PgBouncer rechaza; el ``statement_timeout`` se configura en
+  el rol (``ALTER ROLE ... SET statement_timeout``).
+- ``sqlite-dev``: desarrollo local; fija la espera por bloqueos. En toda
+  conexión SQLite se activan además las claves foráneas
+  (``PRAGMA foreign_keys``), desactivadas por defecto, para que
+  ``ON DELETE CASCADE`` se comporte como en Postgres.
+
+Sin ``DB_ENGINE_PROFILE`` se usa ``sqlite-dev`` para URLs SQLite y ``direct``
+para el resto. ``DB_POOL_SIZE``, ``DB_MAX_OVERFLOW``, ``DB_POOL_RECYCLE`` y
+``DB_STATEMENT_TIMEOUT_MS`` ajustan los valores del perfil.
+
+Los pools con tamaño fijo (todos salvo SQLite en memoria) son
+``MeasuredQueuePool``, que publica en ``services.metrics`` la espera por una
+conexión libre y las conexiones en uso, etiquetadas ``primary`` o ``replica``.
+
+Si existe ``DATABASE_REPLICA_URL`` se registra el bind ``replica`` con las
+mismas opciones. Las rutas marcadas con ``@use_read_replica`` leen de él;
+las escrituras (flush y sentencias DML) siguen yendo siempre al primario.
+
+Con ``preload_app`` los workers de gunicorn heredan los pools del master;
+``gunicorn.conf.py`` los descarta con ``dispose_engines`` tras el fork.
+"""
+import os
+import sqlite3
+import time
+from functools import wraps
+
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from services.metrics import pool_checked_in, pool_checked_out
+
+REPLICA_BIND = 'replica'
+# ``insert()`` con ``on_conflict_do_update`` de cada dialecto soportado
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+class MeasuredQueuePool(QueuePool):
+    """``QueuePool`` que mide la espera al pedir una conexión y cuántas hay prestadas.
+
+    La etiqueta de las métricas es ``pool_logging_name`` (``primary`` o ``replica``).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        connection = super()._do_get()
+        pool_checked_out(self._orig_logging_name or 'primary', time.perf_counter() - started)
+        return connection
+
+    def _do_return_conn(self, record):
+        pool_checked_in(self._orig_logging_name or 'primary')
+        super()._do_return_conn(record)
+
+
+def _int_env(name, default):
+    return int(os.getenv(name, default))
+
+
+def _direct_profile(url):
+    timeout_ms = _int_env('DB_STATEMENT_TIMEOUT_MS', 15000)
+    return {
+        'pool_size': _int_env('DB_POOL_SIZE', 5),
+        'max_overflow': _int_env('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': 10,
+        'pool_recycle': _int_env('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+        'poolclass': MeasuredQueuePool,
+        'connect_args': {'options': f'-c statement_timeout={timeout_ms}'},
+    }
+
+
+def _pgbouncer_transaction_profile(url):
+    return {
+        'pool_size': _int_env('DB_POOL_SIZE', 2),
+        'max_overflow': _int_env('DB_MAX_OVERFLOW', 2),
+        'pool_timeout': 10,
+        'pool_recycle': _int_env('DB_POOL_RECYCLE', 300),
+        'pool_pre_ping': True,
+        'poolclass': MeasuredQueuePool,
+    }
+
+
+def _sqlite_dev_profile(url):
+    options = {'connect_args': {'timeout': 15}}
+    # SQLite en memoria usa SingletonThreadPool: una conexión por hilo
+    if url not in ('sqlite://', 'sqlite:///:memory:'):
+        options['poolclass'] = MeasuredQueuePool
+    return options
+
+
+_PROFILES = {
+    'direct': _direct_profile,
+    'pgbouncer-transaction': _pgbouncer_transaction_profile,
+    'sqlite-dev': _sqlite_dev_profile,
+}
+
+
+def register_engine_profile(name, build_options):
+    """Registra un perfil: función ``url -> dict`` de opciones de ``create_engine``."""
+    _PROFILES[name] = build_options
+
+
+def engine_options(url, profile=None):
+    """Opciones de ``create_engine`` del perfil pedido o configurado."""
+    profile = profile or os.getenv('DB_ENGINE_PROFILE') or (
+        'sqlite-dev' if url.startswith('sqlite') else 'direct'
+    )
+    if profile not in _PROFILES:
+        raise ValueError(f"Perfil de base de datos desconocido: '{profile}'")
+    return _PROFILES[profile](url)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def configure_database(app):
+    """Rellena la configuración de Flask-SQLAlchemy a partir del entorno."""
+    url = os.getenv('DATABASE_URL', 'sqlite:///app.db')
+    if not event.contains(Engine, 'connect', _enable_sqlite_foreign_keys):
+        event.listen(Engine, 'connect', _enable_sqlite_foreign_keys)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**engine_options(url), 'pool_logging_name': 'primary'}
+
+    replica_url = os.getenv('DATABASE_REPLICA_URL')
+    if replica_url:
+        app.config['SQLALCHEMY_BINDS'] = {
+            REPLICA_BIND: {'url': replica_url, **engine_options(replica_url), 'pool_logging_name': REPLICA_BIND},
+        }
+
+
+def dispose_engines(app, close=True):
+    """Descarta las conexiones de los pools de ``app`` (primario y réplica).
+
+    Con ``close=False`` no las cierra: es lo que hace un worker recién creado
+    por fork, cuyas conexiones heredadas pertenecen al master. Cerrarlas
+    desde el hijo enviaría el cierre por el mismo socket que usa el padre.
+    """
+    db = app.extensions['sqlalchemy']
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+def upsert_insert(session, model):
+    """``insert(model)`` del dialecto del primario, con ``on_conflict_do_update``."""
+    return _UPSERT_INSERTS[session.get_bind().dialect.name](model)
+
+
+def use_read_replica(view):
+    """Decorador para rutas de solo lectura: sus consultas van a la réplica.
+
+    Sin réplica configurada no cambia nada. La réplica puede ir algo
+    retrasada respecto al primario, así que solo debe usarse en listados
+    donde leer un dato de hace unos segundos es aceptable.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Sesión que manda las lecturas de las rutas ``@use_read_replica`` a la réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if self._flushing or getattr(clause, 'is_dml', False):
+            return False
+        if not has_app_context() or not g.get('db_read_replica'):
+            return False
+        return REPLICA_BIND in self._db.engines
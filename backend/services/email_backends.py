@@ -0,0 +1,95 @@
+"""Backends de entrega de email intercambiables.
+
+El worker del outbox no conoce SendGrid: pide el backend configurado con
+``EMAIL_BACKEND`` (``sendgrid`` por defecto, ``file`` o ``memory``) y llama a
+``send``. Un backend indica un fallo lanzando una excepción; el outbox se
+encarga de los reintentos.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+from services.instrumentation import external_call
+
+
+class SendGridBackend:
+    """Entrega por la API HTTPS de SendGrid (importada solo al usarse)."""
+
+    def __init__(self, api_key=None, sender=None):
+        self.api_key = api_key or os.getenv('SENDGRID_API_KEY')
+        self.sender = sender or os.getenv('MAIL_DEFAULT_SENDER', 'envatex.ar@gmail.com')
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not self.api_key:
+                raise RuntimeError('SENDGRID_API_KEY no está configurada')
+            from sendgrid import SendGridAPIClient
+            self._client = SendGridAPIClient(self.api_key)
+        return self._client
+
+    def send(self, to_email, subject, html_body, text_body=None):
+        from sendgrid.helpers.mail import Mail
+        message = Mail(
+            from_email=self.sender,
+            to_emails=to_email,
+            subject=subject,
+            html_content=html_body,
+            plain_text_content=text_body,
+        )
+        client = self._get_client()
+        with external_call('sendgrid'):
+            response = client.send(message)
+        if response.status_code >= 400:
+            raise RuntimeError(f'SendGrid respondió {response.status_code}')
+
+
+class FileBackend:
+    """Escribe cada email como un archivo JSON en un directorio local."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.getenv('EMAIL_FILE_DIR', 'instance/outbox')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def send(self, to_email, subject, html_body, text_body=None):
+        filename = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{to_email.replace('@', '_at_')}.json"
+        with open(os.path.join(self.directory, filename), 'w', encoding='utf-8') as f:
+            json.dump({'to': to_email, 'subject': subject, 'html': html_body, 'text': text_body},
+                      f, ensure_ascii=False)
+
+
+class MemoryBackend:
+    """Guarda los emails en memoria; pensado para pruebas locales."""
+
+    def __init__(self):
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, html_body, text_body=None):
+        with self._lock:
+            self.sent.append({'to': to_email, 'subject': subject, 'html': html_body, 'text': text_body})
+
+
+_BACKENDS = {
+    'sendgrid': SendGridBackend,
+    'file': FileBackend,
+    'memory': MemoryBackend,
+}
+_instances = {}
+
+
+def register_email_backend(name, factory):
+    """Registra un backend adicional (cualquier objeto con ``send``)."""
+    _BACKENDS[name] = factory
+    _instances.pop(name, None)
+
+
+def get_email_backend(name=None):
+    """Devuelve la instancia (única por proceso) del backend pedido o configurado."""
+    name = name or os.getenv('EMAIL_BACKEND', 'sendgrid')
+    if name not in _BACKENDS:
+        raise ValueError(f"Backend de email desconocido: '{name}'")
+    if name not in _instances:
+        _instances[name] = _BACKENDS[name]()
+    return _instances[name]
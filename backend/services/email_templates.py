@@ -0,0 +1,67 @@
+"""Renderizado de emails con plantillas Jinja precompiladas.
+
+El entorno y las plantillas se cargan una sola vez por proceso (sin
+``auto_reload``), y los fragmentos estáticos de cabecera y pie, que solo
+dependen de la URL del logo, se renderizan la primera vez y se reutilizan
+como ``Markup``. Cada email queda así en una única pasada de la plantilla,
+con autoescape del contenido del cliente y una alternativa en texto plano.
+"""
+import os
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'email')
+
+QUOTATION_RESPONSE_SUBJECT = 'Respuesta a tu cotización - Envatex'
+
+
+@lru_cache(maxsize=None)
+def get_environment():
+    """Entorno Jinja del proceso; compila cada plantilla una sola vez."""
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=False),
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_template(name):
+    return get_environment().get_template(name)
+
+
+def logo_url():
+    """URL del logo servido desde Cloudinary (máxima confiabilidad en emails)."""
+    cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME', 'dtw6nypav')
+    return f"https://res.cloudinary.com/{cloud_name}/image/upload/qhbqltvbxzezwpksjy4n"
+
+
+@lru_cache(maxsize=None)
+def static_fragments(title):
+    """Cabecera y pie ya renderizados para un título dado."""
+    url = logo_url()
+    header = Markup(get_template('_header.html').render(logo_url=url, title=title))
+    footer = Markup(get_template('_footer.html').render(logo_url=url))
+    return header, footer
+
+
+def render_quotation_response(quotation_data):
+    """Devuelve ``(asunto, html, texto)`` del email de respuesta a una cotización.
+
+    ``quotation_data`` es la cotización serializada (``Quotation.serialize``).
+    """
+    header, footer = static_fragments('Respuesta a tu cotización')
+    context = {
+        'customer_name': quotation_data['customer_name'],
+        'admin_response': quotation_data['admin_response'],
+        'customer_comments': quotation_data['customer_comments'],
+        'items': quotation_data['items'],
+    }
+    html = get_template('quotation_response.html').render(header=header, footer=footer, **context)
+    text = get_template('quotation_response.txt').render(**context)
+    return QUOTATION_RESPONSE_SUBJECT, html, text
@@ -0,0 +1,250 @@
+"""Ingesta asíncrona de imágenes de producto.
+
+Las rutas de productos guardan la imagen en disco (``stage_image``) y la
+registran como ``pending`` en ``image_uploads`` dentro de su transacción;
+tras el commit la entregan al pool de subida (``schedule_uploads``) y
+responden sin esperar. Cada hilo del pool sube la imagen con el uploader
+configurado y rellena ``Product.image_url``.
+
+El pool vive en memoria: si el worker muere, se reinicia o se recicla
+(``max_requests`` en ``gunicorn.conf.py``) las subidas encoladas se pierden.
+Por eso cada proceso que sirve peticiones arranca además un barrido
+(``start_sweeper``) que cada ``IMAGE_UPLOAD_SWEEP_SECONDS`` reclama las
+pendientes vencidas de este mismo servidor (los archivos temporales viven en
+su disco): las que nadie llegó a tomar, las de un lease caducado y los
+reintentos programados, con los mismos reintentos y backoff que el outbox de
+emails. ``scripts/image_worker.py`` hace lo mismo fuera del servidor web.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from flask import current_app
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import aliased
+from werkzeug.utils import secure_filename
+
+from app import db
+from services.cache_versions import PRODUCTS, bump_version
+from services.outbox import backoff_delay
+
+DEFAULT_POOL_SIZE = int(os.getenv('IMAGE_UPLOAD_WORKERS', 2))
+DEFAULT_BATCH_SIZE = int(os.getenv('IMAGE_UPLOAD_BATCH_SIZE', 10))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('IMAGE_UPLOAD_MAX_ATTEMPTS', 5))
+DEFAULT_BACKOFF_SECONDS = int(os.getenv('IMAGE_UPLOAD_BACKOFF_SECONDS', 30))
+# Tiempo que una subida reclamada queda reservada para quien la tomó.
+LEASE_SECONDS = 5 * 60
+
+_executor = None
+_executor_lock = threading.Lock()
+_sweeper = None
+
+
+def sweep_seconds():
+    """Cada cuánto barre cada proceso las subidas vencidas (0 lo desactiva).
+
+    Una subida recién encolada no se barre hasta que pasa este tiempo: es del pool.
+    """
+    return int(os.getenv('IMAGE_UPLOAD_SWEEP_SECONDS', 60))
+
+
+def staging_dir():
+    """Directorio local donde esperan las imágenes antes de subirse."""
+    return os.path.abspath(os.getenv('IMAGE_STAGING_DIR', 'instance/staging'))
+
+
+def stage_image(file_storage, product_id):
+    """Guarda la imagen en disco y añade la subida pendiente a la sesión (sin commit)."""
+    from models import ImageUpload
+    directory = staging_dir()
+    os.makedirs(directory, exist_ok=True)
+    original = secure_filename(file_storage.filename or '')
+    extension = os.path.splitext(original)[1].lower()
+    path = os.path.join(directory, f'{uuid4().hex}{extension}')
+    file_storage.save(path)
+    upload = ImageUpload(product_id=product_id, staged_path=path, original_filename=original or None)
+    db.session.add(upload)
+    return upload
+
+
+def discard_staged(upload):
+    """Borra el archivo temporal de una subida que no llegó a confirmarse."""
+    if upload is not None and os.path.exists(upload.staged_path):
+        os.remove(upload.staged_path)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_POOL_SIZE, thread_name_prefix='image-upload')
+        return _executor
+
+
+def _reset_executor():
+    # Los hilos no sobreviven a un fork: cada worker crea su propio pool y su barrido.
+    global _executor, _executor_lock, _sweeper
+    _executor = None
+    _executor_lock = threading.Lock()
+    _sweeper = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def schedule_uploads(upload_ids):
+    """Encarga al pool de este proceso las subidas dadas (ya confirmadas)."""
+    app = current_app._get_current_object()
+    executor = _get_executor()
+    return [executor.submit(_process_in_app, app, upload_id) for upload_id in upload_ids]
+
+
+def _process_in_app(app, upload_id):
+    from services.image_uploaders import get_image_uploader
+    with app.app_context():
+        try:
+            return process_uploads(get_image_uploader(), upload_ids=[upload_id])
+        except Exception as e:
+            print(f"❌ Image upload {upload_id} error: {e}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def start_sweeper(app, interval):
+    """Arranca, una vez por proceso, el hilo que barre las subidas vencidas.
+
+    Se llama antes de cada petición (``init_image_ingest``): así solo lo
+    arrancan los procesos que sirven la API, después del fork, y el primer
+    barrido recoge enseguida lo que dejó a medias el worker anterior.
+    """
+    global _sweeper
+    if _sweeper is not None:
+        return
+    with _executor_lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, args=(app, interval),
+                                        name='image-upload-sweeper', daemon=True)
+            _sweeper.start()
+
+
+def _sweep_forever(app, interval):
+    while True:
+        sweep_uploads(app, interval)
+        time.sleep(interval)
+
+
+def sweep_uploads(app, interval=None):
+    """Sube las pendientes que vencieron hace más de ``interval`` segundos."""
+    from services.image_uploaders import get_image_uploader
+    interval = interval or sweep_seconds()
+    with app.app_context():
+        try:
+            due_before = datetime.utcnow() - timedelta(seconds=interval)
+            while True:
+                done, failed = process_uploads(get_image_uploader(), due_before=due_before)
+                if done or failed:
+                    print(f"✅ Image sweep: {done} uploaded, {failed} failed")
+                if done + failed < DEFAULT_BATCH_SIZE:
+                    break
+        except Exception as e:
+            print(f"❌ Image sweep error: {e}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def init_image_ingest(app):
+    """Arranca el barrido de subidas en cuanto el proceso atiende peticiones."""
+    interval = sweep_seconds()
+    if interval > 0:
+        app.before_request(lambda: start_sweeper(app, interval))
+
+
+def claim_uploads(upload_ids=None, batch_size=DEFAULT_BATCH_SIZE, due_before=None):
+    """Reclama subidas vencidas (todas o las de ``upload_ids``) y confirma la reserva.
+
+    Igual que ``outbox.claim_batch``: ``FOR UPDATE SKIP LOCKED`` en Postgres y
+    diccionarios planos como resultado. ``due_before`` (por defecto ahora)
+    limita a las que vencieron antes de ese instante.
+    """
+    from models import ImageUpload
+    now = datetime.utcnow()
+    statement = (
+        select(ImageUpload)
+        .where(ImageUpload.status == 'pending', ImageUpload.next_attempt_at <= (due_before or now))
+        .order_by(ImageUpload.next_attempt_at, ImageUpload.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    if upload_ids is not None:
+        statement = statement.where(ImageUpload.id.in_(upload_ids))
+    jobs = []
+    for upload in db.session.scalars(statement):
+        upload.attempts += 1
+        upload.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+        jobs.append({
+            'id': upload.id,
+            'product_id': upload.product_id,
+            'staged_path': upload.staged_path,
+            'attempts': upload.attempts,
+        })
+    db.session.commit()
+    return jobs
+
+
+def _set_product_image(job, image_url, srcset):
+    """Asigna la imagen al producto salvo que ya tenga una subida posterior terminada."""
+    from models import ImageUpload, Product
+    newer = aliased(ImageUpload)
+    db.session.execute(
+        update(Product)
+        .where(Product.id == job['product_id'])
+        .where(~exists().where(
+            newer.product_id == job['product_id'], newer.id > job['id'], newer.status == 'done',
+        ))
+        .values(image_url=image_url, image_srcset=srcset)
+    )
+
+
+def process_uploads(uploader, upload_ids=None, batch_size=DEFAULT_BATCH_SIZE,
+                    max_attempts=DEFAULT_MAX_ATTEMPTS, backoff_seconds=DEFAULT_BACKOFF_SECONDS,
+                    due_before=None):
+    """Sube un lote de imágenes pendientes. Devuelve ``(subidas, fallidas)``.
+
+    Un fallo se reprograma con backoff o se marca ``failed`` al agotar
+    ``max_attempts``. El archivo temporal se borra cuando la subida termina,
+    bien o mal.
+    """
+    from models import ImageUpload
+    done = failed = 0
+    for job in claim_uploads(upload_ids, batch_size, due_before):
+        finished = True
+        try:
+            if not os.path.exists(job['staged_path']):
+                raise FileNotFoundError(f"Archivo temporal no encontrado: {job['staged_path']}")
+            result = uploader.upload(job['staged_path'])
+            image_url, srcset = (result['url'], result.get('srcset')) if isinstance(result, dict) else (result, None)
+        except Exception as e:
+            failed += 1
+            values = {'last_error': str(e)[:2000]}
+            if job['attempts'] >= max_attempts or isinstance(e, FileNotFoundError):
+                values.update(status='failed', finished_at=datetime.utcnow())
+                print(f"❌ Image upload {job['id']} for product {job['product_id']} failed permanently: {e}")
+            else:
+                finished = False
+                values['next_attempt_at'] = datetime.utcnow() + backoff_delay(job['attempts'], backoff_seconds)
+                print(f"⚠️ Image upload {job['id']} failed (attempt {job['attempts']}): {e}")
+        else:
+            done += 1
+            values = {'status': 'done', 'image_url': image_url, 'finished_at': datetime.utcnow(), 'last_error': None}
+            _set_product_image(job, image_url, srcset)
+            bump_version(PRODUCTS)
+        db.session.execute(update(ImageUpload).where(ImageUpload.id == job['id']).values(**values))
+        db.session.commit()
+        if finished and os.path.exists(job['staged_path']):
+            os.remove(job['staged_path'])
+    return done, failed
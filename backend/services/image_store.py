@@ -0,0 +1,149 @@
+"""Almacén local de imágenes direccionado por contenido.
+
+Alternativa a Cloudinary que funciona solo con el disco (``IMAGE_UPLOADER=store``).
+Cada imagen se guarda bajo el SHA-256 de sus bytes, así que subir dos veces
+la misma foto no duplica nada::
+
+    IMAGE_LOCAL_DIR/ab/abcdef.../original.png
+                                 160.webp   (thumbnail)
+                                 480.webp   (card)
+                                 1200.webp  (full)
+                                 manifest.json
+
+Las versiones redimensionadas se generan al ingerir la imagen en un pool de
+procesos (redimensionar es trabajo de CPU y no debe competir por el GIL con
+los hilos que atienden peticiones). ``manifest.json`` se escribe al final:
+si existe, la imagen está completa y se reutiliza.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from services.image_uploaders import local_media_base_url, local_media_dir
+
+# Anchos de las versiones que se sirven (nunca se amplía el original)
+IMAGE_SIZES = {'thumbnail': 160, 'card': 480, 'full': 1200}
+DERIVATIVE_FORMAT = 'webp'
+DERIVATIVE_QUALITY = 80
+DEFAULT_PROCESSES = int(os.getenv('IMAGE_DERIVATIVE_PROCESSES', min(2, os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def content_hash(path):
+    """SHA-256 del archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomically(target, write):
+    tmp = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+    write(tmp)
+    os.replace(tmp, target)
+
+
+def render_derivative(source, target, width):
+    """Genera ``target`` con ``width`` px de ancho a partir de ``source``.
+
+    Función de módulo para poder ejecutarse en el pool de procesos.
+    """
+    from PIL import Image, ImageOps
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        _write_atomically(target, lambda tmp: image.save(
+            tmp, format=DERIVATIVE_FORMAT, quality=DERIVATIVE_QUALITY, method=4,
+        ))
+    return target
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None and DEFAULT_PROCESSES > 0:
+            # spawn: hacer fork de un proceso con hilos (gunicorn, pool de subida) no es seguro
+            _pool = ProcessPoolExecutor(
+                max_workers=DEFAULT_PROCESSES, mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+class LocalImageStore:
+    """Uploader que guarda la imagen por contenido y genera sus versiones.
+
+    ``upload`` devuelve la URL de la versión ``full`` y el mapa ``srcset``
+    (``{'160w': url, ...}``) que se guarda en ``Product.image_srcset``.
+    """
+
+    def __init__(self, directory=None, base_url=None, sizes=None):
+        self.directory = directory or local_media_dir()
+        self.base_url = (base_url or local_media_base_url()).rstrip('/')
+        self.sizes = sizes or IMAGE_SIZES
+
+    def upload(self, path):
+        key = content_hash(path)
+        folder = os.path.join(self.directory, key[:2], key)
+        manifest_path = os.path.join(folder, 'manifest.json')
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        else:
+            manifest = self._ingest(path, key, folder)
+            _write_atomically(manifest_path, lambda tmp: self._dump(manifest, tmp))
+        return self._result(key, manifest)
+
+    def _ingest(self, path, key, folder):
+        from PIL import Image
+        with Image.open(path) as image:
+            image.verify()
+        with Image.open(path) as image:
+            original_width = image.width
+            extension = (image.format or 'bin').lower()
+        os.makedirs(folder, exist_ok=True)
+        original = os.path.join(folder, f'original.{extension}')
+        _write_atomically(original, lambda tmp: shutil.copyfile(path, tmp))
+
+        widths = sorted({min(width, original_width) for width in self.sizes.values()})
+        targets = [os.path.join(folder, f'{width}.{DERIVATIVE_FORMAT}') for width in widths]
+        pool = _get_pool()
+        if pool is None:
+            for target, width in zip(targets, widths):
+                render_derivative(original, target, width)
+        else:
+            futures = [pool.submit(render_derivative, original, target, width)
+                       for target, width in zip(targets, widths)]
+            for future in futures:
+                future.result()
+        return {'key': key, 'width': original_width, 'widths': widths}
+
+    @staticmethod
+    def _dump(manifest, target):
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+    def _result(self, key, manifest):
+        prefix = f'{self.base_url}/{key[:2]}/{key}'
+        srcset = {f'{width}w': f'{prefix}/{width}.{DERIVATIVE_FORMAT}' for width in manifest['widths']}
+        full_width = max(manifest['widths'])
+        return {'url': srcset[f'{full_width}w'], 'srcset': srcset}
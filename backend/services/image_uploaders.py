@@ -0,0 +1,104 @@
+"""Destinos de subida de imágenes intercambiables.
+
+El pool de ``services.image_ingest`` no conoce Cloudinary: pide el uploader
+configurado con ``IMAGE_UPLOADER`` (``cloudinary`` por defecto, ``store`` o
+``local``) y llama a ``upload(path)``, que devuelve la URL pública de la
+imagen o un dict ``{'url': ..., 'srcset': {'160w': url, ...}}`` con sus
+versiones por ancho. Un uploader indica un fallo lanzando una excepción; los
+reintentos son cosa del pool.
+"""
+import os
+import shutil
+from urllib.parse import urlsplit
+
+
+def local_media_dir():
+    """Directorio donde ``LocalUploader`` guarda las imágenes y desde el que se sirven."""
+    return os.path.abspath(os.getenv('IMAGE_LOCAL_DIR', 'instance/media'))
+
+
+def local_media_base_url():
+    """URL absoluta bajo la que se sirve ``local_media_dir`` (``/media`` de esta API).
+
+    El frontend vive en otro origen, así que una URL relativa apuntaría a su
+    host. Las subidas terminan fuera de la petición (pool, barrido o worker),
+    sin host al que referirse: se usa ``IMAGE_LOCAL_BASE_URL`` o, en Render,
+    la URL pública del servicio (``RENDER_EXTERNAL_URL``).
+    """
+    base_url = os.getenv('IMAGE_LOCAL_BASE_URL')
+    if not base_url and os.getenv('RENDER_EXTERNAL_URL'):
+        base_url = f"{os.getenv('RENDER_EXTERNAL_URL').rstrip('/')}/media"
+    parts = urlsplit(base_url or '')
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        raise ValueError(
+            "IMAGE_LOCAL_BASE_URL debe ser la URL absoluta de /media en esta API "
+            "(p. ej. https://envatex-backend.onrender.com/media)"
+        )
+    return base_url.rstrip('/')
+
+
+class CloudinaryUploader:
+    """Sube la imagen a Cloudinary (SDK importado solo al usarse).
+
+    Las versiones del ``srcset`` son transformaciones de Cloudinary sobre la
+    misma imagen (``w_<ancho>,c_limit``), generadas al pedirlas.
+    """
+
+    def upload(self, path):
+        import cloudinary
+        from services.cloudinary_client import get_uploader
+        from services.image_store import IMAGE_SIZES
+        from services.instrumentation import external_call
+        uploader = get_uploader()
+        with external_call('cloudinary'):
+            result = uploader.upload(path)
+        image = cloudinary.CloudinaryImage(result['public_id'], version=result.get('version'))
+        original_width = result.get('width') or max(IMAGE_SIZES.values())
+        srcset = {
+            f'{width}w': image.build_url(width=width, crop='limit', fetch_format='auto', secure=True)
+            for width in sorted({min(w, original_width) for w in IMAGE_SIZES.values()})
+        }
+        return {'url': result.get('secure_url'), 'srcset': srcset}
+
+
+class LocalUploader:
+    """Copia la imagen tal cual a un directorio local servido en ``/media``."""
+
+    def __init__(self, directory=None, base_url=None):
+        self.directory = directory or local_media_dir()
+        self.base_url = (base_url or local_media_base_url()).rstrip('/')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def upload(self, path):
+        filename = os.path.basename(path)
+        shutil.copyfile(path, os.path.join(self.directory, filename))
+        return f'{self.base_url}/{filename}'
+
+
+def _local_image_store():
+    from services.image_store import LocalImageStore
+    return LocalImageStore()
+
+
+_UPLOADERS = {
+    'cloudinary': CloudinaryUploader,
+    'store': _local_image_store,
+    'local': LocalUploader,
+}
+_instances = {}
+
+
+def register_image_uploader(name, factory):
+    """Registra un uploader adicional (cualquier objeto con ``upload``)."""
+    _UPLOADERS[name] = factory
+    _instances.pop(name, None)
+
+
+def get_image_uploader(name=None):
+    """Devuelve la instancia (única por proceso) del uploader pedido o configurado."""
+    name = name or os.getenv('IMAGE_UPLOADER', 'cloudinary')
+    if name not in _UPLOADERS:
+        raise ValueError(f"Uploader de imágenes desconocido: '{name}'")
+    if name not in _instances:
+        _instances[name] = _UPLOADERS[name]()
+    return _instances[name]
@@ -0,0 +1,197 @@
+"""Instrumentación por petición: SQL, llamadas externas y tiempos.
+
+``init_instrumentation(app)`` (lo llama ``create_app``) mide cada petición:
+
+- sentencias SQL y tiempo total de base de datos, con los eventos
+  ``before/after_cursor_execute`` de SQLAlchemy;
+- llamadas a servicios externos envueltas en ``external_call('cloudinary')``;
+- duración total.
+
+El resultado sale en la cabecera ``Server-Timing`` (visible en las
+herramientas de desarrollo del navegador) y en una línea JSON del logger
+``envatex.request`` al cerrar la respuesta, de modo que en las respuestas en
+streaming incluye también las consultas hechas mientras se envía el cuerpo.
+Toda sentencia que supere ``SLOW_QUERY_MS`` se registra en
+``envatex.slow_query``, también en los workers.
+
+Las métricas viven en una ``ContextVar``: cada petición (hilo o tarea) ve
+solo las suyas. Fuera de una petición, ``external_call`` registra su propia
+línea en ``envatex.external``. Las llamadas externas se observan además en
+el histograma de ``services.metrics``.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from services.metrics import observe_external_call
+
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+# Longitud máxima de la sentencia en el log de consultas lentas
+SLOW_QUERY_MAX_CHARS = 2000
+
+request_logger = logging.getLogger('envatex.request')
+slow_query_logger = logging.getLogger('envatex.slow_query')
+external_logger = logging.getLogger('envatex.external')
+
+_current = ContextVar('envatex_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Contadores de una petición en curso."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_statements = 0
+        self.db_ms = 0.0
+        self.external = {}
+
+    def add_external(self, name, elapsed_ms):
+        count, total = self.external.get(name, (0, 0.0))
+        self.external[name] = (count + 1, total + elapsed_ms)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """Valor de la cabecera ``Server-Timing``."""
+        parts = [f'db;dur={self.db_ms:.1f};desc="{self.db_statements} queries"']
+        for name, (count, total) in self.external.items():
+            parts.append(f'{name};dur={total:.1f};desc="{count} calls"')
+        parts.append(f'app;dur={self.elapsed_ms():.1f}')
+        return ', '.join(parts)
+
+
+def current_metrics():
+    """Métricas de la petición en curso, o None fuera de una petición."""
+    return _current.get()
+
+
+@contextmanager
+def external_call(name):
+    """Mide una llamada a un servicio externo (``cloudinary``, ``sendgrid``...)."""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        observe_external_call(name, elapsed_ms / 1000, failed)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.add_external(name, elapsed_ms)
+        else:
+            _log(external_logger, {'event': 'external_call', 'service': name,
+                                   'duration_ms': round(elapsed_ms, 1), 'failed': failed})
+
+
+def _log(logger, record):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('envatex_query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['envatex_query_started'].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.db_statements += 1
+        metrics.db_ms += elapsed_ms
+    if elapsed_ms >= SLOW_QUERY_MS:
+        _log(slow_query_logger, {
+            'event': 'slow_query',
+            'duration_ms': round(elapsed_ms, 1),
+            'statement': ' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS],
+            'executemany': executemany,
+            'path': request.path if metrics is not None else None,
+        })
+
+
+def _handle_error(context):
+    # La sentencia falló: descartar su marca para no desalinear la pila
+    stack = context.connection.info.get('envatex_query_started') if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+
+def _configure_loggers():
+    """Una línea por registro en stderr, salvo que ya haya logging configurado."""
+    for logger in (request_logger, slow_query_logger, external_logger):
+        if logger.handlers:
+            continue
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def install_engine_listeners():
+    """Registra los eventos de SQLAlchemy una vez por proceso (apps y workers)."""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+    _configure_loggers()
+
+
+def init_instrumentation(app):
+    """Activa la instrumentación en ``app`` según ``INSTRUMENTATION`` (True).
+
+    ``SERVER_TIMING_HEADER`` (True) controla la cabecera y ``REQUEST_LOG``
+    (True) la línea JSON por petición.
+    """
+    if os.getenv('INSTRUMENTATION', 'True') != 'True':
+        return
+    send_header = os.getenv('SERVER_TIMING_HEADER', 'True') == 'True'
+    log_requests = os.getenv('REQUEST_LOG', 'True') == 'True'
+    install_engine_listeners()
+
+    @app.before_request
+    def start_metrics():
+        g.request_metrics = RequestMetrics()
+        _current.set(g.request_metrics)
+
+    @app.after_request
+    def finish_metrics(response):
+        metrics = g.pop('request_metrics', None)
+        if metrics is None:
+            return response
+        if send_header:
+            response.headers['Server-Timing'] = metrics.server_timing()
+        record = {
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+        }
+
+        def close():
+            _current.set(None)
+            if log_requests:
+                _log(request_logger, {
+                    **record,
+                    'duration_ms': round(metrics.elapsed_ms(), 1),
+                    'db_statements': metrics.db_statements,
+                    'db_ms': round(metrics.db_ms, 1),
+                    'external': {name: {'calls': count, 'ms': round(total, 1)}
+                                 for name, (count, total) in metrics.external.items()},
+                })
+
+        response.call_on_close(close)
+        return response
@@ -0,0 +1,96 @@
+"""Métricas de Prometheus para ``GET /api/metrics``.
+
+- ``envatex_http_requests_total`` y ``envatex_http_request_duration_seconds``
+  por endpoint (``blueprint.función``), método y código de estado. Las rutas
+  que no existen cuentan como ``unmatched``, para no crear una serie por URL.
+- ``envatex_db_pool_checkout_wait_seconds``: espera por una conexión libre
+  del pool (``MeasuredQueuePool``), y ``envatex_db_pool_connections_in_use``.
+- ``envatex_external_call_duration_seconds``: llamadas a Cloudinary y
+  SendGrid (``services.instrumentation.external_call``).
+
+Con varios workers de gunicorn cada proceso tiene sus propios contadores;
+``PROMETHEUS_MULTIPROC_DIR`` (lo fija ``gunicorn.conf.py``) hace que los
+escriban en ficheros de ese directorio y que ``/api/metrics`` los sume todos,
+responda el worker que responda. Sin esa variable (desarrollo, workers de
+email e imágenes) las métricas son las del propio proceso.
+"""
+import os
+import time
+
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+REQUESTS = Counter(
+    'envatex_http_requests_total', 'Peticiones HTTP atendidas',
+    ['endpoint', 'method', 'status'],
+)
+REQUEST_DURATION = Histogram(
+    'envatex_http_request_duration_seconds', 'Duración de las peticiones HTTP, hasta enviar el cuerpo',
+    ['endpoint', 'method', 'status'],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    'envatex_db_pool_checkout_wait_seconds', 'Espera por una conexión libre del pool',
+    ['pool'], buckets=(.0005, .001, .005, .01, .05, .1, .5, 1, 2.5, 5, 10),
+)
+POOL_IN_USE = Gauge(
+    'envatex_db_pool_connections_in_use', 'Conexiones del pool prestadas ahora mismo',
+    ['pool'], multiprocess_mode='livesum',
+)
+EXTERNAL_DURATION = Histogram(
+    'envatex_external_call_duration_seconds', 'Duración de las llamadas a servicios externos',
+    ['service', 'outcome'],
+)
+
+
+def observe_external_call(service, seconds, failed):
+    EXTERNAL_DURATION.labels(service, 'error' if failed else 'ok').observe(seconds)
+
+
+def pool_checked_out(pool, seconds):
+    POOL_CHECKOUT_WAIT.labels(pool).observe(seconds)
+    POOL_IN_USE.labels(pool).inc()
+
+
+def pool_checked_in(pool):
+    POOL_IN_USE.labels(pool).dec()
+
+
+def render_metrics():
+    """Cuerpo y content type de la exposición en formato texto de Prometheus."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid):
+    """Descarta los gauges de un worker que terminó (``child_exit`` de gunicorn)."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+def init_metrics(app):
+    """Cuenta y mide cada petición de ``app``."""
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        labels = (request.endpoint or 'unmatched', request.method, str(response.status_code))
+
+        def close():
+            REQUESTS.labels(*labels).inc()
+            REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - started)
+
+        response.call_on_close(close)
+        return response
@@ -0,0 +1,102 @@
+"""Outbox transaccional de emails.
+
+Las rutas solo encolan (``enqueue_email``) dentro de su transacción; la
+entrega la hace un proceso aparte (``scripts/email_worker.py``) que llama a
+``deliver_batch`` en bucle: reclama un lote de filas vencidas, las envía con
+el backend configurado y programa reintentos con backoff exponencial.
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app import db
+
+DEFAULT_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 20))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 6))
+DEFAULT_BACKOFF_SECONDS = int(os.getenv('OUTBOX_BACKOFF_SECONDS', 30))
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+# Tiempo que una fila reclamada queda reservada para el worker que la tomó.
+LEASE_SECONDS = 5 * 60
+
+
+def enqueue_email(to_email, subject, html_body, text_body=None, quotation_id=None):
+    """Añade un email al outbox en la sesión actual (sin commit)."""
+    from models import EmailOutbox
+    entry = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        quotation_id=quotation_id,
+    )
+    db.session.add(entry)
+    return entry
+
+
+def backoff_delay(attempts, base_seconds=DEFAULT_BACKOFF_SECONDS):
+    """Espera antes del siguiente intento: base * 2^(intentos-1), acotada."""
+    return timedelta(seconds=min(base_seconds * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS))
+
+
+def claim_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """Reclama hasta ``batch_size`` emails vencidos y confirma la reserva.
+
+    En Postgres ``FOR UPDATE SKIP LOCKED`` permite varios workers en paralelo
+    sin que dos tomen la misma fila; SQLite ignora la cláusula. Devuelve
+    diccionarios planos para no depender de instancias que expiran al hacer
+    commit.
+    """
+    from models import EmailOutbox
+    now = datetime.utcnow()
+    entries = db.session.scalars(
+        select(EmailOutbox)
+        .where(EmailOutbox.status == 'pending', EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    jobs = []
+    for entry in entries:
+        entry.attempts += 1
+        entry.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+        jobs.append({
+            'id': entry.id,
+            'to_email': entry.to_email,
+            'subject': entry.subject,
+            'html_body': entry.html_body,
+            'text_body': entry.text_body,
+            'attempts': entry.attempts,
+        })
+    db.session.commit()
+    return jobs
+
+
+def deliver_batch(backend, batch_size=DEFAULT_BATCH_SIZE, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                  backoff_seconds=DEFAULT_BACKOFF_SECONDS):
+    """Entrega un lote del outbox. Devuelve ``(enviados, fallidos)``.
+
+    Un fallo no detiene el lote: la fila se reprograma con backoff, o se
+    marca ``failed`` al agotar ``max_attempts``.
+    """
+    from models import EmailOutbox
+    sent = failed = 0
+    for job in claim_batch(batch_size):
+        try:
+            backend.send(job['to_email'], job['subject'], job['html_body'], job['text_body'])
+        except Exception as e:
+            failed += 1
+            values = {'last_error': str(e)[:2000]}
+            if job['attempts'] >= max_attempts:
+                values['status'] = 'failed'
+                print(f"❌ Email {job['id']} to {job['to_email']} failed permanently: {e}")
+            else:
+                values['next_attempt_at'] = datetime.utcnow() + backoff_delay(job['attempts'], backoff_seconds)
+                print(f"⚠️ Email {job['id']} to {job['to_email']} failed (attempt {job['attempts']}): {e}")
+        else:
+            sent += 1
+            values = {'status': 'sent', 'sent_at': datetime.utcnow(), 'last_error': None}
+        db.session.execute(update(EmailOutbox).where(EmailOutbox.id == job['id']).values(**values))
+        # Confirmar fila a fila: un corte a mitad de lote no reenvía lo ya enviado.
+        db.session.commit()
+    return sent, failed
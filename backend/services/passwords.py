@@ -0,0 +1,39 @@
+"""Hash de contraseñas con método y coste configurables.
+
+``PASSWORD_HASH_METHOD`` es un método de werkzeug con sus parámetros, p. ej.
+``scrypt:32768:8:1`` (el de werkzeug, por defecto) o ``pbkdf2:sha256:600000``.
+Los hashes guardados con otro método o coste se rehacen en el siguiente
+login correcto (``User.check_password``), así que cambiar el coste no exige
+resetear contraseñas.
+"""
+import os
+from functools import lru_cache
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+def hash_method():
+    """Método configurado en ``PASSWORD_HASH_METHOD``."""
+    return os.getenv('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+
+
+@lru_cache(maxsize=8)
+def _stored_prefix(method):
+    # werkzeug completa los parámetros omitidos ('scrypt' -> 'scrypt:32768:8:1');
+    # se calcula una vez por proceso para comparar con el prefijo guardado.
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def hash_password(password):
+    return generate_password_hash(password, hash_method())
+
+
+def verify_password(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """True si el hash no usa el método y coste configurados."""
+    return password_hash.split('$', 1)[0] != _stored_prefix(hash_method())
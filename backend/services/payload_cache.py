@@ -0,0 +1,115 @@
+"""Caché en memoria de las respuestas del catálogo ya serializadas y comprimidas.
+
+El escaparate pide una y otra vez las mismas páginas de ``/api/products``.
+La caché del catálogo (``get_catalog_cache``) guarda, por proceso, el cuerpo
+JSON de cada respuesta y sus versiones comprimidas (gzip/brotli, calculadas la primera vez que un
+cliente las pide), de modo que una petición repetida solo cuesta la consulta
+del sello de ``cache_versions``: ni consulta el catálogo, ni serializa, ni
+comprime.
+
+La clave es el ETag de ``ConditionalGet`` (endpoint, versión de la
+representación, versión del catálogo, variante y parámetros). Las páginas con cabecera ``Link`` (una URL absoluta)
+solo se reutilizan para el mismo host; el catálogo completo, para cualquiera,
+lo que permite llenarla antes de recibir peticiones (``services.warmup``).
+Cuando cualquier worker escribe un producto la versión cambia y las
+entradas anteriores dejan de usarse; además los endpoints de escritura
+vacían la caché del proceso que atiende la escritura. Como mucho se guardan
+``CATALOG_CACHE_ENTRIES`` respuestas (se descartan las menos usadas).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from .compression import CACHED_LEVELS, DYNAMIC_LEVELS, compress
+
+CATALOG_CACHE_ENTRIES = int(os.getenv('CATALOG_CACHE_ENTRIES', 256))
+# Cabeceras de la respuesta original que se reproducen desde la caché
+CACHED_HEADERS = ('X-Next-Cursor', 'Link')
+
+
+class CachedPayload:
+    """Cuerpo de una respuesta y sus versiones comprimidas."""
+
+    def __init__(self, body, mimetype, headers, levels=CACHED_LEVELS):
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = headers
+        self.levels = levels
+        # Host de las URLs absolutas de las cabeceras, si las hay
+        self.host = request.host if any(name == 'Link' for name, _ in headers) else None
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        """Cuerpo comprimido con ``encoding``; se calcula una sola vez."""
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(self.body, encoding, self.levels)
+            return self._encoded[encoding]
+
+    def response(self):
+        """Respuesta nueva con el cuerpo sin comprimir (``services.compression`` elige)."""
+        response = current_app.response_class(self.body, mimetype=self.mimetype)
+        response.headers.extend(self.headers)
+        response.cached_payload = self
+        return response
+
+
+class PayloadCache:
+    """LRU de ``CachedPayload`` segura entre hilos."""
+
+    def __init__(self, max_entries=CATALOG_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conditional):
+        with self._lock:
+            cached = self._entries.get(conditional.etag)
+            if cached is None or cached.host not in (None, request.host):
+                return None
+            self._entries.move_to_end(conditional.etag)
+            return cached
+
+    def put(self, conditional, response):
+        """Guarda ``response`` (ya completa, sin comprimir) y devuelve su entrada.
+
+        Con la caché desactivada (``max_entries`` 0) la entrada se usa una sola
+        vez, así que se comprime con los niveles rápidos.
+        """
+        headers = [(name, response.headers[name]) for name in CACHED_HEADERS if name in response.headers]
+        if self.max_entries <= 0:
+            return CachedPayload(response.get_data(), response.mimetype, headers, DYNAMIC_LEVELS)
+        cached = CachedPayload(response.get_data(), response.mimetype, headers)
+        with self._lock:
+            self._entries[conditional.etag] = cached
+            self._entries.move_to_end(conditional.etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_catalog_cache():
+    """Caché del catálogo de la app actual (una por app y proceso)."""
+    cache = current_app.extensions.get('catalog_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('catalog_cache', PayloadCache())
+    return cache
+
+
+def invalidate_catalog():
+    """Vacía la caché del catálogo de este proceso (tras escribir productos)."""
+    get_catalog_cache().clear()
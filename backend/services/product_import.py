@@ -0,0 +1,214 @@
+"""Importación masiva de productos desde CSV o NDJSON.
+
+El archivo se lee fila a fila desde el stream de la petición y se escribe
+por lotes: cada lote es un ``INSERT ... ON CONFLICT DO UPDATE`` por clave
+(``sku`` cuando la fila lo trae, ``name`` si no) y un commit. En memoria
+solo vive el lote actual, así que el tamaño del archivo no importa.
+
+Una fila inválida no detiene la importación: se informa con su número de
+línea. Si el lote completo choca con otra restricción (p. ej. el nombre ya
+pertenece a otro producto), se reintenta fila a fila con savepoints para
+aislar las que fallan.
+"""
+import csv
+import io
+import json
+import os
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+from .cache_versions import PRODUCTS, bump_version
+from .database import upsert_insert
+
+DEFAULT_BATCH_ROWS = int(os.getenv('PRODUCT_IMPORT_BATCH_ROWS', 500))
+MAX_BATCH_ROWS = 5000
+# Errores que se devuelven en detalle; el resto solo se cuenta
+MAX_REPORTED_ERRORS = 100
+FIELDS = ('name', 'sku', 'description', 'image_url')
+MAX_LENGTHS = {'name': 120, 'sku': 50, 'image_url': 255}
+
+
+class RowError(ValueError):
+    """Fila que no se puede importar; el mensaje se devuelve al cliente."""
+
+
+class _RawStream(io.RawIOBase):
+    """Adapta un objeto con solo ``read(n)`` (p. ej. ``wsgi.input`` de gunicorn) a ``io``."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _text(stream, **kwargs):
+    """Texto UTF-8 sobre el stream de bytes de la petición, leído por bloques."""
+    if not isinstance(stream, io.IOBase):
+        stream = io.BufferedReader(_RawStream(stream))
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', **kwargs)
+
+
+def read_csv(stream):
+    """Genera ``(línea, fila)`` de un CSV con cabecera, decodificado al vuelo."""
+    text = _text(stream, newline='')
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(stream):
+    """Genera ``(línea, fila)`` de un archivo con un objeto JSON por línea."""
+    text = _text(stream)
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, RowError('JSON inválido')
+            continue
+        yield line_number, row if isinstance(row, dict) else RowError('Se esperaba un objeto JSON')
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+def clean_row(row):
+    """Valida una fila y devuelve los campos del producto (vacíos como None)."""
+    if isinstance(row, RowError):
+        raise row
+    values = {}
+    for field in FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            raise RowError(f"'{field}' debe ser texto")
+        value = value.strip() if value else None
+        if value and len(value) > MAX_LENGTHS.get(field, len(value)):
+            raise RowError(f"'{field}' supera {MAX_LENGTHS[field]} caracteres")
+        values[field] = value or None
+    if not values['name']:
+        raise RowError('El nombre es obligatorio')
+    return values
+
+
+def upsert_statement(key):
+    """``INSERT ... ON CONFLICT (key) DO UPDATE`` para el dialecto en uso.
+
+    Igual que ``PUT``, los campos vacíos no borran los valores guardados, y
+    una imagen distinta descarta el ``image_srcset`` de la anterior.
+    """
+    from models import Product
+    statement = upsert_insert(db.session, Product)
+    excluded = statement.excluded
+    image_changed = excluded.image_url.is_not(None) & excluded.image_url.is_distinct_from(Product.image_url)
+    values = {
+        field: func.coalesce(getattr(excluded, field), getattr(Product, field))
+        for field in FIELDS if field != key
+    }
+    values['image_srcset'] = case((image_changed, None), else_=Product.image_srcset)
+    return statement.on_conflict_do_update(index_elements=[key], set_=values)
+
+
+class ProductImport:
+    """Estado de una importación: lote pendiente y resumen de resultados."""
+
+    def __init__(self, batch_size=DEFAULT_BATCH_ROWS):
+        self.batch_size = batch_size
+        self.batch = []
+        self.names = set()
+        self.skus = set()
+        self.processed = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def add(self, line, row):
+        self.processed += 1
+        try:
+            values = clean_row(row)
+        except RowError as e:
+            self.add_error(line, str(e))
+            return
+        # Un mismo producto dos veces en el lote haría fallar el ON CONFLICT:
+        # se escribe lo anterior primero y la última fila gana, como en serie.
+        if values['name'] in self.names or (values['sku'] and values['sku'] in self.skus):
+            self.flush()
+        self.batch.append((line, values))
+        self.names.add(values['name'])
+        if values['sku']:
+            self.skus.add(values['sku'])
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Escribe el lote pendiente en una transacción."""
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        self.names.clear()
+        self.skus.clear()
+        by_key = {'sku': [], 'name': []}
+        for line, values in batch:
+            by_key['sku' if values['sku'] else 'name'].append((line, values))
+        try:
+            for key, rows in by_key.items():
+                self.write(key, rows)
+            bump_version(PRODUCTS)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def write(self, key, rows):
+        if not rows:
+            return
+        statement = upsert_statement(key)
+        try:
+            with db.session.begin_nested():
+                db.session.execute(statement, [values for _, values in rows])
+            self.imported += len(rows)
+            return
+        except IntegrityError:
+            pass
+        # Algún valor choca con otra restricción: fila a fila para aislarlo
+        for line, values in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(statement, [values])
+                self.imported += 1
+            except IntegrityError:
+                self.add_error(line, 'Ya existe otro producto con el mismo nombre o SKU')
+
+    def summary(self):
+        return {
+            'processed': self.processed,
+            'imported': self.imported,
+            'failed': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def import_products(stream, fmt, batch_size=DEFAULT_BATCH_ROWS):
+    """Importa ``stream`` (bytes en formato ``fmt``) y devuelve el resumen.
+
+    Los lotes ya escritos quedan confirmados aunque una fila posterior falle.
+    """
+    state = ProductImport(batch_size)
+    for line, row in READERS[fmt](stream):
+        state.add(line, row)
+    state.flush()
+    return state.summary()
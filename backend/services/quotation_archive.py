@@ -0,0 +1,143 @@
+"""Archivo de cotizaciones antiguas: tablas calientes pequeñas.
+
+``archive_quotations`` mueve las cotizaciones con estado en ``statuses`` y
+creadas antes de ``cutoff`` de ``quotations``/``quotation_items`` a
+``quotations_archive``/``quotation_items_archive``. Lo hace por lotes de
+``batch_size`` y cada lote es una transacción corta con tres sentencias en la
+base (``INSERT ... SELECT`` de cotizaciones e items y ``DELETE``, que borra
+los items por ``ON DELETE CASCADE``): no carga filas en Python ni mantiene
+bloqueos entre lotes. En Postgres las filas del lote se reservan con
+``FOR UPDATE SKIP LOCKED``, así que una respuesta del admin en curso no se
+pierde: esa cotización se salta y se archiva en una pasada posterior.
+
+El resumen de ``/api/quotations/stats`` no cambia al archivar: sigue
+contando las cotizaciones archivadas, y ``rebuild_stats`` lee también las
+tablas de archivo. Lo ejecuta ``scripts/archive_quotations.py``.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+
+from app import db
+
+from .cache_versions import QUOTATIONS, bump_version
+
+DEFAULT_ARCHIVE_AFTER_DAYS = int(os.getenv('QUOTATION_ARCHIVE_AFTER_DAYS', 120))
+DEFAULT_ARCHIVE_STATUSES = tuple(os.getenv('QUOTATION_ARCHIVE_STATUSES', 'Responded,Archived').split(','))
+DEFAULT_BATCH_SIZE = int(os.getenv('QUOTATION_ARCHIVE_BATCH_SIZE', 500))
+
+QUOTATION_COLUMNS = ('id', 'customer_name', 'customer_email', 'customer_phone', 'customer_comments',
+                     'status', 'created_at', 'admin_response')
+ITEM_COLUMNS = ('id', 'quantity', 'quotation_id', 'product_id')
+
+
+def archive_cutoff(days=DEFAULT_ARCHIVE_AFTER_DAYS):
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def archivable(cutoff, statuses):
+    """Condición de las cotizaciones calientes que toca archivar."""
+    from models import Quotation
+    return Quotation.status.in_(statuses) & (Quotation.created_at < cutoff)
+
+
+def count_archivable(cutoff, statuses):
+    from models import Quotation
+    return db.session.scalar(select(func.count()).select_from(Quotation).where(archivable(cutoff, statuses)))
+
+
+def archive_batch(cutoff, statuses=DEFAULT_ARCHIVE_STATUSES, batch_size=DEFAULT_BATCH_SIZE):
+    """Archiva un lote (las más antiguas primero) y confirma; devuelve cuántas movió."""
+    from models import ArchivedQuotation, ArchivedQuotationItem, Quotation, QuotationItem
+    ids = db.session.scalars(
+        select(Quotation.id)
+        .where(archivable(cutoff, statuses))
+        .order_by(Quotation.created_at, Quotation.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not ids:
+        db.session.rollback()
+        return 0
+
+    now = datetime.utcnow()
+    db.session.execute(insert(ArchivedQuotation).from_select(
+        [*QUOTATION_COLUMNS, 'archived_at'],
+        select(*(getattr(Quotation, column) for column in QUOTATION_COLUMNS), literal(now))
+        .where(Quotation.id.in_(ids)),
+    ))
+    db.session.execute(insert(ArchivedQuotationItem).from_select(
+        list(ITEM_COLUMNS),
+        select(*(getattr(QuotationItem, column) for column in ITEM_COLUMNS))
+        .where(QuotationItem.quotation_id.in_(ids)),
+    ))
+    db.session.execute(
+        delete(Quotation).where(Quotation.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    bump_version(QUOTATIONS)
+    db.session.commit()
+    return len(ids)
+
+
+def archive_quotations(cutoff, statuses=DEFAULT_ARCHIVE_STATUSES, batch_size=DEFAULT_BATCH_SIZE,
+                       max_batches=None, pause=0.0):
+    """Archiva por lotes hasta terminar (o ``max_batches``); devuelve el total movido.
+
+    ``pause`` (segundos) separa los lotes para dejar paso al resto de la carga.
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, statuses, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def get_archived_quotation(quotation_id):
+    """Cotización archivada con la misma forma que ``Quotation.serialize()``, o None."""
+    from models import ArchivedQuotation, ArchivedQuotationItem, Product
+    row = db.session.execute(
+        select(*(getattr(ArchivedQuotation, column) for column in QUOTATION_COLUMNS), ArchivedQuotation.archived_at)
+        .where(ArchivedQuotation.id == quotation_id)
+    ).first()
+    if row is None:
+        return None
+    quotation = dict(zip((*QUOTATION_COLUMNS, 'archived_at'), row))
+    quotation['created_at'] = quotation['created_at'].isoformat() if quotation['created_at'] else None
+    quotation['archived_at'] = quotation['archived_at'].isoformat()
+    quotation['items'] = [
+        {
+            'id': item_id,
+            'quantity': quantity,
+            'quotation_id': quotation_id,
+            'product_id': product_id,
+            'product': {
+                'id': product_id,
+                'name': name,
+                'description': description,
+                'sku': sku,
+                'image_url': image_url,
+                'image_srcset': image_srcset,
+            } if name is not None else None,
+        }
+        for item_id, quantity, product_id, name, description, sku, image_url, image_srcset in db.session.execute(
+            select(ArchivedQuotationItem.id, ArchivedQuotationItem.quantity, ArchivedQuotationItem.product_id,
+                   Product.name, Product.description, Product.sku, Product.image_url, Product.image_srcset)
+            .outerjoin(Product, Product.id == ArchivedQuotationItem.product_id)
+            .where(ArchivedQuotationItem.quotation_id == quotation_id)
+            .order_by(ArchivedQuotationItem.id)
+        )
+    ]
+    return quotation
+
+
+def is_archived(quotation_id):
+    from models import ArchivedQuotation
+    return db.session.scalar(select(ArchivedQuotation.id).where(ArchivedQuotation.id == quotation_id)) is not None
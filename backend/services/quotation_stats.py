@@ -0,0 +1,219 @@
+"""Resumen de cotizaciones mantenido de forma incremental.
+
+Dos tablas de agregados (``models/quotation_stats.py``) sostienen
+``GET /api/quotations/stats``:
+
+- ``quotation_daily_stats``: cotizaciones por día de creación y estado;
+- ``product_request_stats``: cantidad pedida y número de cotizaciones por
+  producto.
+
+Las rutas de escritura aplican deltas en su misma transacción con
+``INSERT ... ON CONFLICT DO UPDATE SET n = n + excluded.n``, que es atómico
+entre workers. Leer el resumen cuesta lo mismo con cien cotizaciones que con
+un millón: depende de los días y productos con datos, no de las filas.
+``rebuild_stats`` lo recalcula desde cero (``scripts/rebuild_stats.py``).
+Las cotizaciones archivadas (``services.quotation_archive``) siguen contando.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import Date, delete, distinct, func, insert, select, union_all
+
+from app import db
+
+from .database import upsert_insert
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+DEFAULT_TOP_PRODUCTS = 10
+MAX_TOP_PRODUCTS = 100
+
+
+def _day(column):
+    """Día (UTC) de un ``DateTime`` como expresión SQL; igual en Postgres y SQLite."""
+    return func.date(column, type_=Date)
+
+
+def add_daily(deltas):
+    """Suma ``{(día, estado): delta}`` a ``quotation_daily_stats``."""
+    from models import QuotationDailyStat
+    rows = [{'day': day, 'status': status, 'quotations': delta}
+            for (day, status), delta in deltas.items() if delta]
+    if not rows:
+        return
+    statement = upsert_insert(db.session, QuotationDailyStat)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['day', 'status'],
+        set_={'quotations': QuotationDailyStat.quotations + statement.excluded.quotations},
+    ), rows)
+
+
+def add_products(deltas):
+    """Suma ``{product_id: (cantidad, cotizaciones)}`` a ``product_request_stats``."""
+    from models import ProductRequestStat
+    rows = [{'product_id': product_id, 'quantity': quantity, 'quotations': quotations}
+            for product_id, (quantity, quotations) in deltas.items() if quantity or quotations]
+    if not rows:
+        return
+    statement = upsert_insert(db.session, ProductRequestStat)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['product_id'],
+        set_={
+            'quantity': ProductRequestStat.quantity + statement.excluded.quantity,
+            'quotations': ProductRequestStat.quotations + statement.excluded.quotations,
+        },
+    ), rows)
+
+
+def record_created(created_at, status, items):
+    """Registra una cotización nueva con sus ``items`` ``[(product_id, cantidad)]``."""
+    add_daily({(created_at.date(), status): 1})
+    quantities = defaultdict(int)
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+    add_products({product_id: (quantity, 1) for product_id, quantity in quantities.items()})
+
+
+def _tables(archived):
+    """Modelos de cotización e item: calientes o de archivo."""
+    from models import ArchivedQuotation, ArchivedQuotationItem, Quotation, QuotationItem
+    return (ArchivedQuotation, ArchivedQuotationItem) if archived else (Quotation, QuotationItem)
+
+
+def lock_quotations(condition, archived=False):
+    """Bloquea hasta el commit las cotizaciones de ``condition`` y devuelve sus ids.
+
+    Va antes de ``daily_counts`` y ``product_totals``: con ``FOR UPDATE``
+    dos borrados o cambios de estado simultáneos de la misma cotización se
+    esperan, y el segundo ve ya el resultado del primero en lugar de restar
+    dos veces. SQLite ignora ``FOR UPDATE``, pero sus escrituras ya están
+    serializadas.
+    """
+    Quotation, _ = _tables(archived)
+    return db.session.scalars(select(Quotation.id).where(condition).with_for_update()).all()
+
+
+def daily_counts(condition, archived=False):
+    """``{(día, estado): n}`` de las cotizaciones que cumplen ``condition``.
+
+    Se consulta antes de cambiar o borrar un conjunto (ya bloqueado con
+    ``lock_quotations``), para restar lo que aportaba al resumen. Con ``archived=True`` lee las tablas de archivo.
+    """
+    Quotation, _ = _tables(archived)
+    day = _day(Quotation.created_at)
+    rows = db.session.execute(
+        select(day, Quotation.status, func.count()).where(condition).group_by(day, Quotation.status)
+    )
+    return {(day, status): count for day, status, count in rows}
+
+
+def product_totals(condition, archived=False):
+    """``{product_id: (cantidad, cotizaciones)}`` de los items de las cotizaciones elegidas.
+
+    Los items archivados pueden apuntar a productos ya borrados, cuyo
+    resumen se eliminó con ellos: esos no cuentan.
+    """
+    from models import Product
+    Quotation, QuotationItem = _tables(archived)
+    statement = (
+        select(QuotationItem.product_id, func.sum(QuotationItem.quantity),
+               func.count(distinct(QuotationItem.quotation_id)))
+        .where(QuotationItem.quotation_id.in_(select(Quotation.id).where(condition)))
+        .group_by(QuotationItem.product_id)
+    )
+    if archived:
+        statement = statement.where(QuotationItem.product_id.in_(select(Product.id)))
+    rows = db.session.execute(statement)
+    return {product_id: (quantity, quotations) for product_id, quantity, quotations in rows}
+
+
+def record_status_change(counts, new_status):
+    """Mueve las cotizaciones de ``counts`` (``daily_counts``) a ``new_status``."""
+    deltas = defaultdict(int)
+    for (day, status), count in counts.items():
+        if status != new_status:
+            deltas[(day, status)] -= count
+            deltas[(day, new_status)] += count
+    add_daily(deltas)
+
+
+def record_deleted(counts, totals):
+    """Resta del resumen las cotizaciones borradas (``daily_counts`` y ``product_totals``)."""
+    add_daily({key: -count for key, count in counts.items()})
+    add_products({product_id: (-quantity, -quotations) for product_id, (quantity, quotations) in totals.items()})
+
+
+def rebuild_stats():
+    """Recalcula ambas tablas desde las cotizaciones y sus items (sin commit).
+
+    Son dos ``INSERT ... SELECT`` agregados sobre las tablas calientes y las
+    de archivo, así que el trabajo ocurre en la base de datos y no carga las
+    cotizaciones en Python. Los items archivados de productos ya borrados no
+    cuentan.
+    """
+    from models import Product, ProductRequestStat, QuotationDailyStat
+    db.session.execute(delete(QuotationDailyStat))
+    db.session.execute(delete(ProductRequestStat))
+    quotations = union_all(*(
+        select(Quotation.created_at, Quotation.status) for Quotation, _ in (_tables(False), _tables(True))
+    )).subquery()
+    day = _day(quotations.c.created_at)
+    db.session.execute(insert(QuotationDailyStat).from_select(
+        ['day', 'status', 'quotations'],
+        select(day, quotations.c.status, func.count()).group_by(day, quotations.c.status),
+    ))
+    items = union_all(*(
+        select(QuotationItem.product_id, QuotationItem.quantity, QuotationItem.quotation_id)
+        for _, QuotationItem in (_tables(False), _tables(True))
+    )).subquery()
+    db.session.execute(insert(ProductRequestStat).from_select(
+        ['product_id', 'quantity', 'quotations'],
+        select(items.c.product_id, func.sum(items.c.quantity), func.count(distinct(items.c.quotation_id)))
+        .where(items.c.product_id.in_(select(Product.id)))
+        .group_by(items.c.product_id),
+    ))
+
+
+def get_stats(days=DEFAULT_DAYS, top=DEFAULT_TOP_PRODUCTS):
+    """Resumen para el panel: totales por estado, serie diaria y productos más pedidos.
+
+    Tres consultas sobre las tablas de agregados; ``days`` acota la serie
+    diaria (hasta hoy, UTC) y ``top`` el ranking de productos.
+    """
+    from models import Product, ProductRequestStat, QuotationDailyStat
+    by_status = {
+        status: count for status, count in db.session.execute(
+            select(QuotationDailyStat.status, func.sum(QuotationDailyStat.quotations))
+            .group_by(QuotationDailyStat.status)
+            .order_by(QuotationDailyStat.status)
+        ) if count
+    }
+
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    by_day = {}
+    for day, status, count in db.session.execute(
+        select(QuotationDailyStat.day, QuotationDailyStat.status, QuotationDailyStat.quotations)
+        .where(QuotationDailyStat.day >= since, QuotationDailyStat.quotations != 0)
+        .order_by(QuotationDailyStat.day, QuotationDailyStat.status)
+    ):
+        entry = by_day.setdefault(day, {'day': day.isoformat(), 'total': 0, 'by_status': {}})
+        entry['total'] += count
+        entry['by_status'][status] = count
+
+    top_products = [
+        {'product_id': product_id, 'name': name, 'sku': sku, 'quantity': quantity, 'quotations': quotations}
+        for product_id, name, sku, quantity, quotations in db.session.execute(
+            select(ProductRequestStat.product_id, Product.name, Product.sku,
+                   ProductRequestStat.quantity, ProductRequestStat.quotations)
+            .join(Product, Product.id == ProductRequestStat.product_id)
+            .where(ProductRequestStat.quantity > 0)
+            .order_by(ProductRequestStat.quantity.desc(), ProductRequestStat.product_id)
+            .limit(top)
+        )
+    ]
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_day': list(by_day.values()),
+        'top_products': top_products,
+    }
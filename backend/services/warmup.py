@@ -0,0 +1,68 @@
+"""Calentamiento de la app en el master de gunicorn antes de crear los workers.
+
+Con ``preload_app`` (``gunicorn.conf.py``) la app se crea una sola vez en el
+master y los workers la heredan por fork: las páginas de memoria que nadie
+modifica se comparten (copy-on-write) en lugar de repetirse en cada worker.
+``warm_up`` aprovecha para dejar hecho en el master lo que cada worker haría
+en sus primeras peticiones:
+
+- importa los módulos que las rutas cargan de forma perezosa (modelos,
+  consultas y servicios), de modo que su código y sus objetos se comparten;
+- sirve el catálogo (``GET /api/products``, lo que pide el escaparate) y lo
+  comprime en cada codificación, así que la caché del catálogo llega llena a
+  todos los workers y su primera petición cuesta una consulta.
+
+Al terminar cierra las conexiones que abrió: ningún worker debe heredar una
+conexión viva (ver ``services.database.dispose_engines``).
+"""
+import importlib
+import time
+
+from flask import request
+
+WARM_IMPORTS = (
+    'models',
+    'queries.pagination',
+    'queries.products',
+    'queries.quotations',
+    'queries.search',
+    'services.email_templates',
+    'services.image_store',
+    'services.image_uploaders',
+    'services.outbox',
+    'services.product_import',
+    'services.quotation_archive',
+    'services.quotation_stats',
+)
+# Peticiones del escaparate cuyo cuerpo se deja en la caché del catálogo
+WARM_CATALOG_URLS = ('/api/products',)
+
+
+def warm_up(app):
+    """Importa y precalcula lo compartible; los fallos solo se registran."""
+    from app import db
+    from services.compression import available_encodings
+    from services.database import dispose_engines
+    from services.payload_cache import get_catalog_cache
+
+    started = time.perf_counter()
+    for module in WARM_IMPORTS:
+        importlib.import_module(module)
+
+    payloads = []
+    try:
+        for url in WARM_CATALOG_URLS:
+            with app.test_request_context(url):
+                app.view_functions[request.endpoint]()
+                db.session.remove()
+        with app.app_context():
+            payloads = get_catalog_cache().entries()
+        for payload in payloads:
+            for encoding in available_encodings():
+                payload.encoded(encoding)
+    except Exception as e:
+        print(f"⚠️ Catalog warm-up failed, workers will fill the cache on demand: {e}")
+    finally:
+        dispose_engines(app)
+    print(f"✅ App warmed up in the master ({len(WARM_IMPORTS)} modules, {len(payloads)} catalog payloads) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -35,9 +35,30 @@ function App() {
 
   // Configurar interceptor de axios para manejar tokens expirados
   React.useEffect(() => {
+    const API_BASE = process.env.REACT_APP_API_URL || 'https://didactic-space-fiesta-g4r6x4549q9xfpvq5-5000.app.github.dev';
     const interceptor = axios.interceptors.response.use(
       (response) => response,
-      (error) => {
+      async (error) => {
+        // Access token vencido: renovarlo con el refresh token y reintentar una vez
+        const original = error.config;
+        const refreshToken = localStorage.getItem('refresh_token');
+        if (error.response && error.response.status === 401 && refreshToken && original &&
+            !original._retried && !(original.url || '').includes('/api/auth/')) {
+          original._retried = true;
+          try {
+            const res = await axios.post(`${API_BASE}/api/auth/refresh`, null, {
+              headers: { Authorization: `Bearer ${refreshToken}` }
+            });
+            const token = res.data.access_token;
+            localStorage.setItem('access_token', token);
+            axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+            original.headers['Authorization'] = `Bearer ${token}`;
+            return axios(original);
+          } catch (refreshError) {
+            // Refresh token vencido o inválido: cerrar sesión como antes
+          }
+        }
+
         // Si recibimos un 401 (no autorizado) o 422 (token inválido/expirado), cerrar sesión
         if (error.response && (error.response.status === 401 || error.response.status === 422)) {
           // Verificar si es un error de JWT específicamente
@@ -50,6 +71,7 @@ function App() {
           if (isJWTError || error.response.status === 401) {
             // Limpiar token y redirigir al login
             localStorage.removeItem('access_token');
+            localStorage.removeItem('refresh_token');
             delete axios.defaults.headers.common['Authorization'];
             setIsAuthenticated(false);
             window.dispatchEvent(new Event('authChanged'));
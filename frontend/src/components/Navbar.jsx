@@ -145,6 +145,7 @@ function Navbar({ isAuthenticated, isMenuOpen, setIsMenuOpen }) {
                   <button
                     onClick={() => {
                       localStorage.removeItem('access_token');
+                      localStorage.removeItem('refresh_token');
                       window.dispatchEvent(new Event('authChanged'));
                       navigate('/admin/login');
                     }}
@@ -186,6 +187,7 @@ function Navbar({ isAuthenticated, isMenuOpen, setIsMenuOpen }) {
                     <button
                       onClick={() => {
                         localStorage.removeItem('access_token');
+                        localStorage.removeItem('refresh_token');
                         window.dispatchEvent(new Event('authChanged'));
                         navigate('/admin/login');
                         setIsMenuOpen(false);
@@ -123,6 +123,8 @@ function ProductList({ onAddToCart, onRemoveItem, items = [] }) {
                 <div className="tw-h-56 tw-overflow-hidden tw-bg-slate-100">
                   <img
                     src={p.image_url}
+                    srcSet={p.image_srcset ? Object.entries(p.image_srcset).map(([w, url]) => `${url} ${w}`).join(', ') : undefined}
+                    sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
                     alt={p.name}
                     className="tw-w-full tw-h-full tw-object-cover group-hover:tw-scale-110 tw-transition-transform tw-duration-300"
                   />
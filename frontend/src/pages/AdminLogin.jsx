@@ -16,6 +16,7 @@ function AdminLogin() {
       const res = await axios.post(`${API_BASE}/api/auth/login`, { username, password });
       const token = res.data.access_token;
       localStorage.setItem('access_token', token);
+      localStorage.setItem('refresh_token', res.data.refresh_token);
       axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
       // notify other parts of the app
       try { window.dispatchEvent(new Event('authChanged')); } catch (e) {}